@@ -8,7 +8,10 @@ from commands import register_commands
 from routes.vacation import bp as vacation_bp 
 from routes.users import bp as users_bp
 from routes.imports import bp as import_bp
+from routes.auth import bp as auth_bp
 from utils.response import ApiResponse 
+from utils.credential_cache import credential_cache
+from utils.auth_token import token_versions
 import os
 import logging
 from flask_injector import FlaskInjector
@@ -26,6 +29,11 @@ def create_app(config_class=env):
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
     db.init_app(app)
     Migrate(app, db)
+    credential_cache.configure(
+        ttl_seconds=app.config["CREDENTIAL_CACHE_TTL"],
+        max_size=app.config["CREDENTIAL_CACHE_MAX_SIZE"]
+    )
+    token_versions.configure(ttl_seconds=app.config["TOKEN_VERSION_CACHE_TTL"])
 
     @app.before_request
     def before_request():
@@ -35,9 +43,11 @@ def create_app(config_class=env):
     app.register_blueprint(vacation_bp)
     app.register_blueprint(users_bp)
     app.register_blueprint(import_bp)
+    app.register_blueprint(auth_bp)
 
-    container = Container(db_session=db.session)
-    FlaskInjector(app=app, modules=[container.bind_services])
+    container = Container(db_session=db.session, config=app.config)
+    container.import_job_manager.init_app(app)
+    app.extensions["injector"] = FlaskInjector(app=app, modules=[container.bind_services]).injector
     register_commands(app)
        
     @app.errorhandler(404)
@@ -52,6 +62,10 @@ def create_app(config_class=env):
     def forbidden(e):
         return ApiResponse.error("Forbidden", 403)
 
+    @app.errorhandler(413)
+    def payload_too_large(e):
+        return ApiResponse.error(f"File exceeds the upload limit of {app.config['UPLOAD_MAX_BYTES']} bytes", 413)
+
     @app.errorhandler(500)
     def internal_error(e):
         logging.error(f"Unhandled exception: {e}", exc_info=True)
@@ -59,7 +73,7 @@ def create_app(config_class=env):
 
     @app.route('/health')
     def health():
-        return ApiResponse.success({"status": "healthy"})
+        return ApiResponse.success({"status": "healthy", "auth_cache": credential_cache.stats()})
 
     @app.route('/')
     def index():
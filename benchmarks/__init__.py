@@ -0,0 +1,6 @@
+from .generators import (
+    generate_users_file,
+    generate_entitlements_file,
+    generate_vacations_file,
+)
+from .runner import run_import_benchmarks, compare_with_baseline, load_baseline, save_baseline
@@ -0,0 +1,91 @@
+import csv
+import random
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Sequence
+from utils.import_helper import DATE_FORMATS
+
+FIRST_NAMES = ("ana", "marko", "jelena", "nikola", "milica", "stefan", "ivana", "luka", "tamara", "petar")
+LAST_NAMES = ("petrovic", "jovanovic", "nikolic", "markovic", "djordjevic", "stojanovic", "ilic", "pavlovic")
+
+
+def benchmark_emails(rows: int, domain: str) -> List[str]:
+    """
+    Deterministic, unique emails such as ana.petrovic.17@<domain>.
+    """
+    return [
+        f"{FIRST_NAMES[i % len(FIRST_NAMES)]}.{LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]}.{i}@{domain}"
+        for i in range(rows)
+    ]
+
+
+def format_mixed_date(value: date, rng: random.Random) -> str:
+    """
+    Formats value with a random DATE_FORMATS entry, avoiding month/day strings
+    that MultiFormatDateParser would read day-first.
+    """
+    fmt = rng.choice(DATE_FORMATS)
+    if fmt == "%m/%d/%Y" and value.day <= 12:
+        fmt = "%Y-%m-%d"
+    return value.strftime(fmt)
+
+
+def _write(path: str, header: Sequence[Sequence], rows: Iterable[Sequence]) -> str:
+    if path.endswith(".xlsx"):
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        for line in header:
+            sheet.append(list(line))
+        for row in rows:
+            sheet.append(list(row))
+        workbook.save(path)
+    elif path.endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerows(header)
+            writer.writerows(rows)
+    else:
+        raise ValueError("Unsupported file format. Use .csv or .xlsx")
+    return path
+
+
+def generate_users_file(path: str, emails: Sequence[str], year: int = 2019, seed: int = 0) -> str:
+    """
+    Vacation year,<year> / Employee Email,Employee Password / one row per email.
+    """
+    rng = random.Random(seed)
+
+    def rows() -> Iterator[Sequence]:
+        for email in emails:
+            yield email, f"Pw!{rng.randrange(10 ** 8):08d}"
+
+    return _write(path, [("Vacation year", year), ("Employee Email", "Employee Password")], rows())
+
+
+def generate_entitlements_file(path: str, emails: Sequence[str], year: int, seed: int = 0) -> str:
+    """
+    Vacation year,<year> / Employee,Total vacation days / one row per email.
+    """
+    rng = random.Random(seed)
+    rows = ((email, rng.randint(20, 30)) for email in emails)
+    return _write(path, [("Vacation year", year), ("Employee", "Total vacation days")], rows)
+
+
+def generate_vacations_file(path: str, emails: Sequence[str], rows: int, year: int, seed: int = 0) -> str:
+    """
+    Employee,Vacation start date,Vacation end date with rows spread round-robin over emails.
+    A user's n-th vacation starts in week n of the year and lasts 1-3 days, so rows do not
+    overlap and stay within a 20-day entitlement up to 6 vacations per user.
+    """
+    rng = random.Random(seed)
+    first_monday = date(year, 1, 1) + timedelta(days=(7 - date(year, 1, 1).weekday()) % 7)
+
+    def lines() -> Iterator[Sequence]:
+        for i in range(rows):
+            week = (i // len(emails)) % 50
+            start = first_monday + timedelta(weeks=week, days=rng.randint(0, 2))
+            end = start + timedelta(days=rng.randint(0, 2))
+            yield emails[i % len(emails)], format_mixed_date(start, rng), format_mixed_date(end, rng)
+
+    return _write(path, [("Employee", "Vacation start date", "Vacation end date")], lines())
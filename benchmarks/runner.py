@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models import User, VacationBalance, VacationEntitlement, VacationRecord
+from .generators import (
+    benchmark_emails,
+    generate_users_file,
+    generate_entitlements_file,
+    generate_vacations_file,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+BENCHMARK_YEAR = 2019
+
+
+@dataclass
+class BenchmarkResult:
+    kind: str
+    file_format: str
+    rows: int
+    dialect: str
+    seconds: float
+    rows_per_second: float
+    imported: int
+    errors: int
+    sql_statements: int
+    max_rss_mb: Optional[float]
+    stages: Dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}.{self.file_format}.{self.rows}"
+
+
+def _run(kind: str, method, session: Session, file_path: str, rows: int, file_format: str, **options) -> BenchmarkResult:
+    started = time.perf_counter()
+    result = method(file_path, checkpoint=False, **options)
+    if result.success:
+        session.commit()
+    else:
+        session.rollback()
+    seconds = time.perf_counter() - started
+
+    if not result.success:
+        raise RuntimeError(f"{kind} benchmark import failed: {result.message}")
+
+    metrics = result.details.get("metrics", {})
+    return BenchmarkResult(
+        kind=kind,
+        file_format=file_format,
+        rows=rows,
+        dialect=session.get_bind().dialect.name,
+        seconds=round(seconds, 3),
+        rows_per_second=round(rows / seconds, 1) if seconds > 0 else 0.0,
+        imported=result.imported,
+        errors=result.error_total,
+        sql_statements=metrics.get("sql_statements", 0),
+        max_rss_mb=metrics.get("max_rss_mb"),
+        stages=metrics.get("stages", {})
+    )
+
+
+def _cleanup(session: Session, domain: str) -> None:
+    user_ids = select(User.id).where(User.email.like(f"%@{domain}"))
+    session.query(VacationRecord).filter(VacationRecord.user_id.in_(user_ids)).delete(synchronize_session=False)
+    session.query(VacationBalance).filter(VacationBalance.user_id.in_(user_ids)).delete(synchronize_session=False)
+    session.query(VacationEntitlement).filter(VacationEntitlement.user_id.in_(user_ids)).delete(synchronize_session=False)
+    session.query(User).filter(User.email.like(f"%@{domain}")).delete(synchronize_session=False)
+    session.commit()
+
+
+def run_import_benchmarks(
+    import_service,
+    session: Session,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    file_format: str = "csv",
+    hash_workers: Optional[int] = None,
+    work_dir: Optional[str] = None,
+    cleanup: bool = True
+) -> List[BenchmarkResult]:
+    """
+    For each size, generates users, entitlements and vacations files with that many rows for a
+    fresh set of users, imports them in that order and measures each import. Imported rows are
+    deleted afterwards unless cleanup is False. max_rss_mb is the process high-water mark, so
+    run one size per process when comparing memory.
+    """
+    results = []
+    tmp_dir = tempfile.mkdtemp(prefix="import-bench-", dir=work_dir)
+    try:
+        for rows in sizes:
+            domain = f"bench-{uuid.uuid4().hex[:8]}.example.com"
+            emails = benchmark_emails(rows, domain)
+            users_file = generate_users_file(os.path.join(tmp_dir, f"users_{rows}.{file_format}"), emails)
+            entitlements_file = generate_entitlements_file(
+                os.path.join(tmp_dir, f"entitlements_{rows}.{file_format}"), emails, BENCHMARK_YEAR
+            )
+            vacations_file = generate_vacations_file(
+                os.path.join(tmp_dir, f"vacations_{rows}.{file_format}"), emails, rows, BENCHMARK_YEAR
+            )
+
+            try:
+                results.append(_run(
+                    "users", import_service.import_users_from_file, session, users_file, rows, file_format,
+                    chunk_size=1000, hash_workers=hash_workers
+                ))
+                results.append(_run(
+                    "entitlements", import_service.import_vacation_entitlements_from_file,
+                    session, entitlements_file, rows, file_format, chunk_size=10000
+                ))
+                results.append(_run(
+                    "vacations", import_service.import_vacation_records_from_file,
+                    session, vacations_file, rows, file_format, chunk_size=10000
+                ))
+            finally:
+                if cleanup:
+                    _cleanup(session, domain)
+            for result in results[-3:]:
+                logger.info(f"Benchmark {result.key}: {result.rows_per_second} rows/s")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return results
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Sequence[BenchmarkResult], path: str = BASELINE_PATH) -> None:
+    baseline = load_baseline(path)
+    recorded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    for result in results:
+        entry = asdict(result)
+        entry.pop("stages")
+        entry["recorded_at"] = recorded_at
+        baseline[result.key] = entry
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare_with_baseline(
+    results: Sequence[BenchmarkResult],
+    baseline: Dict[str, dict],
+    tolerance: float = 0.2
+) -> List[str]:
+    """
+    Returns a message for every result that is slower, or issues more SQL statements, than
+    its baseline by more than tolerance. Baselines recorded on another database are ignored.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.key)
+        if not expected or expected.get("dialect") != result.dialect:
+            continue
+        if result.rows_per_second < expected["rows_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{result.key}: {result.rows_per_second} rows/s, baseline {expected['rows_per_second']}"
+            )
+        if result.sql_statements > expected["sql_statements"] * (1 + tolerance):
+            regressions.append(
+                f"{result.key}: {result.sql_statements} SQL statements, baseline {expected['sql_statements']}"
+            )
+    return regressions
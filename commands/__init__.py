@@ -1,9 +1,25 @@
-from flask import Flask
+from flask import Flask, current_app
+
+def resolve(interface):
+    """
+    Returns the instance bound in the app's injector (see Container.bind_services).
+    """
+    return current_app.extensions["injector"].get(interface)
 
 def register_commands(app: Flask):
     """
     Automatically register all Flask CLI commands from this folder.
     """
     from .seed import seed_command
+    from .benchmark import bench_imports_command
+    from .imports import import_users_command, import_vacations_command, import_entitlements_command, watch_imports_command
+    from .balances import verify_balances_command, rebuild_balances_command
 
     app.cli.add_command(seed_command)
+    app.cli.add_command(bench_imports_command)
+    app.cli.add_command(import_users_command)
+    app.cli.add_command(import_vacations_command)
+    app.cli.add_command(import_entitlements_command)
+    app.cli.add_command(watch_imports_command)
+    app.cli.add_command(verify_balances_command)
+    app.cli.add_command(rebuild_balances_command)
\ No newline at end of file
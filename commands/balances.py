@@ -0,0 +1,37 @@
+import click
+from flask.cli import with_appcontext
+from models import db
+from repositories.vacation_balance_repository import VacationBalanceRepository
+
+SAMPLE_SIZE = 10
+
+
+@click.command(name='verify-balances')
+@click.option('--user-id', type=int, default=None, help='Only check this user')
+@with_appcontext
+def verify_balances_command(user_id):
+    """Compare vacation_balances with the sums of vacation_records."""
+    mismatches = VacationBalanceRepository(db.session).verify(user_id)
+    db.session.rollback()
+    if not mismatches:
+        click.echo("Vacation balances match vacation_records.")
+        return
+    click.echo(f"{len(mismatches)} vacation balances differ from vacation_records:", err=True)
+    for mismatch_user_id, year, stored, actual in mismatches[:SAMPLE_SIZE]:
+        click.echo(f"  user {mismatch_user_id}, {year}: stored {stored}, actual {actual}", err=True)
+    click.echo("Run 'flask rebuild-balances' to recompute them.", err=True)
+    raise SystemExit(1)
+
+
+@click.command(name='rebuild-balances')
+@click.option('--user-id', type=int, default=None, help='Only rebuild this user')
+@with_appcontext
+def rebuild_balances_command(user_id):
+    """Recompute vacation_balances from vacation_records."""
+    try:
+        rows = VacationBalanceRepository(db.session).rebuild(user_id)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    click.echo(f"Rebuilt {rows} vacation balances.")
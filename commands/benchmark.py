@@ -0,0 +1,59 @@
+import click
+from flask.cli import with_appcontext
+from models import db
+from benchmarks import run_import_benchmarks, compare_with_baseline, load_baseline, save_baseline
+from benchmarks.runner import BASELINE_PATH
+from services.import_service import ImportService
+from . import resolve
+
+
+def _parse_sizes(value: str):
+    try:
+        return [int(size) for size in value.split(",") if size.strip()]
+    except ValueError:
+        raise click.BadParameter("sizes must be a comma separated list of row counts")
+
+
+@click.command(name='bench-imports')
+@click.option('--sizes', default='1000', show_default=True, help='Comma separated row counts, e.g. 1000,100000,1000000')
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'xlsx']), default='csv', show_default=True)
+@click.option('--hash-workers', type=int, default=None, help='Password hashing processes (defaults to PASSWORD_HASH_WORKERS)')
+@click.option('--baseline', 'baseline_path', default=BASELINE_PATH, show_default=True)
+@click.option('--save-baseline', 'store_baseline', is_flag=True, help='Store these results as the new baseline')
+@click.option('--tolerance', type=float, default=0.2, show_default=True, help='Allowed slowdown before failing')
+@click.option('--keep-data', is_flag=True, help='Do not delete the imported benchmark rows')
+@with_appcontext
+def bench_imports_command(sizes, file_format, hash_workers, baseline_path, store_baseline, tolerance, keep_data):
+    dialect = db.engine.dialect.name
+    if dialect != "postgresql":
+        click.echo(f"Warning: benchmarking against {dialect}; baselines are meant for PostgreSQL.", err=True)
+
+    import_service = resolve(ImportService)
+    results = run_import_benchmarks(
+        import_service,
+        db.session,
+        sizes=_parse_sizes(sizes),
+        file_format=file_format,
+        hash_workers=hash_workers,
+        cleanup=not keep_data
+    )
+
+    click.echo(
+        f"{'benchmark':<28}{'rows/s':>12}{'seconds':>10}{'imported':>10}{'errors':>8}{'queries':>10}{'max rss MB':>12}"
+    )
+    for result in results:
+        click.echo(
+            f"{result.key:<28}{result.rows_per_second:>12}{result.seconds:>10}{result.imported:>10}"
+            f"{result.errors:>8}{result.sql_statements:>10}{str(result.max_rss_mb):>12}"
+        )
+
+    if store_baseline:
+        save_baseline(results, baseline_path)
+        click.echo(f"Baseline saved to {baseline_path}")
+        return
+
+    regressions = compare_with_baseline(results, load_baseline(baseline_path), tolerance)
+    for regression in regressions:
+        click.echo(f"REGRESSION {regression}", err=True)
+    if regressions:
+        raise SystemExit(1)
@@ -0,0 +1,172 @@
+import os
+import sys
+import time
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from models import db
+from constants import EntitlementConflictPolicy
+from services.import_folder_watcher import ImportFolderWatcher
+from services.import_job_manager import ImportJobManager
+from services.import_service import ImportService
+from . import resolve
+
+
+def _parse_sheet(value):
+    # passed through as text: iter_xlsx_chunks matches a sheet name before an index
+    return value or None
+
+
+class _Progress:
+    """
+    Prints rows processed and throughput after every chunk, on one line when stderr is a terminal.
+    """
+
+    def __init__(self, kind: str, enabled: bool = True):
+        self.kind = kind
+        self.enabled = enabled
+        self.rows = 0
+        self.chunks = 0
+        self.started = time.perf_counter()
+        self.interactive = sys.stderr.isatty()
+
+    def __call__(self, rows: int) -> None:
+        self.rows += rows
+        self.chunks += 1
+        if not self.enabled:
+            return
+        seconds = time.perf_counter() - self.started
+        rate = round(self.rows / seconds) if seconds > 0 else 0
+        line = f"{self.kind}: {self.rows} rows read, {self.chunks} chunks, {rate} rows/s"
+        if self.interactive:
+            click.echo(f"\r{line}", nl=False, err=True)
+        else:
+            click.echo(line, err=True)
+
+    def done(self) -> None:
+        if self.enabled and self.interactive and self.chunks:
+            click.echo(err=True)
+
+
+def _run_import(kind: str, method, file_path: str, dry_run: bool, quiet: bool, error_report, **options):
+    progress = _Progress(kind, enabled=not quiet)
+    try:
+        result = method(
+            file_path,
+            on_chunk=progress,
+            checkpoint=not dry_run,
+            error_report_path=error_report,
+            **options
+        )
+        if result.success and not dry_run:
+            db.session.commit()
+        else:
+            db.session.rollback()
+    finally:
+        progress.done()
+
+    prefix = "[dry run] " if dry_run else ""
+    click.echo(f"{prefix}{result.message}")
+    if result.error_total:
+        counts = ", ".join(f"{reason}={count}" for reason, count in sorted(result.error_counts.items()))
+        click.echo(f"{result.error_total} rows rejected ({counts})")
+        for error in result.errors[:10]:
+            click.echo(f"  {error}")
+        if error_report:
+            click.echo(f"Rejected rows written to {error_report}")
+    if dry_run and result.success:
+        click.echo("Dry run: nothing was written to the database.")
+    if not result.success:
+        raise SystemExit(1)
+
+
+def _import_options(func):
+    func = click.option('--quiet', is_flag=True, help='Do not print progress')(func)
+    func = click.option('--error-report', type=click.Path(dir_okay=False, writable=True),
+                        help='Write rejected rows as CSV with reason codes to this file')(func)
+    func = click.option('--dry-run', is_flag=True,
+                        help='Validate and insert in one transaction, then roll it back')(func)
+    func = click.option('--sheet', default=None, help='XLSX worksheet name or 0-based index')(func)
+    func = click.option('--chunk-size', type=click.IntRange(min=1), default=1000, show_default=True)(func)
+    func = click.argument('file_path', type=click.Path(exists=True, dir_okay=False))(func)
+    return func
+
+
+@click.command(name='import-users')
+@_import_options
+@click.option('--workers', type=click.IntRange(min=0), default=None,
+              help='Password hashing processes (defaults to PASSWORD_HASH_WORKERS)')
+@with_appcontext
+def import_users_command(file_path, chunk_size, sheet, dry_run, error_report, quiet, workers):
+    """Import users from a local CSV, XLSX or Parquet file."""
+    import_service = resolve(ImportService)
+    _run_import(
+        "users", import_service.import_users_from_file, os.path.abspath(file_path), dry_run, quiet, error_report,
+        chunk_size=chunk_size, hash_workers=workers, sheet=_parse_sheet(sheet)
+    )
+
+
+@click.command(name='import-vacations')
+@_import_options
+@with_appcontext
+def import_vacations_command(file_path, chunk_size, sheet, dry_run, error_report, quiet):
+    """Import vacation records from a local CSV, XLSX or Parquet file."""
+    import_service = resolve(ImportService)
+    _run_import(
+        "vacations", import_service.import_vacation_records_from_file, os.path.abspath(file_path),
+        dry_run, quiet, error_report, chunk_size=chunk_size, sheet=_parse_sheet(sheet)
+    )
+
+
+@click.command(name='import-entitlements')
+@_import_options
+@click.option('--policy', type=click.Choice(EntitlementConflictPolicy.ALL), default=EntitlementConflictPolicy.SKIP,
+              show_default=True, help='What to do when a user already has days for the year')
+@with_appcontext
+def import_entitlements_command(file_path, chunk_size, sheet, dry_run, error_report, quiet, policy):
+    """Import vacation entitlements from a local CSV, XLSX or Parquet file."""
+    import_service = resolve(ImportService)
+    _run_import(
+        "entitlements", import_service.import_vacation_entitlements_from_file, os.path.abspath(file_path),
+        dry_run, quiet, error_report, chunk_size=chunk_size, sheet=_parse_sheet(sheet), policy=policy
+    )
+
+
+@click.command(name='watch-imports')
+@click.argument('folder', type=click.Path(exists=True, file_okay=False))
+@click.option('--interval', type=click.FloatRange(min=0.1), default=10.0, show_default=True,
+              help='Seconds between folder scans')
+@click.option('--settle', type=click.FloatRange(min=0), default=5.0, show_default=True,
+              help='Seconds a file must stay unchanged before it is imported')
+@click.option('--max-concurrent', type=click.IntRange(min=1), default=2, show_default=True,
+              help='Import jobs submitted at a time')
+@click.option('--policy', type=click.Choice(EntitlementConflictPolicy.ALL), default=EntitlementConflictPolicy.SKIP,
+              show_default=True, help='Conflict policy for entitlement files')
+@click.option('--once', is_flag=True, help='Import what is in the folder, wait for it to finish and exit')
+@with_appcontext
+def watch_imports_command(folder, interval, settle, max_concurrent, policy, once):
+    """Import CSV, XLSX and Parquet files dropped into FOLDER as they arrive."""
+    job_manager = resolve(ImportJobManager)
+    watcher = ImportFolderWatcher(
+        job_manager,
+        folder,
+        max_in_flight=max_concurrent,
+        settle_seconds=settle,
+        entitlement_policy=policy,
+        csv_engine=current_app.config["IMPORT_CSV_ENGINE"]
+    )
+    click.echo(f"Watching {watcher.folder} every {interval}s", err=True)
+    try:
+        while True:
+            try:
+                watcher.poll()
+            finally:
+                db.session.remove()
+            if once and watcher.idle:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        click.echo("Stopping, running imports will finish first", err=True)
+    click.echo(f"{watcher.processed} files imported, {watcher.failed} failed")
+    if once and watcher.failed:
+        raise SystemExit(1)
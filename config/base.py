@@ -4,3 +4,15 @@ class BaseConfig:
     SECRET_KEY = os.getenv('SECRET_KEY')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER")
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 50 * 1024 * 1024))
+    # Rejects larger request bodies up front; the slack leaves room for multipart headers.
+    MAX_CONTENT_LENGTH = UPLOAD_MAX_BYTES + 64 * 1024
+    CREDENTIAL_CACHE_TTL = int(os.getenv("CREDENTIAL_CACHE_TTL", 300))
+    CREDENTIAL_CACHE_MAX_SIZE = int(os.getenv("CREDENTIAL_CACHE_MAX_SIZE", 1024))
+    AUTH_TOKEN_TTL = int(os.getenv("AUTH_TOKEN_TTL", 900))
+    TOKEN_VERSION_CACHE_TTL = int(os.getenv("TOKEN_VERSION_CACHE_TTL", 30))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 0))
+    IMPORT_MAX_CONCURRENT_JOBS = int(os.getenv("IMPORT_MAX_CONCURRENT_JOBS", 2))
+    IMPORT_MAX_QUEUED_JOBS = int(os.getenv("IMPORT_MAX_QUEUED_JOBS", 20))
+    IMPORT_CSV_ENGINE = os.getenv("IMPORT_CSV_ENGINE", "c")
+    IMPORT_TRACE_MEMORY = os.getenv("IMPORT_TRACE_MEMORY", "false").lower() == "true"
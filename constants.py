@@ -5,3 +5,28 @@ class RoleNames:
 class RoleIds:
     ADMIN = 1
     EMPLOYEE = 2
+
+class EntitlementConflictPolicy:
+    SKIP = "skip"
+    OVERWRITE = "overwrite"
+    ADD = "add"
+
+    ALL = (SKIP, OVERWRITE, ADD)
+
+class VacationBookingReason:
+    OVERLAP = "overlap"
+    NOT_ENOUGH_DAYS = "not_enough_days"
+
+class ImportErrorReason:
+    INVALID_DATA = "invalid_data"
+    INVALID_EMAIL = "invalid_email"
+    PASSWORD_TOO_SHORT = "password_too_short"
+    DUPLICATE_IN_FILE = "duplicate_in_file"
+    EMAIL_IN_USE = "email_in_use"
+    USER_NOT_FOUND = "user_not_found"
+    INVALID_DATE = "invalid_date"
+    INVALID_DATE_RANGE = "invalid_date_range"
+    OVERLAP = "overlap"
+    NOT_ENOUGH_DAYS = "not_enough_days"
+    ENTITLEMENT_EXISTS = "entitlement_exists"
+    CHUNK_FAILED = "chunk_failed"
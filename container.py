@@ -7,20 +7,26 @@ from repositories.user_repository import UserRepository
 from repositories.role_repository import RoleRepository
 from repositories.vacation_record_repository import VacationRecordRepository
 from repositories.vacation_entitlement_repository import VacationEntitlementRepository
+from repositories.import_checkpoint_repository import ImportCheckpointRepository
+from repositories.vacation_balance_repository import VacationBalanceRepository
 
 
 from services.user_service import UserService
 from services.vacation_service import VacationService
 from services.import_service import ImportService
+from services.import_job_manager import ImportJobManager
 
 class Container:
-    def __init__(self,db_session):
+    def __init__(self,db_session, config=None):
         self.db_session = db_session
+        self.config = config or {}
 
         self.user_repository = UserRepository(self.db_session)
         self.role_repository = RoleRepository(self.db_session)
         self.vacation_record_repository = VacationRecordRepository(self.db_session)
         self.vacation_entitlement_repository = VacationEntitlementRepository(self.db_session)
+        self.import_checkpoint_repository = ImportCheckpointRepository(self.db_session)
+        self.vacation_balance_repository = VacationBalanceRepository(self.db_session)
 
         self.user_service = UserService(
             user_repo=self.user_repository,
@@ -37,14 +43,26 @@ class Container:
             vacation_service=self.vacation_service,
             user_repository=self.user_repository,
             vacation_record_repository=self.vacation_record_repository,
-            vacation_entitlement_repository=self.vacation_entitlement_repository
+            vacation_entitlement_repository=self.vacation_entitlement_repository,
+            import_checkpoint_repository=self.import_checkpoint_repository,
+            password_hash_workers=self.config.get("PASSWORD_HASH_WORKERS", 0),
+            trace_memory=self.config.get("IMPORT_TRACE_MEMORY", False),
+            csv_engine=self.config.get("IMPORT_CSV_ENGINE", "c")
+        )
+        self.import_job_manager = ImportJobManager(
+            import_service=self.import_service,
+            max_workers=self.config.get("IMPORT_MAX_CONCURRENT_JOBS", 2),
+            max_queued=self.config.get("IMPORT_MAX_QUEUED_JOBS", 20)
         )
 
     def bind_services(self, binder):
         binder.bind(UserService, to=self.user_service, scope=singleton)
         binder.bind(VacationService, to=self.vacation_service, scope=singleton)
         binder.bind(ImportService, to=self.import_service, scope=singleton)
+        binder.bind(ImportJobManager, to=self.import_job_manager, scope=singleton)
         binder.bind(UserRepository, to=self.user_repository, scope=singleton)
         binder.bind(RoleRepository, to=self.role_repository, scope=singleton)
         binder.bind(VacationRecordRepository, to=self.vacation_record_repository, scope=singleton)
         binder.bind(VacationEntitlementRepository, to=self.vacation_entitlement_repository, scope=singleton)
+        binder.bind(ImportCheckpointRepository, to=self.import_checkpoint_repository, scope=singleton)
+        binder.bind(VacationBalanceRepository, to=self.vacation_balance_repository, scope=singleton)
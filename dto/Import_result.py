@@ -5,7 +5,9 @@ class ImportResult(BaseModel):
     success: bool = Field(..., description="Whether the import was successful")
     message: str = Field(..., description="Summary message")
     imported: int = Field(0, ge=0, description="Number of successfully imported users")
-    errors: List[str] = Field(default_factory=list, description="List of error messages")
+    errors: List[str] = Field(default_factory=list, description="First error messages, see error_counts for totals")
+    error_counts: Dict[str, int] = Field(default_factory=dict, description="Number of errors per reason code")
+    error_total: int = Field(0, ge=0, description="Total number of errors")
     details: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
     class Config:
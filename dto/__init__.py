@@ -10,3 +10,4 @@ from .vacation_record import VacationRecordDTO
 from .Import_result import ImportResult
 from .create_entitlement_request import CreateEntitlementRequest
 from .entitlement_dto import EntitlementDTO
+from .import_job_dto import ImportJobDTO
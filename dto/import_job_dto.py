@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+from .Import_result import ImportResult
+
+class ImportJobDTO(BaseModel):
+    id: str
+    kind: str = Field(..., description="users, vacations or entitlements")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    file_name: str
+    rows_processed: int = 0
+    chunks_processed: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    result: Optional[ImportResult] = None
+    error: Optional[str] = None
@@ -1,11 +1,11 @@
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 from .vacation_record_dto import VacationRecordDTO
 
 class VacationListResponse(BaseModel):
     data: List[VacationRecordDTO]
-    total: int
-    page: int
+    total: Optional[int] = None
     per_page: int
     has_next: bool
-    has_prev: bool
\ No newline at end of file
+    has_prev: bool
+    next_cursor: Optional[str] = None
\ No newline at end of file
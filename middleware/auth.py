@@ -1,12 +1,37 @@
 import base64
+from dataclasses import dataclass
 from functools import wraps
-from flask import request, g
+from flask import request, g, current_app
 from typing import Tuple, Optional
-from models import db
 from repositories.user_repository import UserRepository
 from utils.response import ApiResponse
+from utils.credential_cache import credential_cache
+from utils.auth_token import decode_token, token_versions
 from constants import RoleIds
 
+@dataclass(frozen=True)
+class Principal:
+    """
+    Authenticated caller, resolved once per request by login_required.
+    """
+    id: int
+    role_id: int
+    email: Optional[str] = None
+    role_name: Optional[str] = None
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role_id == RoleIds.ADMIN
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            role_id=user.role_id,
+            email=user.email,
+            role_name=user.role.name if user.role else None
+        )
+
 def decode_basic_auth(auth_header: str) -> Optional[Tuple[str, str]]:
     """
     Format: Authorization: Basic base64(email:password)
@@ -22,27 +47,70 @@ def decode_basic_auth(auth_header: str) -> Optional[Tuple[str, str]]:
     except (ValueError, IndexError, UnicodeDecodeError, base64.binascii.Error):
         return None
 
+def decode_bearer_auth(auth_header: str) -> Optional[str]:
+    """
+    Format: Authorization: Bearer <token>
+    """
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None
+    token = auth_header[len('Bearer '):].strip()
+    return token or None
+
 def login_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         auth_header = request.headers.get('Authorization')
+
+        token = decode_bearer_auth(auth_header)
+        if token:
+            claims = decode_token(
+                current_app.config["SECRET_KEY"],
+                token,
+                current_app.config["AUTH_TOKEN_TTL"]
+            )
+            if not claims:
+                return ApiResponse.error('Invalid or expired token', 401)
+
+            user_repo = UserRepository(g.db_session)
+            current_version = token_versions.get(claims.user_id, user_repo.get_token_version)
+            if current_version is None or current_version != claims.token_version:
+                return ApiResponse.error('Token has been revoked', 401)
+
+            request.current_user = Principal(id=claims.user_id, role_id=claims.role_id)
+            request.user_id = claims.user_id
+
+            return f(*args, **kwargs)
+
         credentials = decode_basic_auth(auth_header)
         
         if not credentials:
-            return ApiResponse.error('Authorization required. Provide valid Basic Auth credentials (email:password base64 encoded)', 401)
+            return ApiResponse.error('Authorization required. Provide valid Basic Auth credentials (email:password base64 encoded) or a Bearer token', 401)
         
         email, password = credentials
     
         user_repo = UserRepository(g.db_session)
-        user = user_repo.get_by_email(email)
-        
+        user = None
+
+        cached = credential_cache.get(auth_header)
+        if cached is not None:
+            user = user_repo.get_by_id_with_role(cached.user_id)
+            # another worker may have changed the password, so the entry must match the stored hash
+            if not user or user.email != email or not credential_cache.matches(cached, user.password):
+                credential_cache.discard(auth_header)
+                user = None
+
         if not user:
-            return ApiResponse.error('Invalid credentials - User not found', 401)
-        
-        if not user.check_password(password):
-            return ApiResponse.error('Invalid credentials - Wrong password', 401)
+            user = user_repo.get_by_email_with_role(email)
+
+            if not user:
+                return ApiResponse.error('Invalid credentials - User not found', 401)
+
+            if not user.check_password(password):
+                return ApiResponse.error('Invalid credentials - Wrong password', 401)
+
+            credential_cache.put(auth_header, user.id, user.password)
         
-        request.current_user = user
+        request.current_user = Principal.from_user(user)
         request.user_id = user.id
         
         return f(*args, **kwargs)
@@ -55,10 +123,7 @@ def admin_required(f):
         if not hasattr(request, 'current_user'):
             return ApiResponse.error('Authentication required. Please authenticate first using login_required middleware', 401)
         
-        user_repo = UserRepository(g.db_session)
-        current_user_id = request.current_user.id
-        
-        if not user_repo.is_admin(current_user_id):
+        if not request.current_user.is_admin:
             return ApiResponse.error('Admin privileges required', 403)
         
         return f(*args, **kwargs)
@@ -71,7 +136,6 @@ def admin_or_owner_required(f):
         if not hasattr(request, 'current_user'):
             return ApiResponse.error('Authentication required. Please authenticate first using login_required middleware', 401)
         
-        user_repo = UserRepository(g.db_session)
         current_user_id = request.current_user.id
         
         target_user_id = kwargs.get('user_id')
@@ -88,7 +152,7 @@ def admin_or_owner_required(f):
         except (ValueError, TypeError):
             return ApiResponse.error('Invalid user ID format', 400)
         
-        is_admin = user_repo.is_admin(current_user_id)
+        is_admin = request.current_user.is_admin
         is_owner = current_user_id == target_user_id
         
         if not is_admin and not is_owner:
@@ -0,0 +1,72 @@
+"""Add vacation_records indexes and overlap exclusion constraint
+
+Revision ID: 3b1f9c2d7e4a
+Revises: af80ccd903fd
+Create Date: 2026-10-18 14:20:41.118302
+
+The (user_id, year) and (user_id, start_date, end_date) indexes are built CONCURRENTLY on
+PostgreSQL. The generated period column (a table rewrite) and the exclusion constraint with its
+GiST index cannot be, so that part takes an exclusive lock on vacation_records; it fails early
+if existing records overlap.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b1f9c2d7e4a'
+down_revision = 'af80ccd903fd'
+branch_labels = None
+depends_on = None
+
+OVERLAP_CONSTRAINT = 'ex_vacation_records_no_overlap'
+INDEXES = (
+    ('ix_vacation_records_user_year', ['user_id', 'year']),
+    ('ix_vacation_records_user_dates', ['user_id', 'start_date', 'end_date']),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        for name, columns in INDEXES:
+            op.create_index(name, 'vacation_records', columns)
+        return
+
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'vacation_records', columns, postgresql_concurrently=True, if_not_exists=True)
+
+    overlapping = bind.execute(sa.text(
+        "SELECT count(*) FROM vacation_records a JOIN vacation_records b "
+        "ON a.user_id = b.user_id AND a.id < b.id "
+        "AND a.start_date <= b.end_date AND a.end_date >= b.start_date"
+    )).scalar()
+    if overlapping:
+        raise RuntimeError(
+            f"{overlapping} pairs of overlapping vacation records must be resolved before adding {OVERLAP_CONSTRAINT}"
+        )
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE vacation_records ADD COLUMN period daterange "
+        "GENERATED ALWAYS AS (daterange(start_date, end_date, '[]')) STORED"
+    )
+    op.execute(
+        f"ALTER TABLE vacation_records ADD CONSTRAINT {OVERLAP_CONSTRAINT} "
+        "EXCLUDE USING gist (user_id WITH =, period WITH &&)"
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        for name, _ in INDEXES:
+            op.drop_index(name, table_name='vacation_records')
+        return
+
+    op.execute(f"ALTER TABLE vacation_records DROP CONSTRAINT IF EXISTS {OVERLAP_CONSTRAINT}")
+    op.execute("ALTER TABLE vacation_records DROP COLUMN IF EXISTS period")
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(name, table_name='vacation_records', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,24 @@
+"""Add import_checkpoints.csv_engine
+
+Revision ID: 5e0b7a3d9c21
+Revises: 8d2e5a7c1f90
+Create Date: 2026-10-18 17:40:03.215874
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e0b7a3d9c21'
+down_revision = '8d2e5a7c1f90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('import_checkpoints', sa.Column('csv_engine', sa.String(16), nullable=True))
+
+
+def downgrade():
+    op.drop_column('import_checkpoints', 'csv_engine')
@@ -0,0 +1,38 @@
+"""Add vacation_balances
+
+Revision ID: 8d2e5a7c1f90
+Revises: 3b1f9c2d7e4a
+Create Date: 2026-10-18 16:05:12.407316
+
+Backfills the balances from vacation_records; on PostgreSQL the records table is share-locked
+for the backfill so no record is written in between.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e5a7c1f90'
+down_revision = '3b1f9c2d7e4a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'vacation_balances',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('year', sa.SmallInteger(), nullable=False),
+        sa.Column('used_days', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.PrimaryKeyConstraint('user_id', 'year')
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("LOCK TABLE vacation_records IN SHARE MODE")
+    op.execute(
+        "INSERT INTO vacation_balances (user_id, year, used_days) "
+        "SELECT user_id, year, SUM(days_count) FROM vacation_records GROUP BY user_id, year"
+    )
+
+
+def downgrade():
+    op.drop_table('vacation_balances')
@@ -0,0 +1,35 @@
+"""Add import_checkpoints
+
+Revision ID: af80ccd903fd
+Revises: c6471946541c
+Create Date: 2026-10-18 11:02:17.538204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'af80ccd903fd'
+down_revision = 'c6471946541c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'import_checkpoints',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('kind', sa.String(32), nullable=False),
+        sa.Column('last_row', sa.Integer(), nullable=False, server_default=sa.text('-1')),
+        sa.Column('rows_imported', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('completed', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint('content_hash', 'kind', name='uq_import_checkpoint_hash_kind')
+    )
+
+
+def downgrade():
+    op.drop_table('import_checkpoints')
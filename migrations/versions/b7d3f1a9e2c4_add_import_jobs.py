@@ -0,0 +1,41 @@
+"""Add import_jobs
+
+Revision ID: b7d3f1a9e2c4
+Revises: 5e0b7a3d9c21
+Create Date: 2026-10-18 18:22:47.903516
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3f1a9e2c4'
+down_revision = '5e0b7a3d9c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'import_jobs',
+        sa.Column('id', sa.String(32), primary_key=True),
+        sa.Column('kind', sa.String(32), nullable=False),
+        sa.Column('status', sa.String(16), nullable=False),
+        sa.Column('file_name', sa.String(255), nullable=False),
+        sa.Column('rows_processed', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('chunks_processed', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('error_report_path', sa.String(1024), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('duration_seconds', sa.Float(), nullable=True)
+    )
+    op.create_index('ix_import_jobs_status_created_at', 'import_jobs', ['status', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_import_jobs_status_created_at', table_name='import_jobs')
+    op.drop_table('import_jobs')
@@ -0,0 +1,27 @@
+"""Add token_version to users
+
+Revision ID: c6471946541c
+Revises: c481a1849851
+Create Date: 2026-10-18 09:12:41.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6471946541c'
+down_revision = 'c481a1849851'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default=sa.text('0'), nullable=False)
+    )
+
+
+def downgrade():
+    op.drop_column('users', 'token_version')
@@ -6,3 +6,7 @@ from .user import User
 from .role import Role
 from .vacation_entitlement import VacationEntitlement
 from .vacation_record import VacationRecord
+from .import_checkpoint import ImportCheckpoint
+from .import_job import ImportJob
+
+from .vacation_balance import VacationBalance
@@ -0,0 +1,19 @@
+from . import db
+
+class ImportCheckpoint(db.Model):
+    __tablename__ = "import_checkpoints"
+
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    kind = db.Column(db.String(32), nullable=False)
+    last_row = db.Column(db.Integer, nullable=False, default=-1)
+    rows_imported = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Boolean, nullable=False, default=False)
+    # CSV engine that read the file; rows are numbered by it, so a resume must use the same one
+    csv_engine = db.Column(db.String(16), nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now(), nullable=False)
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=True, onupdate=db.func.now())
+
+    __table_args__ = (
+        db.UniqueConstraint("content_hash", "kind", name="uq_import_checkpoint_hash_kind"),
+    )
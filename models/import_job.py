@@ -0,0 +1,25 @@
+from . import db
+
+class ImportJob(db.Model):
+    """
+    State of a background import, shared by every worker process that serves the API.
+    """
+    __tablename__ = "import_jobs"
+
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    status = db.Column(db.String(16), nullable=False)
+    file_name = db.Column(db.String(255), nullable=False)
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    chunks_processed = db.Column(db.Integer, nullable=False, default=0)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    error_report_path = db.Column(db.String(1024), nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    started_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    finished_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    duration_seconds = db.Column(db.Float, nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_import_jobs_status_created_at", "status", "created_at"),
+    )
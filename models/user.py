@@ -10,6 +10,7 @@ class User(TimestampMixin, db.Model):
     password = db.Column(db.String(255), nullable=False)
     full_name = db.Column(db.String(255), nullable=True)
     role_id = db.Column(db.SmallInteger, db.ForeignKey("roles.id"), nullable=False)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default=db.text("0"))
 
     role = db.relationship("Role", back_populates="users")
     vacation_entitlements = db.relationship("VacationEntitlement", back_populates="user")
@@ -0,0 +1,74 @@
+from typing import Dict, Tuple
+from sqlalchemy import event, inspect, update
+from sqlalchemy.dialects import postgresql, sqlite
+from . import db
+from .vacation_record import VacationRecord
+
+class VacationBalance(db.Model):
+    """
+    Days used per (user, year): the running SUM(days_count) of vacation_records, kept up to
+    date in the transaction that writes the records.
+    """
+    __tablename__ = "vacation_balances"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    year = db.Column(db.SmallInteger, primary_key=True)
+    used_days = db.Column(db.Integer, nullable=False, default=0, server_default=db.text("0"))
+
+
+def add_used_days(connection, increments: Dict[Tuple[int, int], int]) -> None:
+    """
+    Adds days to the balances of {(user_id, year): days} on connection, with one upsert on
+    PostgreSQL and SQLite. Rows are written in key order so concurrent writers lock them alike.
+    """
+    rows = [
+        {"user_id": user_id, "year": year, "used_days": days}
+        for (user_id, year), days in sorted(increments.items()) if days
+    ]
+    if not rows:
+        return
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(connection.dialect.name)
+    if dialect is None:
+        for row in rows:
+            result = connection.execute(
+                update(VacationBalance)
+                .where(VacationBalance.user_id == row["user_id"], VacationBalance.year == row["year"])
+                .values(used_days=VacationBalance.used_days + row["used_days"])
+            )
+            if result.rowcount == 0:
+                connection.execute(VacationBalance.__table__.insert().values(row))
+        return
+
+    stmt = dialect.insert(VacationBalance).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[VacationBalance.user_id, VacationBalance.year],
+        set_={"used_days": VacationBalance.used_days + stmt.excluded.used_days}
+    )
+    connection.execute(stmt)
+
+
+# ORM writes of single records (create_record, fixtures, deletes) keep the balance in step here;
+# Core bulk inserts call add_used_days themselves.
+@event.listens_for(VacationRecord, "after_insert")
+def _record_inserted(mapper, connection, target):
+    add_used_days(connection, {(target.user_id, target.year): target.days_count})
+
+
+@event.listens_for(VacationRecord, "after_delete")
+def _record_deleted(mapper, connection, target):
+    add_used_days(connection, {(target.user_id, target.year): -target.days_count})
+
+
+@event.listens_for(VacationRecord, "after_update")
+def _record_updated(mapper, connection, target):
+    state = inspect(target)
+    old = []
+    for name in ("user_id", "year", "days_count"):
+        history = state.attrs[name].history
+        old.append(history.deleted[0] if history.deleted else getattr(target, name))
+    if tuple(old) == (target.user_id, target.year, target.days_count):
+        return
+    increments = {(old[0], old[1]): -old[2]}
+    key = (target.user_id, target.year)
+    increments[key] = increments.get(key, 0) + target.days_count
+    add_used_days(connection, increments)
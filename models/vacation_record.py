@@ -1,6 +1,13 @@
+from sqlalchemy import DDL, event, literal_column
+from sqlalchemy.dialects.postgresql import DATERANGE
 from . import db
 from datetime import datetime
 
+# PostgreSQL only: generated [start_date, end_date] range with an exclusion constraint, so the
+# database itself rejects overlapping vacations of a user. Created by migration 3b1f9c2d7e4a.
+OVERLAP_CONSTRAINT = "ex_vacation_records_no_overlap"
+PERIOD = literal_column("vacation_records.period", DATERANGE)
+
 class VacationRecord(db.Model):
     __tablename__ = "vacation_records"
 
@@ -13,4 +20,29 @@ class VacationRecord(db.Model):
     note = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now(), nullable=False)
 
-    user = db.relationship("User", back_populates="vacation_records")
\ No newline at end of file
+    user = db.relationship("User", back_populates="vacation_records")
+
+    __table_args__ = (
+        db.Index("ix_vacation_records_user_year", "user_id", "year"),
+        db.Index("ix_vacation_records_user_dates", "user_id", "start_date", "end_date"),
+    )
+
+
+event.listen(
+    VacationRecord.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql")
+)
+event.listen(
+    VacationRecord.__table__, "after_create",
+    DDL(
+        "ALTER TABLE vacation_records ADD COLUMN period daterange "
+        "GENERATED ALWAYS AS (daterange(start_date, end_date, '[]')) STORED"
+    ).execute_if(dialect="postgresql")
+)
+event.listen(
+    VacationRecord.__table__, "after_create",
+    DDL(
+        f"ALTER TABLE vacation_records ADD CONSTRAINT {OVERLAP_CONSTRAINT} "
+        "EXCLUDE USING gist (user_id WITH =, period WITH &&)"
+    ).execute_if(dialect="postgresql")
+)
@@ -1,4 +1,6 @@
 from .role_repository import RoleRepository
 from .user_repository import UserRepository
 from .vacation_record_repository import VacationRecordRepository
-from .vacation_entitlement_repository import VacationEntitlementRepository
\ No newline at end of file
+from .vacation_entitlement_repository import VacationEntitlementRepository
+from .import_checkpoint_repository import ImportCheckpointRepository
+from .vacation_balance_repository import VacationBalanceRepository
\ No newline at end of file
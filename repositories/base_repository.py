@@ -1,9 +1,76 @@
-from typing import TypeVar, Generic, List, Optional, Any
+import io
+from typing import TypeVar, Generic, Iterable, Iterator, List, Optional, Any, Sequence
+from sqlalchemy import column, insert, table, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 T = TypeVar('T')
 
+IN_CLAUSE_BATCH_SIZE = 1000
+# below this many rows a multi-row INSERT is as fast as COPY plus the staging round trips
+COPY_MIN_ROWS = 500
+
+def batched(values: Iterable, size: int = IN_CLAUSE_BATCH_SIZE) -> Iterator[list]:
+    batch = []
+    for value in values:
+        batch.append(value)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def dialect_insert(session: Session, model):
+    """
+    INSERT construct for the session's backend, so ON CONFLICT is available on PostgreSQL (and SQLite).
+    """
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name == 'postgresql':
+        return postgresql.insert(model)
+    if dialect_name == 'sqlite':
+        return sqlite.insert(model)
+    return insert(model)
+
+def supports_copy(session: Session) -> bool:
+    dialect = session.get_bind().dialect
+    return dialect.name == 'postgresql' and dialect.driver == 'psycopg2'
+
+def _copy_value(value) -> str:
+    # every value is quoted, so only an unquoted empty field is read as NULL
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        value = 't' if value else 'f'
+    return '"' + str(value).replace('"', '""') + '"'
+
+def copy_to_staging(session: Session, model, columns: Sequence[str], rows: Iterable[dict]):
+    """
+    Streams rows into a temporary staging table shaped like model's table with
+    COPY ... FROM STDIN (psycopg2 only) and returns that table for INSERT ... SELECT.
+    The staging table lives in the session's transaction and is dropped on commit.
+    """
+    staging = f"staging_{model.__tablename__}"
+    column_list = ", ".join(columns)
+    session.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS {staging} ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM {model.__tablename__} WITH NO DATA"
+    ))
+    session.execute(text(f"TRUNCATE {staging}"))
+
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_value(row.get(name)) for name in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+    return table(staging, *[column(name) for name in columns])
+
 class BaseRepository(Generic[T]):
 
     def __init__(self, session: Session, model: type[T]):
@@ -0,0 +1,31 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from models.import_checkpoint import ImportCheckpoint
+
+class ImportCheckpointRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get(self, content_hash: str, kind: str) -> Optional[ImportCheckpoint]:
+        return (
+            self.session.query(ImportCheckpoint)
+            .filter(
+                ImportCheckpoint.content_hash == content_hash,
+                ImportCheckpoint.kind == kind
+            )
+            .first()
+        )
+
+    def get_or_create(self, content_hash: str, kind: str) -> ImportCheckpoint:
+        checkpoint = self.get(content_hash, kind)
+        if not checkpoint:
+            checkpoint = ImportCheckpoint(
+                content_hash=content_hash,
+                kind=kind,
+                last_row=-1,
+                rows_imported=0,
+                completed=False
+            )
+            self.session.add(checkpoint)
+            self.session.flush()
+        return checkpoint
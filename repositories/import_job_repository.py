@@ -0,0 +1,33 @@
+from typing import Iterable, List, Optional
+from sqlalchemy.orm import Session
+from models.import_job import ImportJob
+
+class ImportJobRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        return self.session.get(ImportJob, job_id)
+
+    def add(self, job: ImportJob) -> ImportJob:
+        self.session.add(job)
+        self.session.flush()
+        return job
+
+    def update(self, job_id: str, **values) -> None:
+        self.session.query(ImportJob).filter(ImportJob.id == job_id).update(values, synchronize_session=False)
+
+    def delete_oldest(self, statuses: Iterable[str], keep: int) -> List[Optional[str]]:
+        """
+        Deletes jobs in statuses except the newest keep; returns their error report paths.
+        """
+        old = (
+            self.session.query(ImportJob)
+            .filter(ImportJob.status.in_(list(statuses)))
+            .order_by(ImportJob.created_at.desc())
+            .offset(keep)
+            .all()
+        )
+        for job in old:
+            self.session.delete(job)
+        return [job.error_report_path for job in old]
@@ -1,6 +1,15 @@
 import base64
-from typing import List, Optional
-from .base_repository import BaseRepository
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from .base_repository import (
+    COPY_MIN_ROWS,
+    BaseRepository,
+    batched,
+    copy_to_staging,
+    dialect_insert,
+    supports_copy,
+)
 from models.user import User
 
 class UserRepository(BaseRepository[User]):
@@ -30,3 +39,62 @@ class UserRepository(BaseRepository[User]):
             .filter(User.email == email)
             .first()
         )
+
+    def get_by_email_with_role(self, email: str) -> Optional[User]:
+        return (
+            self.session.query(User)
+            .options(joinedload(User.role))
+            .filter(User.email == email)
+            .first()
+        )
+
+    def get_by_id_with_role(self, user_id: int) -> Optional[User]:
+        return self.session.get(User, user_id, options=[joinedload(User.role)])
+
+    def get_token_version(self, user_id: int) -> Optional[int]:
+        return (
+            self.session.query(User.token_version)
+            .filter(User.id == user_id, User.deleted_at.is_(None))
+            .scalar()
+        )
+
+    def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        emails = list(emails)
+        if not emails:
+            return set()
+        rows = (
+            self.session.query(User.email)
+            .filter(User.email.in_(emails))
+            .all()
+        )
+        return {row.email for row in rows}
+
+    def get_ids_by_emails(self, emails: Iterable[str]) -> Dict[str, int]:
+        ids = {}
+        for batch in batched(set(emails)):
+            rows = (
+                self.session.query(User.id, User.email)
+                .filter(User.email.in_(batch))
+                .all()
+            )
+            ids.update({row.email: row.id for row in rows})
+        return ids
+
+    def bulk_insert_ignore_existing(self, rows: List[Dict]) -> Dict[str, int]:
+        """
+        Multi-row INSERT ... ON CONFLICT (email) DO NOTHING RETURNING id, email.
+        Large batches on PostgreSQL are COPYed into a staging table and inserted from there.
+        Returns {email: id} for the rows that were actually inserted.
+        """
+        if not rows:
+            return {}
+        if len(rows) >= COPY_MIN_ROWS and supports_copy(self.session):
+            columns = list(rows[0])
+            staging = copy_to_staging(self.session, User, columns, rows)
+            stmt = dialect_insert(self.session, User).from_select(columns, select(*staging.c))
+        else:
+            stmt = dialect_insert(self.session, User).values(rows)
+        if hasattr(stmt, 'on_conflict_do_nothing'):
+            stmt = stmt.on_conflict_do_nothing(index_elements=[User.email])
+        stmt = stmt.returning(User.id, User.email)
+        return {row.email: row.id for row in self.session.execute(stmt)}
@@ -0,0 +1,68 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, literal, select, text
+from sqlalchemy.orm import Session
+from models.vacation_balance import VacationBalance, add_used_days
+from models.vacation_record import VacationRecord
+
+Mismatch = Tuple[int, int, int, int]
+
+class VacationBalanceRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add_used_days(self, increments: Dict[Tuple[int, int], int]) -> None:
+        add_used_days(self.session.connection(), increments)
+
+    def _actual(self, user_id: Optional[int] = None):
+        query = select(
+            VacationRecord.user_id,
+            VacationRecord.year,
+            func.sum(VacationRecord.days_count).label("used_days")
+        ).group_by(VacationRecord.user_id, VacationRecord.year)
+        if user_id is not None:
+            query = query.where(VacationRecord.user_id == user_id)
+        return query
+
+    def rebuild(self, user_id: Optional[int] = None) -> int:
+        """
+        Recomputes the balances (of one user) from vacation_records and returns the number of
+        balance rows written. On PostgreSQL vacation_records is share-locked until commit so
+        no record is written in between.
+        """
+        if self.session.get_bind().dialect.name == 'postgresql':
+            self.session.execute(text("LOCK TABLE vacation_records IN SHARE MODE"))
+        stmt = delete(VacationBalance)
+        if user_id is not None:
+            stmt = stmt.where(VacationBalance.user_id == user_id)
+        self.session.execute(stmt)
+        result = self.session.execute(
+            insert(VacationBalance).from_select(["user_id", "year", "used_days"], self._actual(user_id))
+        )
+        return result.rowcount
+
+    def verify(self, user_id: Optional[int] = None) -> List[Mismatch]:
+        """
+        Returns (user_id, year, stored, actual) for every balance that differs from the sum
+        of its vacation_records, including missing and orphaned balance rows.
+        """
+        actual = self._actual(user_id).subquery()
+        missing_or_wrong = (
+            select(actual.c.user_id, actual.c.year, func.coalesce(VacationBalance.used_days, 0), actual.c.used_days)
+            .outerjoin(
+                VacationBalance,
+                (VacationBalance.user_id == actual.c.user_id) & (VacationBalance.year == actual.c.year)
+            )
+            .where(func.coalesce(VacationBalance.used_days, 0) != actual.c.used_days)
+        )
+        orphaned = (
+            select(VacationBalance.user_id, VacationBalance.year, VacationBalance.used_days, literal(0))
+            .outerjoin(
+                actual,
+                (VacationBalance.user_id == actual.c.user_id) & (VacationBalance.year == actual.c.year)
+            )
+            .where(actual.c.user_id.is_(None), VacationBalance.used_days != 0)
+        )
+        if user_id is not None:
+            orphaned = orphaned.where(VacationBalance.user_id == user_id)
+        rows = list(self.session.execute(missing_or_wrong)) + list(self.session.execute(orphaned))
+        return sorted(tuple(int(value) for value in row) for row in rows)
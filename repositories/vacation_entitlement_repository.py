@@ -1,6 +1,10 @@
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from models.vacation_entitlement import VacationEntitlement
+from constants import EntitlementConflictPolicy
+from .base_repository import batched, dialect_insert
 
 class VacationEntitlementRepository:
     def __init__(self, session: Session):
@@ -15,6 +19,23 @@ class VacationEntitlementRepository:
             )
             .first()
         )
+
+    def lock_total_days(self, user_id: int, year: int) -> int:
+        """
+        Reads total_days with SELECT ... FOR UPDATE, so the user's bookings for that year run
+        one at a time until the transaction ends. 0 when there is no entitlement.
+        """
+        total_days = (
+            self.session.query(VacationEntitlement.total_days)
+            .filter(
+                VacationEntitlement.user_id == user_id,
+                VacationEntitlement.year == year
+            )
+            .with_for_update()
+            .scalar()
+        )
+        return total_days or 0
+
     def create_vacation_entitlement(
             self,
             user_id: int,
@@ -26,4 +47,74 @@ class VacationEntitlementRepository:
                 year=year,
                 total_days=total_days
             )
-            return entitlement
\ No newline at end of file
+            return entitlement
+
+    def get_total_days_by_user_year(
+        self,
+        user_ids: Iterable[int],
+        years: Iterable[int]
+    ) -> Dict[Tuple[int, int], int]:
+        years = list(set(years))
+        totals = {}
+        for batch in batched(set(user_ids)):
+            rows = (
+                self.session.query(
+                    VacationEntitlement.user_id,
+                    VacationEntitlement.year,
+                    VacationEntitlement.total_days
+                )
+                .filter(
+                    VacationEntitlement.user_id.in_(batch),
+                    VacationEntitlement.year.in_(years)
+                )
+                .all()
+            )
+            totals.update({(row.user_id, row.year): row.total_days or 0 for row in rows})
+        return totals
+
+    def get_user_ids_with_entitlement(self, user_ids: Iterable[int], year: int) -> Set[int]:
+        existing = set()
+        for batch in batched(set(user_ids)):
+            rows = (
+                self.session.query(VacationEntitlement.user_id)
+                .filter(
+                    VacationEntitlement.user_id.in_(batch),
+                    VacationEntitlement.year == year
+                )
+                .all()
+            )
+            existing.update(row.user_id for row in rows)
+        return existing
+
+    def upsert_many(self, rows: List[Dict], policy: str = EntitlementConflictPolicy.SKIP) -> None:
+        """
+        One INSERT ... ON CONFLICT (user_id, year) for all rows (dicts with user_id, year, total_days).
+        skip keeps the existing entitlement, overwrite replaces total_days, add sums them.
+        """
+        if not rows:
+            return
+        now = datetime.now(timezone.utc)
+        stmt = dialect_insert(self.session, VacationEntitlement).values(
+            [{**row, "created_at": now} for row in rows]
+        )
+        conflict_target = [VacationEntitlement.user_id, VacationEntitlement.year]
+
+        if policy == EntitlementConflictPolicy.SKIP:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_target)
+        elif policy == EntitlementConflictPolicy.OVERWRITE:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_target,
+                set_={"total_days": stmt.excluded.total_days, "updated_at": now}
+            )
+        elif policy == EntitlementConflictPolicy.ADD:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_target,
+                set_={
+                    "total_days": func.coalesce(VacationEntitlement.total_days, 0) + stmt.excluded.total_days,
+                    "updated_at": now
+                }
+            )
+        else:
+            raise ValueError(f"Unknown conflict policy: {policy}")
+
+        self.session.execute(stmt)
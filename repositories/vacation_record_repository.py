@@ -1,8 +1,18 @@
-from sqlalchemy import func
+from sqlalchemy import and_, exists, func, insert, literal, select, true, tuple_
+from sqlalchemy.dialects import postgresql
+from dataclasses import dataclass
 from datetime import date
-from typing import List
-from .base_repository import BaseRepository
-from models.vacation_record import VacationRecord
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .base_repository import COPY_MIN_ROWS, BaseRepository, batched, copy_to_staging, supports_copy
+from constants import VacationBookingReason
+from models.vacation_balance import VacationBalance, add_used_days
+from models.vacation_record import PERIOD, VacationRecord
+
+@dataclass(frozen=True)
+class Booking:
+    record: Optional[Any]
+    reason: Optional[str]
+    used_days: int
 
 class VacationRecordRepository(BaseRepository[VacationRecord]):
     def __init__(self, session):
@@ -23,51 +33,199 @@ class VacationRecordRepository(BaseRepository[VacationRecord]):
         self.session.add(record)
         return record
     
+    def bulk_create(self, records: List[Dict]) -> int:
+        """
+        records: dicts with user_id, start_date, end_date, days_count, year, note
+        Large batches on PostgreSQL go through COPY into a staging table, others use executemany.
+        Core inserts skip the VacationRecord mapper events, so the balances are added here.
+        """
+        if not records:
+            return 0
+        if len(records) >= COPY_MIN_ROWS and supports_copy(self.session):
+            columns = list(records[0])
+            staging = copy_to_staging(self.session, VacationRecord, columns, records)
+            self.session.execute(insert(VacationRecord).from_select(columns, select(*staging.c)))
+        else:
+            self.session.execute(insert(VacationRecord), records)
+        increments: Dict[Tuple[int, int], int] = {}
+        for record in records:
+            key = (record["user_id"], record["year"])
+            increments[key] = increments.get(key, 0) + record["days_count"]
+        add_used_days(self.session.connection(), increments)
+        return len(records)
+
+    def get_used_days_by_user_year(
+        self,
+        user_ids: Iterable[int],
+        years: Iterable[int]
+    ) -> Dict[Tuple[int, int], int]:
+        years = list(set(years))
+        used = {}
+        for batch in batched(set(user_ids)):
+            rows = (
+                self.session.query(VacationBalance.user_id, VacationBalance.year, VacationBalance.used_days)
+                .filter(
+                    VacationBalance.user_id.in_(batch),
+                    VacationBalance.year.in_(years)
+                )
+                .all()
+            )
+            used.update({(row.user_id, row.year): row.used_days for row in rows})
+        return used
+
+    def get_intervals_by_user(
+        self,
+        user_ids: Iterable[int],
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> Dict[int, List[Tuple[date, date]]]:
+        intervals: Dict[int, List[Tuple[date, date]]] = {}
+        for batch in batched(set(user_ids)):
+            query = self.session.query(
+                VacationRecord.user_id,
+                VacationRecord.start_date,
+                VacationRecord.end_date
+            ).filter(VacationRecord.user_id.in_(batch))
+            if to_date is not None:
+                query = query.filter(VacationRecord.start_date <= to_date)
+            if from_date is not None:
+                query = query.filter(VacationRecord.end_date >= from_date)
+            rows = query.all()
+            for row in rows:
+                intervals.setdefault(row.user_id, []).append((row.start_date, row.end_date))
+        return intervals
+
     def get_used_days_in_year(self, user_id: int, year: int) -> int:
+        """
+        Primary-key read of the maintained vacation_balances row.
+        """
         result = (
-            self.session.query(func.sum(VacationRecord.days_count))
+            self.session.query(VacationBalance.used_days)
             .filter(
-                VacationRecord.user_id == user_id,
-                VacationRecord.year == year
+                VacationBalance.user_id == user_id,
+                VacationBalance.year == year
             )
             .scalar()
         )
         return result or 0
     
+    def _overlapping(self, user_id: int, start_date: date, end_date: date):
+        """
+        On PostgreSQL this probes the GiST index behind the period exclusion constraint;
+        elsewhere the (user_id, start_date, end_date) index.
+        """
+        if self.session.get_bind().dialect.name == 'postgresql':
+            overlaps = PERIOD.op('&&')(func.daterange(start_date, end_date, '[]'))
+        else:
+            overlaps = and_(VacationRecord.start_date <= end_date, VacationRecord.end_date >= start_date)
+        return exists().where(VacationRecord.user_id == user_id, overlaps)
+
     def has_overlap(
         self,
         user_id: int,
         start_date: date,
         end_date: date,
     ) -> bool:
-        query = self.session.query(VacationRecord).filter(
-            VacationRecord.user_id == user_id,
-            VacationRecord.start_date <= end_date,
-            VacationRecord.end_date >= start_date
+        return self.session.query(self._overlapping(user_id, start_date, end_date)).scalar()
+
+    def book(self, user_id: int, start_date: date, end_date: date, note: str, total_days: int) -> Booking:
+        """
+        Inserts the record unless it overlaps another one of the user or needs more than
+        total_days minus the days already used that year. The caller holds the entitlement lock.
+        On PostgreSQL the checks, the insert and the balance update are one statement.
+        """
+        days_count = (end_date - start_date).days + 1
+        year = start_date.year
+        if self.session.get_bind().dialect.name != 'postgresql':
+            used_days = self.get_used_days_in_year(user_id, year)
+            if self.has_overlap(user_id, start_date, end_date):
+                return Booking(None, VacationBookingReason.OVERLAP, used_days)
+            if used_days + days_count > total_days:
+                return Booking(None, VacationBookingReason.NOT_ENOUGH_DAYS, used_days)
+            record = self.create_record(user_id, start_date, end_date, note)
+            self.session.flush()
+            return Booking(record, None, used_days)
+
+        checks = select(
+            self._overlapping(user_id, start_date, end_date).label("overlap"),
+            func.coalesce(
+                select(VacationBalance.used_days)
+                .where(VacationBalance.user_id == user_id, VacationBalance.year == year)
+                .scalar_subquery(),
+                0
+            ).label("used_days")
+        ).cte("checks")
+        inserted = (
+            insert(VacationRecord)
+            .from_select(
+                ["user_id", "start_date", "end_date", "days_count", "year", "note"],
+                select(
+                    literal(user_id), literal(start_date), literal(end_date),
+                    literal(days_count), literal(year), literal(note)
+                ).where(~checks.c.overlap, checks.c.used_days + days_count <= total_days)
+            )
+            .returning(*VacationRecord.__table__.c)
+            .cte("inserted")
+        )
+        balance = postgresql.insert(VacationBalance).from_select(
+            ["user_id", "year", "used_days"],
+            select(inserted.c.user_id, inserted.c.year, inserted.c.days_count)
+        )
+        balance = balance.on_conflict_do_update(
+            index_elements=[VacationBalance.user_id, VacationBalance.year],
+            set_={"used_days": VacationBalance.used_days + balance.excluded.used_days}
+        )
+        stmt = (
+            select(checks.c.overlap, checks.c.used_days, *inserted.c)
+            .select_from(checks.outerjoin(inserted, true()))
+            .add_cte(balance.cte("balance"))
         )
-        return query.first() is not None
+        row = self.session.execute(stmt).one()
+        if row.id is not None:
+            return Booking(row, None, row.used_days)
+        if row.overlap:
+            return Booking(None, VacationBookingReason.OVERLAP, row.used_days)
+        return Booking(None, VacationBookingReason.NOT_ENOUGH_DAYS, row.used_days)
 
-    def get_by_date_range(
+    def get_page_by_date_range(
         self,
         user_id: int,
         from_date: date,
         to_date: date,
-        page: int = 1,
-        per_page: int = 20
-    ) -> List[VacationRecord]:
-        offset = (page - 1) * per_page
-        return (
-            self.session.query(VacationRecord)
-            .filter(
-                VacationRecord.user_id == user_id,
-                VacationRecord.start_date >= from_date,
-                VacationRecord.end_date <= to_date
+        limit: int = 20,
+        after: Optional[Tuple[date, int]] = None,
+        with_total: bool = False
+    ) -> Tuple[List[VacationRecord], bool, Optional[int]]:
+        """
+        Keyset page ordered by (start_date, id) descending: the records after the (start_date, id)
+        of the previous page's last record. Returns (records, has_next, total); total is only
+        counted when with_total is set, in the same query on the first page.
+        """
+        query = self.session.query(VacationRecord).filter(
+            VacationRecord.user_id == user_id,
+            VacationRecord.start_date >= from_date,
+            VacationRecord.end_date <= to_date
+        )
+        total = None
+        if after is not None:
+            # the plain start_date bound lets the (user_id, start_date, end_date) index start at the cursor
+            query = query.filter(
+                VacationRecord.start_date <= after[0],
+                tuple_(VacationRecord.start_date, VacationRecord.id) < tuple_(*after)
             )
-            .order_by(VacationRecord.start_date.desc())
-            .offset(offset)
-            .limit(per_page)
+            if with_total:
+                total = self.count_by_date_range(user_id, from_date, to_date)
+        elif with_total:
+            query = query.add_columns(func.count().over().label("total"))
+        rows = (
+            query.order_by(VacationRecord.start_date.desc(), VacationRecord.id.desc())
+            .limit(limit + 1)
             .all()
         )
+        if after is None and with_total:
+            total = rows[0].total if rows else 0
+            rows = [row.VacationRecord for row in rows]
+        return rows[:limit], len(rows) > limit, total
 
     def count_by_date_range(
         self,
@@ -75,8 +233,8 @@ class VacationRecordRepository(BaseRepository[VacationRecord]):
         from_date: date,
         to_date: date
     ) -> int:
-        result = (
-            self.session.query(func.sum(VacationRecord.days_count))
+        return (
+            self.session.query(func.count(VacationRecord.id))
             .filter(
                 VacationRecord.user_id == user_id,
                 VacationRecord.start_date >= from_date,
@@ -84,4 +242,3 @@ class VacationRecordRepository(BaseRepository[VacationRecord]):
             )
             .scalar()
         )
-        return result or 0
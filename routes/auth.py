@@ -0,0 +1,46 @@
+from flask import Blueprint, request, current_app
+from flask_injector import inject
+from services.user_service import UserService
+from utils.response import ApiResponse
+from utils.auth_token import issue_token
+from middleware.auth import decode_basic_auth
+import logging
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('auth', __name__, url_prefix='/auth')
+
+
+@bp.route('/login', methods=['POST'])
+@inject
+def login(user_service: UserService):
+    """
+    POST /auth/login
+    Authorization: Basic base64(email:password)
+    """
+    try:
+        credentials = decode_basic_auth(request.headers.get('Authorization'))
+        if not credentials:
+            return ApiResponse.error('Authorization required. Provide valid Basic Auth credentials (email:password base64 encoded)', 401)
+
+        email, password = credentials
+        user = user_service.authenticate(email, password)
+        if not user:
+            return ApiResponse.error('Invalid credentials', 401)
+
+        expires_in = current_app.config["AUTH_TOKEN_TTL"]
+        token = issue_token(
+            current_app.config["SECRET_KEY"],
+            user_id=user.id,
+            role_id=user.role_id,
+            token_version=user.token_version
+        )
+        logger.info(f"Issued access token for user {user.id}")
+        return ApiResponse.success({
+            "access_token": token,
+            "token_type": "Bearer",
+            "expires_in": expires_in
+        })
+    except Exception as e:
+        logger.error(f"Error during login: {e}", exc_info=True)
+        return ApiResponse.error("Internal server error", 500)
@@ -1,36 +1,49 @@
-from flask import Blueprint, request, current_app
+from flask import Blueprint, current_app, request, send_file, url_for
 from flask_injector import inject
-from services.import_service import ImportService
-from werkzeug.utils import secure_filename
+from services.import_job_manager import ImportJobManager, ImportJobKind, ImportJobStatus, ImportQueueFullError
 from utils.response import ApiResponse
-from utils.file_helper import save_uploaded_file
+from utils.file_helper import store_uploaded_file, UploadTooLargeError
 from middleware.auth import login_required, admin_required
-import os
+from constants import EntitlementConflictPolicy
 import logging
 
 logger = logging.getLogger(__name__)
 
 bp = Blueprint('import', __name__, url_prefix='/import')
 
+
+def _sheet_option():
+    return request.form.get('sheet') or request.args.get('sheet') or None
+
+def _queue_import(job_manager: ImportJobManager, kind: str, **options):
+    if 'file' not in request.files:
+        return ApiResponse.error("File required", 400)
+
+    file = request.files['file']
+    if not file.filename:
+        return ApiResponse.error("Empty file name", 400)
+
+    try:
+        upload = store_uploaded_file(file, max_bytes=current_app.config["UPLOAD_MAX_BYTES"])
+    except UploadTooLargeError as e:
+        return ApiResponse.error(str(e), 413)
+
+    try:
+        job = job_manager.submit(kind, upload.path, content_hash=upload.sha256, sheet=_sheet_option(), **options)
+    except ImportQueueFullError as e:
+        return ApiResponse.error(str(e), 429)
+
+    data = job.model_dump(mode='json')
+    data['status_url'] = url_for('import.get_import_job', job_id=job.id)
+    return ApiResponse.success(data, 200 if job.status in ImportJobStatus.FINISHED else 202)
+
 @bp.route('/users', methods=['POST'])
 @login_required
 @admin_required
 @inject
-def import_users(import_service: ImportService):
+def import_users(job_manager: ImportJobManager):
     try:
-        if 'file' not in request.files:
-            return ApiResponse.error("File required", 400)
-
-        file = request.files['file']
-        if not file.filename:
-            return ApiResponse.error("Empty file name", 400)
-
-        upload_path = save_uploaded_file(file)
-
-        result = import_service.import_users_from_file(upload_path)
-        import_service.session.commit()
-        status = 200 if result.success else 400
-        return ApiResponse.success(result.model_dump(), status)
+        return _queue_import(job_manager, ImportJobKind.USERS)
     except Exception as e:
         logger.error(f"Error in /users import: {e}")
         return ApiResponse.error(f"Server error: {str(e)}", 500)
@@ -39,21 +52,9 @@ def import_users(import_service: ImportService):
 @login_required
 @admin_required
 @inject
-def import_vacations(import_service: ImportService):
+def import_vacations(job_manager: ImportJobManager):
     try:
-        if 'file' not in request.files:
-            return ApiResponse.error("File required", 400)
-
-        file = request.files['file']
-        if not file.filename:
-            return ApiResponse.error("Empty file name", 400)
-
-        upload_path = save_uploaded_file(file)
-
-        result = import_service.import_vacation_records_from_file(upload_path)
-        import_service.session.commit()
-        status = 200 if result.success else 400
-        return ApiResponse.success(result.model_dump(), status)
+        return _queue_import(job_manager, ImportJobKind.VACATIONS)
     except Exception as e:
         logger.error(f"Error in /vacations import: {e}")
         return ApiResponse.error(f"Server error: {str(e)}", 500)
@@ -62,21 +63,50 @@ def import_vacations(import_service: ImportService):
 @login_required
 @admin_required
 @inject
-def import_entitlements(import_service: ImportService):
+def import_entitlements(job_manager: ImportJobManager):
     try:
-        if 'file' not in request.files:
-            return ApiResponse.error("File required", 400)
-
-        file = request.files['file']
-        if not file.filename:
-            return ApiResponse.error("Empty file name", 400)
+        policy = request.form.get('on_conflict') or request.args.get('on_conflict') or EntitlementConflictPolicy.SKIP
+        if policy not in EntitlementConflictPolicy.ALL:
+            return ApiResponse.error(
+                f"on_conflict must be one of: {', '.join(EntitlementConflictPolicy.ALL)}", 400
+            )
+        return _queue_import(job_manager, ImportJobKind.ENTITLEMENTS, policy=policy)
+    except Exception as e:
+        logger.error(f"Error in /entitlements import: {e}")
+        return ApiResponse.error(f"Server error: {str(e)}", 500)
 
-        upload_path = save_uploaded_file(file)
+@bp.route('/jobs/<job_id>', methods=['GET'])
+@login_required
+@admin_required
+@inject
+def get_import_job(job_id: str, job_manager: ImportJobManager):
+    try:
+        job = job_manager.get(job_id)
+        if not job:
+            return ApiResponse.error("Import job not found", 404)
+        data = job.model_dump(mode='json')
+        if job.result and job.result.error_total:
+            data['errors_url'] = url_for('import.get_import_job_errors', job_id=job.id)
+        return ApiResponse.success(data)
+    except Exception as e:
+        logger.error(f"Error fetching import job {job_id}: {e}")
+        return ApiResponse.error(f"Server error: {str(e)}", 500)
 
-        result = import_service.import_vacation_entitlements_from_file(upload_path)
-        import_service.session.commit()
-        status = 200 if result.success else 400
-        return ApiResponse.success(result.model_dump(), status)
+@bp.route('/jobs/<job_id>/errors', methods=['GET'])
+@login_required
+@admin_required
+@inject
+def get_import_job_errors(job_id: str, job_manager: ImportJobManager):
+    try:
+        path = job_manager.get_error_report_path(job_id)
+        if not path:
+            return ApiResponse.error("Error report not found", 404)
+        return send_file(
+            path,
+            mimetype='text/csv',
+            as_attachment=True,
+            download_name=f"import_{job_id}_errors.csv"
+        )
     except Exception as e:
-        logger.error(f"Error in /entitlements import: {e}")
-        return ApiResponse.error(f"Server error: {str(e)}", 500)
\ No newline at end of file
+        logger.error(f"Error fetching import errors for job {job_id}: {e}")
+        return ApiResponse.error(f"Server error: {str(e)}", 500)
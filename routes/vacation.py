@@ -1,6 +1,6 @@
 from flask import Blueprint, request
 from flask_injector import inject
-from services.vacation_service import VacationService
+from services.vacation_service import VacationBookingError, VacationService
 from dto import (
     CheckOverlapRequest,
     VacationSummaryDTO,
@@ -18,6 +18,8 @@ logger = logging.getLogger(__name__)
 
 bp = Blueprint('vacation', __name__, url_prefix='/vacation')
 
+MAX_PER_PAGE = 100
+
 
 @bp.route('/users/<int:user_id>/summary', methods=['GET'])
 @login_required
@@ -81,6 +83,10 @@ def create_vacation_record(user_id: int, vacation_service: VacationService):
         record = vacation_service.create_vacation(user_id, data)
         vacation_service.session.commit()
         return ApiResponse.success(record.model_dump(), 201)
+    except VacationBookingError as e:
+        vacation_service.session.rollback()
+        logger.info(f"Vacation for user {user_id} rejected ({e.reason}): {e}")
+        return ApiResponse.error(str(e), 400, {"reason": e.reason})
     except ValueError as e:
         vacation_service.session.rollback()
         logger.warning(f"Validation error creating vacation for user {user_id}: {e}")
@@ -123,16 +129,19 @@ def create_entitlement(user_id: int, vacation_service: VacationService):
 @inject
 def get_vacation_records(user_id: int, vacation_service: VacationService):
     """
-    GET /vacation/users/1/records?from_date=2025-07-01&to_date=2025-07-31&page=1&per_page=20
+    GET /vacation/users/1/records?from_date=2025-07-01&to_date=2025-07-31&per_page=20&cursor=<next_cursor>&include_total=true
     """
     try:
         from_date_str: Optional[str] = request.args.get('from_date')
         to_date_str: Optional[str] = request.args.get('to_date')
-        page: int = request.args.get('page', 1, type=int)
         per_page: int = request.args.get('per_page', 20, type=int)
+        cursor: Optional[str] = request.args.get('cursor') or None
+        include_total: bool = request.args.get('include_total', '').lower() in ('1', 'true', 'yes')
 
         if not from_date_str or not to_date_str:
             return ApiResponse.error("from_date and to_date query parameters are required", 400)
+        if not 1 <= per_page <= MAX_PER_PAGE:
+            return ApiResponse.error(f"per_page must be between 1 and {MAX_PER_PAGE}", 400)
 
         from_date = datetime.strptime(from_date_str, "%Y-%m-%d").date()
         to_date = datetime.strptime(to_date_str, "%Y-%m-%d").date()
@@ -141,8 +150,9 @@ def get_vacation_records(user_id: int, vacation_service: VacationService):
             user_id=user_id,
             from_date=from_date,
             to_date=to_date,
-            page=page,
-            per_page=per_page
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total
         )
 
         return ApiResponse.success(vacations.model_dump())
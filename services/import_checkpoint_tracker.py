@@ -0,0 +1,129 @@
+import hashlib
+from typing import Optional, Union
+import pandas as pd
+from sqlalchemy.orm import Session
+from utils.file_helper import file_sha256
+
+
+def checkpoint_key(content_hash: str, sheet: Union[str, int, None] = None) -> str:
+    """
+    Checkpoints are per file content, or per worksheet when a sheet is selected.
+    """
+    if sheet is None:
+        return content_hash
+    return hashlib.sha256(f"{content_hash}:{sheet}".encode("utf-8")).hexdigest()
+
+
+class ImportCheckpointTracker:
+    """
+    Commits an import chunk by chunk and records the last committed data row per
+    (file content hash, import kind), so re-uploading the same file resumes after that row
+    and a completed file is not imported twice. With enabled=False nothing is committed;
+    each chunk runs in a savepoint instead, so a failed chunk is undone on its own (on SQLite,
+    whose driver commits on RELEASE outside a BEGIN, the whole session is rolled back).
+    After a failed chunk the checkpoint stays before it and is never completed, so the
+    import should stop there and a re-upload retries from the failed rows.
+    A CSV file is resumed only with the CSV engine that started it: the engines differ in
+    which malformed lines they keep, so they may number the rows differently.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        repository,
+        file_path: str,
+        kind: str,
+        enabled: bool = True,
+        content_hash: Optional[str] = None,
+        sheet: Union[str, int, None] = None,
+        csv_engine: Optional[str] = None
+    ):
+        self.session = session
+        self.enabled = enabled and repository is not None
+        self.checkpoint = None
+        if self.enabled:
+            key = checkpoint_key(content_hash or file_sha256(file_path), sheet)
+            self.checkpoint = repository.get_or_create(key, kind)
+            self._check_csv_engine(csv_engine)
+            self.session.commit()
+        self.resume_after = self.checkpoint.last_row if self.checkpoint else -1
+        self.failed = False
+        self._savepoint = None
+
+    def _check_csv_engine(self, csv_engine: Optional[str]) -> None:
+        started = self.checkpoint.last_row >= 0 and not self.checkpoint.completed
+        previous = self.checkpoint.csv_engine
+        if started and previous and previous != csv_engine:
+            raise ValueError(
+                f"This file was partly imported with the {previous} CSV engine; "
+                f"resume it with IMPORT_CSV_ENGINE={previous}"
+            )
+        self.checkpoint.csv_engine = csv_engine
+
+    @property
+    def completed(self) -> bool:
+        return bool(self.checkpoint and self.checkpoint.completed)
+
+    @property
+    def rows_imported(self) -> int:
+        return self.checkpoint.rows_imported if self.checkpoint else 0
+
+    def committed_rows(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Rows of chunk an earlier run already imported."""
+        return chunk[chunk.index <= self.resume_after]
+
+    def pending_rows(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if self.resume_after < 0:
+            return chunk
+        return chunk[chunk.index > self.resume_after]
+
+    @property
+    def halted(self) -> bool:
+        """True when a chunk failed and later chunks must not be imported past it."""
+        return self.enabled and self.failed
+
+    def begin_chunk(self) -> None:
+        if not self.enabled and self.session.get_bind().dialect.name != 'sqlite':
+            self._savepoint = self.session.begin_nested()
+
+    def commit_chunk(self, chunk: pd.DataFrame, imported: int) -> None:
+        if self._savepoint is not None:
+            self._savepoint.commit()
+            self._savepoint = None
+        if not self.enabled or self.failed or chunk.empty:
+            return
+        self.checkpoint.last_row = int(chunk.index[-1])
+        self.checkpoint.rows_imported += imported
+        self.session.commit()
+
+    def rollback_chunk(self) -> None:
+        self.failed = True
+        if self._savepoint is not None:
+            self._savepoint.rollback()
+            self._savepoint = None
+        else:
+            self.session.rollback()
+
+    def complete(self) -> None:
+        if not self.enabled or self.failed:
+            return
+        self.checkpoint.completed = True
+        self.session.commit()
+
+    def failure_note(self) -> str:
+        if self.enabled:
+            return "A chunk failed, so the import stopped there; upload the file again to resume from the failed rows."
+        return "Some chunks failed and were not imported."
+
+    def committed_note(self, imported: int) -> str:
+        """
+        For an import that stopped on an error: the rows its earlier chunks already committed.
+        """
+        if not self.enabled or not imported:
+            return ""
+        return f"; {imported} rows were imported and committed before the failure"
+
+    def details(self) -> dict:
+        if not self.enabled:
+            return {}
+        return {"rows_skipped_from_checkpoint": self.resume_after + 1}
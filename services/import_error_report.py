@@ -0,0 +1,47 @@
+import csv
+from collections import Counter
+from typing import Optional
+from dto import ImportResult
+
+
+class ImportErrorReport:
+    """
+    Writes import errors to a CSV file (row, email, reason, message) as they happen and keeps
+    only per-reason counts and the first max_samples messages in memory.
+    """
+
+    COLUMNS = ("row", "email", "reason", "message")
+
+    def __init__(self, path: Optional[str] = None, max_samples: int = 50):
+        self.path = path
+        self.max_samples = max_samples
+        self.counts = Counter()
+        self.samples = []
+        self._file = None
+        self._writer = None
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, row: int, reason: str, message: str, email: Optional[str] = None) -> None:
+        self.counts[reason] += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append(f"Row {row}: {message}")
+        if self.path:
+            if self._writer is None:
+                self._file = open(self.path, "w", newline="", encoding="utf-8")
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(self.COLUMNS)
+            self._writer.writerow((row, email or "", reason, message))
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def apply(self, result: ImportResult) -> None:
+        result.errors = list(self.samples)
+        result.error_counts = dict(self.counts)
+        result.error_total = self.total
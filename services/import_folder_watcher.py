@@ -0,0 +1,190 @@
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from constants import EntitlementConflictPolicy
+from services.import_job_manager import ImportJobKind, ImportJobStatus, ImportQueueFullError
+from utils.file_helper import file_sha256
+from utils.import_helper import detect_import_kind
+
+logger = logging.getLogger(__name__)
+
+WATCHED_EXTENSIONS = (".csv", ".xlsx", ".parquet")
+PROCESSED_FOLDER = "processed"
+FAILED_FOLDER = "failed"
+# entitlements and vacations reference users, so a drop is imported in this order
+KIND_ORDER = (ImportJobKind.USERS, ImportJobKind.ENTITLEMENTS, ImportJobKind.VACATIONS)
+
+
+@dataclass
+class _DroppedFile:
+    path: str
+    size: int
+    mtime: float
+    first_seen: float
+    sha256: Optional[str] = None
+    kind: Optional[str] = None
+    job_id: Optional[str] = None
+
+
+class ImportFolderWatcher:
+    """
+    Polls a drop folder and runs every new import file through the ImportJobManager.
+    A file is picked up once its size and mtime have not changed for settle_seconds, its kind
+    is detected from its header rows, and the content hash checkpoint keeps a file from being
+    imported twice. At most max_in_flight jobs run at a time, users files before the rest.
+    Finished files are moved to processed/ or failed/ with their rejected rows as <name>.errors.csv.
+    """
+
+    def __init__(
+        self,
+        job_manager,
+        folder: str,
+        max_in_flight: int = 2,
+        settle_seconds: float = 5.0,
+        entitlement_policy: str = EntitlementConflictPolicy.SKIP,
+        csv_engine: str = "c"
+    ):
+        self.job_manager = job_manager
+        self.folder = os.path.abspath(folder)
+        self.max_in_flight = max_in_flight
+        self.settle_seconds = settle_seconds
+        self.entitlement_policy = entitlement_policy
+        self.csv_engine = csv_engine
+        self._waiting: Dict[str, _DroppedFile] = {}
+        self._in_flight: Dict[str, _DroppedFile] = {}
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def idle(self) -> bool:
+        """True when no job is running and no file is waiting."""
+        return not self._in_flight and not self._waiting
+
+    def poll(self) -> None:
+        self._collect_finished()
+        ready = sorted(self._ready_files(), key=lambda dropped: (KIND_ORDER.index(dropped.kind), dropped.path))
+        for dropped in ready:
+            if len(self._in_flight) >= self.max_in_flight:
+                break
+            if any(KIND_ORDER.index(job.kind) < KIND_ORDER.index(dropped.kind) for job in self._in_flight.values()):
+                break
+            if any(job.sha256 == dropped.sha256 for job in self._in_flight.values()):
+                continue
+            if not self._submit(dropped):
+                break
+
+    def _scan(self) -> List[str]:
+        paths = []
+        for entry in os.scandir(self.folder):
+            name = entry.name
+            if entry.is_file() and not name.startswith((".", "~$")) and name.lower().endswith(WATCHED_EXTENSIONS):
+                paths.append(entry.path)
+        return paths
+
+    def _ready_files(self) -> List[_DroppedFile]:
+        """
+        Classified files whose size and mtime have not changed for settle_seconds.
+        """
+        now = time.monotonic()
+        busy = {job.path for job in self._in_flight.values()}
+        present = set()
+        ready = []
+        for path in self._scan():
+            if path in busy:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            present.add(path)
+            dropped = self._waiting.get(path)
+            if dropped is None or (dropped.size, dropped.mtime) != (stat.st_size, stat.st_mtime):
+                dropped = self._waiting[path] = _DroppedFile(path, stat.st_size, stat.st_mtime, now)
+            if now - dropped.first_seen < self.settle_seconds:
+                continue
+            if dropped.kind is None and not self._classify(dropped):
+                continue
+            ready.append(dropped)
+        for path in set(self._waiting) - present:
+            del self._waiting[path]
+        return ready
+
+    def _classify(self, dropped: _DroppedFile) -> bool:
+        try:
+            kind = detect_import_kind(dropped.path, csv_engine=self.csv_engine)
+        except Exception as e:
+            logger.warning(f"Could not read {dropped.path}: {e}")
+            kind = None
+        if kind is None:
+            logger.warning(f"Could not tell the import kind of {dropped.path} from its header rows")
+            del self._waiting[dropped.path]
+            self._archive(dropped.path, FAILED_FOLDER)
+            self.failed += 1
+            return False
+        dropped.kind = kind
+        dropped.sha256 = file_sha256(dropped.path)
+        return True
+
+    def _submit(self, dropped: _DroppedFile) -> bool:
+        """
+        Returns False when the job queue is full, so the rest waits for the next poll.
+        """
+        options = {"content_hash": dropped.sha256}
+        if dropped.kind == ImportJobKind.ENTITLEMENTS:
+            options["policy"] = self.entitlement_policy
+        try:
+            job = self.job_manager.submit(dropped.kind, dropped.path, **options)
+        except ImportQueueFullError:
+            return False
+
+        del self._waiting[dropped.path]
+        dropped.job_id = job.id
+        logger.info(f"Picked up {os.path.basename(dropped.path)} as {dropped.kind} import, job {job.id}")
+        if job.status in ImportJobStatus.FINISHED:
+            self._finish(dropped, job)
+        else:
+            self._in_flight[job.id] = dropped
+        return True
+
+    def _collect_finished(self) -> None:
+        for job_id, dropped in list(self._in_flight.items()):
+            job = self.job_manager.get(job_id)
+            if job is None or job.status in ImportJobStatus.FINISHED:
+                del self._in_flight[job_id]
+                self._finish(dropped, job)
+
+    def _finish(self, dropped: _DroppedFile, job) -> None:
+        name = os.path.basename(dropped.path)
+        succeeded = job is not None and job.status == ImportJobStatus.SUCCEEDED
+        target = self._archive(dropped.path, PROCESSED_FOLDER if succeeded else FAILED_FOLDER)
+        report = self.job_manager.get_error_report_path(dropped.job_id)
+        if report and target:
+            shutil.copyfile(report, f"{target}.errors.csv")
+
+        if succeeded:
+            self.processed += 1
+            logger.info(f"Imported {name} ({dropped.kind}): {job.result.message}")
+            return
+        self.failed += 1
+        if job is None:
+            reason = "job is no longer tracked"
+        else:
+            reason = job.error or (job.result.message if job.result else "unknown error")
+        logger.error(f"Import of {name} ({dropped.kind}) failed: {reason}")
+
+    def _archive(self, path: str, folder: str) -> Optional[str]:
+        target_dir = os.path.join(self.folder, folder)
+        os.makedirs(target_dir, exist_ok=True)
+        name = os.path.basename(path)
+        target = os.path.join(target_dir, name)
+        if os.path.exists(target):
+            base, ext = os.path.splitext(name)
+            target = os.path.join(target_dir, f"{base}.{time.strftime('%Y%m%d%H%M%S')}{ext}")
+        try:
+            shutil.move(path, target)
+        except FileNotFoundError:
+            return None
+        return target
@@ -0,0 +1,214 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Set
+from sqlalchemy.orm import Session
+from dto import ImportJobDTO, ImportResult
+from models import db
+from models.import_job import ImportJob
+from repositories.import_job_repository import ImportJobRepository
+
+logger = logging.getLogger(__name__)
+
+class ImportJobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    FINISHED = (SUCCEEDED, FAILED)
+
+class ImportJobKind:
+    USERS = "users"
+    VACATIONS = "vacations"
+    ENTITLEMENTS = "entitlements"
+
+class ImportQueueFullError(Exception):
+    pass
+
+def _to_dto(job: ImportJob) -> ImportJobDTO:
+    return ImportJobDTO(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        file_name=job.file_name,
+        rows_processed=job.rows_processed,
+        chunks_processed=job.chunks_processed,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        duration_seconds=job.duration_seconds,
+        result=ImportResult.model_validate(job.result) if job.result else None,
+        error=job.error
+    )
+
+class ImportJobManager:
+    """
+    Runs ImportService calls on a bounded pool of local worker threads, each inside its own
+    app context and DB session. Job state is kept in the import_jobs table, so every worker
+    process can report on any job; the concurrency bound applies per process.
+    """
+
+    def __init__(self, import_service, max_workers: int = 2, max_queued: int = 20, max_history: int = 200):
+        self.import_service = import_service
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_history = max_history
+        self.app = None
+        self.error_report_folder: Optional[str] = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import-job")
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.app = app
+        self.error_report_folder = os.path.join(app.config["UPLOAD_FOLDER"], "import_errors")
+        os.makedirs(self.error_report_folder, exist_ok=True)
+        app.extensions["import_jobs"] = self
+
+    @contextmanager
+    def _jobs(self) -> Iterator[ImportJobRepository]:
+        """
+        Job state is written in a session of its own, apart from the import's transaction.
+        """
+        with Session(db.engine, expire_on_commit=False) as session:
+            yield ImportJobRepository(session)
+            session.commit()
+
+    def _update(self, job_id: str, **values) -> None:
+        with self._jobs() as jobs:
+            jobs.update(job_id, **values)
+
+    def _store(self, job: ImportJob) -> None:
+        with self._jobs() as jobs:
+            jobs.add(job)
+            evicted = jobs.delete_oldest(ImportJobStatus.FINISHED, self.max_history)
+        for path in evicted:
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def submit(self, kind: str, file_path: str, **options) -> ImportJobDTO:
+        if self.app is None:
+            raise RuntimeError("ImportJobManager.init_app must be called before submitting jobs")
+
+        job_id = uuid.uuid4().hex
+        job = ImportJob(
+            id=job_id,
+            kind=kind,
+            status=ImportJobStatus.QUEUED,
+            file_name=os.path.basename(file_path),
+            rows_processed=0,
+            chunks_processed=0,
+            error_report_path=os.path.join(self.error_report_folder, f"{job_id}.csv"),
+            created_at=datetime.now(timezone.utc)
+        )
+        content_hash = options.get("content_hash")
+        completed = None
+        if content_hash:
+            completed = self.import_service.get_completed_import(content_hash, kind, options.get("sheet"))
+        if completed:
+            job.status = ImportJobStatus.SUCCEEDED
+            job.started_at = job.finished_at = job.created_at
+            job.duration_seconds = 0.0
+            job.result = completed.model_dump(mode="json")
+            self._store(job)
+            logger.info(f"Skipped {kind} import of {file_path}: file was already imported")
+            return _to_dto(job)
+
+        with self._lock:
+            if len(self._pending) >= self.max_workers + self.max_queued:
+                raise ImportQueueFullError("Too many imports in progress, try again later")
+            self._pending.add(job_id)
+        try:
+            self._store(job)
+            self._executor.submit(self._run, job_id, kind, file_path, job.error_report_path, options)
+        except Exception:
+            with self._lock:
+                self._pending.discard(job_id)
+            raise
+        logger.info(f"Queued {kind} import job {job_id} for {file_path}")
+        return _to_dto(job)
+
+    def get(self, job_id: str) -> Optional[ImportJobDTO]:
+        with self._jobs() as jobs:
+            job = jobs.get(job_id)
+        return _to_dto(job) if job else None
+
+    def get_error_report_path(self, job_id: str) -> Optional[str]:
+        with self._jobs() as jobs:
+            job = jobs.get(job_id)
+        if not job or job.status not in ImportJobStatus.FINISHED:
+            return None
+        if not job.error_report_path or not os.path.exists(job.error_report_path):
+            return None
+        return job.error_report_path
+
+    def _run(self, job_id: str, kind: str, file_path: str, error_report_path: str, options: dict) -> None:
+        started = time.perf_counter()
+        rows_processed = 0
+        chunks_processed = 0
+
+        def record_chunk(rows: int) -> None:
+            nonlocal rows_processed, chunks_processed
+            rows_processed += rows
+            chunks_processed += 1
+            try:
+                self._update(job_id, rows_processed=rows_processed, chunks_processed=chunks_processed)
+            except Exception as e:
+                logger.warning(f"Could not record progress of import job {job_id}: {e}")
+
+        with self.app.app_context():
+            values = {}
+            try:
+                self._update(job_id, status=ImportJobStatus.RUNNING, started_at=datetime.now(timezone.utc))
+                result = self._dispatch(kind, file_path, error_report_path, record_chunk, options)
+                if result.success:
+                    db.session.commit()
+                else:
+                    db.session.rollback()
+                values["result"] = result.model_dump(mode="json")
+                values["status"] = ImportJobStatus.SUCCEEDED if result.success else ImportJobStatus.FAILED
+            except Exception as e:
+                db.session.rollback()
+                values["error"] = str(e)
+                values["status"] = ImportJobStatus.FAILED
+                logger.error(f"Import job {job_id} failed: {e}", exc_info=True)
+            finally:
+                db.session.remove()
+                duration = round(time.perf_counter() - started, 3)
+                values.update(
+                    rows_processed=rows_processed,
+                    chunks_processed=chunks_processed,
+                    finished_at=datetime.now(timezone.utc),
+                    duration_seconds=duration
+                )
+                try:
+                    self._update(job_id, **values)
+                finally:
+                    with self._lock:
+                        self._pending.discard(job_id)
+        logger.info(f"Import job {job_id} {values['status']} in {duration}s ({rows_processed} rows)")
+
+    def _dispatch(self, kind: str, file_path: str, error_report_path: str, on_chunk, options: dict) -> ImportResult:
+        if kind == ImportJobKind.USERS:
+            method = self.import_service.import_users_from_file
+        elif kind == ImportJobKind.VACATIONS:
+            method = self.import_service.import_vacation_records_from_file
+        elif kind == ImportJobKind.ENTITLEMENTS:
+            method = self.import_service.import_vacation_entitlements_from_file
+        else:
+            raise ValueError(f"Unknown import kind: {kind}")
+        return method(
+            file_path,
+            on_chunk=on_chunk,
+            error_report_path=error_report_path,
+            **options
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
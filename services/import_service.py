@@ -1,21 +1,35 @@
 import logging
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional
 from sqlalchemy.orm import Session
-from dto import (
-    ImportResult,
-    CreateUserRequest,
-    CreateVacationRequest,
-)
+from dto import ImportResult
 from utils.import_helper import (
-    clean_user_import_file,
-    clean_entitlement_file,
-    clean_vacation_records_file
+    iter_user_import_chunks,
+    iter_entitlement_chunks,
+    iter_vacation_records_chunks,
+    SheetRef
 )
 
+from services.vacation_import_context import VacationImportContext
+from services.import_checkpoint_tracker import ImportCheckpointTracker, checkpoint_key
+from services.import_error_report import ImportErrorReport
+from services.user_import_validator import UserImportValidator
+from utils.import_metrics import ImportMetrics
+from constants import EntitlementConflictPolicy, ImportErrorReason
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+ChunkCallback = Callable[[int], None]
+
+def _report_progress(chunks: Iterable, on_chunk: Optional[ChunkCallback]) -> Iterator:
+    """
+    Yields chunks and calls on_chunk(rows) once each chunk has been processed.
+    """
+    for chunk in chunks:
+        yield chunk
+        if on_chunk:
+            on_chunk(len(chunk))
+
 class ImportService:
 
     def __init__(
@@ -25,7 +39,11 @@ class ImportService:
         vacation_service,
         user_repository,
         vacation_record_repository,
-        vacation_entitlement_repository
+        vacation_entitlement_repository,
+        import_checkpoint_repository=None,
+        password_hash_workers: int = 0,
+        trace_memory: bool = False,
+        csv_engine: str = "c"
     ):
         self.session = session
         self.user_service = user_service
@@ -33,171 +51,414 @@ class ImportService:
         self.user_repository = user_repository
         self.vacation_record_repository = vacation_record_repository
         self.vacation_entitlement_repository = vacation_entitlement_repository
-
-    def import_users_from_file(self, file, chunk_size: int = 100) -> ImportResult:
+        self.import_checkpoint_repository = import_checkpoint_repository
+        self.password_hash_workers = password_hash_workers
+        self.trace_memory = trace_memory
+        self.csv_engine = csv_engine
+
+    def _checkpoint(
+        self, file, kind: str, enabled: bool, content_hash: Optional[str], sheet: SheetRef
+    ) -> ImportCheckpointTracker:
+        return ImportCheckpointTracker(
+            self.session, self.import_checkpoint_repository, file, kind,
+            enabled=enabled, content_hash=content_hash, sheet=sheet,
+            csv_engine=self.csv_engine if file.endswith('.csv') else None
+        )
+
+    @staticmethod
+    def _record_metrics(result: ImportResult, metrics: ImportMetrics, kind: str) -> None:
+        result.details["metrics"] = metrics.finish()
+        ImportMetrics.log(logger, kind, result.details["metrics"])
+
+    def get_completed_import(self, content_hash: str, kind: str, sheet: SheetRef = None) -> Optional[ImportResult]:
+        """
+        Returns the already-imported result when a file with this content finished importing.
+        """
+        if self.import_checkpoint_repository is None:
+            return None
+        checkpoint = self.import_checkpoint_repository.get(checkpoint_key(content_hash, sheet), kind)
+        if not checkpoint or not checkpoint.completed:
+            return None
+        return self._already_imported_result(checkpoint.rows_imported)
+
+    @staticmethod
+    def _already_imported_result(rows_imported: int) -> ImportResult:
+        return ImportResult(
+            success=True,
+            message="File was already imported, nothing to do.",
+            imported=0,
+            errors=[],
+            details={"already_imported": True, "rows_imported": rows_imported}
+        )
+
+    def import_users_from_file(
+        self,
+        file,
+        chunk_size: int = 1000,
+        hash_workers: Optional[int] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+        checkpoint: bool = True,
+        content_hash: Optional[str] = None,
+        error_report_path: Optional[str] = None,
+        sheet: SheetRef = None
+    ) -> ImportResult:
         result = ImportResult(success=True, message="", imported=0, errors=[], details={})
+        if hash_workers is None:
+            hash_workers = self.password_hash_workers
+        report = ImportErrorReport(error_report_path)
+        metrics = ImportMetrics(trace_memory=self.trace_memory)
+        total_rows = 0
+        imported = 0
+        tracker = None
+
+        def details() -> dict:
+            return {
+                "total_processed": total_rows,
+                "chunk_size": chunk_size,
+                "hash_workers": hash_workers,
+                **tracker.details()
+            }
+
         try:
-            df = clean_user_import_file(file)
-            total_rows = len(df)
-            imported = 0
-            errors = []
-
-            for start in range(0, total_rows, chunk_size):
-                chunk = df.iloc[start:start + chunk_size]
-
-                for idx, row in chunk.iterrows():
-                    email = row['email']
-                    password = row['password']
-
-                    try:
-                        create_req = CreateUserRequest(email=email, password=password)
-                    except Exception as e:
-                        errors.append(f"Row {idx + 1}: Invalid data - {str(e)}")
-                        continue
-
-                    try:
-                        user_dto = self.user_service.create_user(create_req)
-                        imported += 1
-                        logger.debug(f"Created user: {email} (ID: {user_dto.id})")
-                    except ValueError as ve:
-                        errors.append(f"Row {idx + 1}: {email} - {str(ve)}")
-                    except Exception as e:
-                        errors.append(f"Row {idx + 1}: {email} - Unexpected error: {str(e)}")
+            validator = UserImportValidator()
+            role_id = self.user_service.get_employee_role_id()
+            tracker = self._checkpoint(file, "users", checkpoint, content_hash, sheet)
+            if tracker.completed:
+                return self._already_imported_result(tracker.rows_imported)
+
+            chunks = iter_user_import_chunks(file, chunk_size, metrics=metrics, sheet=sheet, csv_engine=self.csv_engine)
+            for chunk in _report_progress(chunks, on_chunk):
+                total_rows += len(chunk)
+                committed = tracker.committed_rows(chunk)
+                if not committed.empty:
+                    validator.remember(committed)
+                chunk = tracker.pending_rows(chunk)
+                if chunk.empty:
+                    continue
+                with metrics.stage("validate", len(chunk)):
+                    candidates, rejected = validator.validate(chunk)
+                    for row_no, reason, message, email in rejected:
+                        report.add(row_no, reason, message, email)
+
+                    existing = self.user_repository.get_existing_emails(
+                        req.email for _, req in candidates
+                    )
+                    to_create = []
+                    for row_no, req in candidates:
+                        if req.email in existing:
+                            report.add(row_no, ImportErrorReason.EMAIL_IN_USE, f"{req.email} - Email already in use", req.email)
+                        else:
+                            to_create.append((row_no, req))
 
+                tracker.begin_chunk()
                 try:
-                    self.session.flush()
+                    created = self.user_service.create_users_bulk(
+                        [req for _, req in to_create],
+                        role_id=role_id,
+                        hash_workers=hash_workers,
+                        metrics=metrics
+                    )
+                    with metrics.stage("db"):
+                        tracker.commit_chunk(chunk, len(created))
                 except Exception as e:
-                    errors.append(f"DB error in chunk (rows {start+1}-{min(start+chunk_size, total_rows)}): {e}")
+                    tracker.rollback_chunk()
+                    report.add(
+                        chunk.index[0] + 1, ImportErrorReason.CHUNK_FAILED,
+                        f"DB error in chunk (rows {chunk.index[0]+1}-{chunk.index[-1]+1}): {e}"
+                    )
+                    if tracker.halted:
+                        break
                     continue
 
+                for row_no, req in to_create:
+                    if req.email not in created:
+                        report.add(row_no, ImportErrorReason.EMAIL_IN_USE, f"{req.email} - Email already in use", req.email)
+                imported += len(created)
+
+            tracker.complete()
             result.imported = imported
-            result.errors = errors[:50]
-            result.details = {"total_processed": total_rows, "chunk_size": chunk_size}
+            result.details = details()
             result.message = f"Imported {imported} out of {total_rows} users successfully."
+            if tracker.failed:
+                result.success = False
+                result.message = f"Imported {imported} out of {total_rows} users. {tracker.failure_note()}"
 
         except Exception as e:
             self.session.rollback()
             result.success = False
             result.message = f"Import failed: {str(e)}"
+            if tracker is not None:
+                result.imported = imported
+                result.details = details()
+                result.message += tracker.committed_note(imported)
             logger.error(f"User import error: {e}", exc_info=True)
+        finally:
+            report.close()
+            report.apply(result)
+            self._record_metrics(result, metrics, "users")
 
         return result
 
-    def import_vacation_records_from_file(self, file, chunk_size: int = 100) -> ImportResult:
+    def import_vacation_records_from_file(
+        self,
+        file,
+        chunk_size: int = 1000,
+        on_chunk: Optional[ChunkCallback] = None,
+        checkpoint: bool = True,
+        content_hash: Optional[str] = None,
+        error_report_path: Optional[str] = None,
+        sheet: SheetRef = None
+    ) -> ImportResult:
         result = ImportResult(success=True, message="", imported=0, errors=[], details={})
+        report = ImportErrorReport(error_report_path)
+        metrics = ImportMetrics(trace_memory=self.trace_memory)
+        total_rows = 0
+        imported = 0
+        tracker = None
+
+        def details() -> dict:
+            return {"total_processed": total_rows, "chunk_size": chunk_size, **tracker.details()}
+
         try:
-            df = clean_vacation_records_file(file)
-            total_rows = len(df)
-            imported = 0
-            errors = []
-
-            for start in range(0, total_rows, chunk_size):
-                chunk = df.iloc[start:start + chunk_size]
-
-                for idx, row in chunk.iterrows():
-                    email = row['email']
-                    start_date = row['start_date']
-                    end_date = row['end_date']
-                    year = row['year']
-                    days = row['days']
-
-                    user = self.user_repository.get_by_email(email)
-                    if not user:
-                        errors.append(f"Row {idx + 1}: User not found - {email}")
-                        continue
-
-                    if self.vacation_record_repository.has_overlap(user.id, start_date, end_date):
-                        errors.append(f"Row {idx + 1}: Overlap for {email}: {start_date} - {end_date}")
-                        continue
-
-                    available_days = self.vacation_service.get_available_days(user.id, year)
-                    if days > available_days:
-                        errors.append(
-                            f"Row {idx + 1}: Not enough days for {email}. "
-                            f"Needed: {days}, Available: {available_days}"
-                        )
-                        continue
+            tracker = self._checkpoint(file, "vacations", checkpoint, content_hash, sheet)
+            if tracker.completed:
+                return self._already_imported_result(tracker.rows_imported)
+            context = VacationImportContext(
+                self.user_repository,
+                self.vacation_record_repository,
+                self.vacation_entitlement_repository
+            )
+
+            chunks = iter_vacation_records_chunks(
+                file, chunk_size, metrics=metrics, sheet=sheet, csv_engine=self.csv_engine
+            )
+            for chunk in _report_progress(chunks, on_chunk):
+                total_rows += len(chunk)
+                pending = tracker.pending_rows(chunk)
+                invalid = pending[pending['error'].notna()]
+                for row in invalid.itertuples():
+                    report.add(row.Index + 1, row.reason, f"{row.email} - {row.error}", row.email)
+                chunk = pending[pending['error'].isna()]
+                if chunk.empty:
+                    tracker.commit_chunk(pending, 0)
+                    continue
 
-                    try:
-                        req = CreateVacationRequest(
-                            start_date=start_date,
-                            end_date=end_date,
-                            note="Imported from file"
-                        )
-                        self.vacation_service.create_vacation(user.id, req)
-                        imported += 1
-                    except ValueError as ve:
-                        errors.append(f"Row {idx + 1}: {email} - {str(ve)}")
-                    except Exception as e:
-                        errors.append(f"Row {idx + 1}: {email} - DB error: {str(e)}")
+                with metrics.stage("validate", len(chunk)):
+                    context.load(chunk)
+                    accepted = []
+
+                    for row in chunk.itertuples():
+                        row_no = row.Index + 1
+                        email = row.email
+                        start_date = row.start_date.date()
+                        end_date = row.end_date.date()
+                        year = int(row.year)
+                        days = int(row.days)
+
+                        user_id = context.get_user_id(email)
+                        if user_id is None:
+                            report.add(row_no, ImportErrorReason.USER_NOT_FOUND, f"User not found - {email}", email)
+                            continue
+
+                        if context.has_overlap(user_id, start_date, end_date):
+                            report.add(
+                                row_no, ImportErrorReason.OVERLAP,
+                                f"Overlap for {email}: {row.start_date} - {row.end_date}", email
+                            )
+                            continue
+
+                        available_days = context.get_available_days(user_id, year)
+                        if days > available_days:
+                            report.add(
+                                row_no, ImportErrorReason.NOT_ENOUGH_DAYS,
+                                f"Not enough days for {email}. Needed: {days}, Available: {available_days}", email
+                            )
+                            continue
+
+                        context.accept(user_id, start_date, end_date, year, days)
+                        accepted.append((user_id, start_date, end_date, year, days))
 
+                tracker.begin_chunk()
                 try:
-                    self.session.flush()
+                    with metrics.stage("db", len(accepted)):
+                        self.vacation_record_repository.bulk_create([
+                            {
+                                "user_id": user_id,
+                                "start_date": start_date,
+                                "end_date": end_date,
+                                "days_count": days,
+                                "year": year,
+                                "note": "Imported from file"
+                            }
+                            for user_id, start_date, end_date, year, days in accepted
+                        ])
+                        self.session.flush()
+                        tracker.commit_chunk(pending, len(accepted))
+                    imported += len(accepted)
                 except Exception as e:
-                    errors.append(f"Chunk error (rows {start+1}-{min(start+chunk_size, total_rows)}): {e}")
+                    tracker.rollback_chunk()
+                    for record in accepted:
+                        context.release(*record)
+                    report.add(
+                        chunk.index[0] + 1, ImportErrorReason.CHUNK_FAILED,
+                        f"Chunk error (rows {chunk.index[0]+1}-{chunk.index[-1]+1}): {e}"
+                    )
+                    if tracker.halted:
+                        break
                     continue
 
+            tracker.complete()
             result.imported = imported
-            result.errors = errors[:50]
-            result.details = {"total_processed": total_rows, "chunk_size": chunk_size}
+            result.details = details()
             result.message = f"Imported {imported} vacation records."
+            if tracker.failed:
+                result.success = False
+                result.message = f"{result.message} {tracker.failure_note()}"
 
         except Exception as e:
             result.success = False
             result.message = f"Import failed: {str(e)}"
+            if tracker is not None:
+                result.imported = imported
+                result.details = details()
+                result.message += tracker.committed_note(imported)
             logger.error(f"Vacation import error: {e}", exc_info=True)
+        finally:
+            report.close()
+            report.apply(result)
+            self._record_metrics(result, metrics, "vacations")
 
         return result
 
-    def import_vacation_entitlements_from_file(self, file, chunk_size: int = 100) -> ImportResult:
+    def import_vacation_entitlements_from_file(
+        self,
+        file,
+        chunk_size: int = 1000,
+        policy: str = EntitlementConflictPolicy.SKIP,
+        on_chunk: Optional[ChunkCallback] = None,
+        checkpoint: bool = True,
+        content_hash: Optional[str] = None,
+        error_report_path: Optional[str] = None,
+        sheet: SheetRef = None
+    ) -> ImportResult:
         result = ImportResult(success=True, message="", imported=0, errors=[], details={})
-        try:
-            df, year = clean_entitlement_file(file)
-            total_rows = len(df)
-            imported = 0
-            errors = []
-
-            for start in range(0, total_rows, chunk_size):
-                chunk = df.iloc[start:start + chunk_size]
-
-                for idx, row in chunk.iterrows():
-                    email = row['email']
-                    total_days = int(row['total_days'])
-
-                    user = self.user_repository.get_by_email(email)
-                    if not user:
-                        errors.append(f"Row {idx + 3}: User not found - {email}")
-                        continue
-
-                    try:
-                        existing = self.vacation_entitlement_repository.get_by_user_year(user.id, year)
-                        if existing:
-                            errors.append("Vacation days for user {email} already exists for selected year")
-                        else:
-                            entitlement = self.vacation_entitlement_repository.create_vacation_entitlement(
-                                user_id=user.id,
-                                year=year,
-                                total_days=total_days
-                            )
-                            self.session.add(entitlement)
-                            imported += 1
-                    except Exception as e:
-                        errors.append(f"Row {idx + 3}: DB error for {email} - {str(e)}")
+        if policy not in EntitlementConflictPolicy.ALL:
+            result.success = False
+            result.message = f"Import failed: unknown conflict policy '{policy}'"
+            return result
+        report = ImportErrorReport(error_report_path)
+        metrics = ImportMetrics(trace_memory=self.trace_memory)
+        year = None
+        total_rows = 0
+        counts = {"inserted": 0, "skipped": 0, "overwritten": 0, "added": 0, "failed": 0}
+        tracker = None
+
+        def imported() -> int:
+            return counts["inserted"] + counts["overwritten"] + counts["added"]
+
+        def details() -> dict:
+            return {
+                "year": year,
+                "total_processed": total_rows,
+                "chunk_size": chunk_size,
+                "policy": policy,
+                **counts,
+                **tracker.details()
+            }
 
+        try:
+            year, chunks = iter_entitlement_chunks(
+                file, chunk_size, metrics=metrics, sheet=sheet, csv_engine=self.csv_engine
+            )
+            seen_emails = set()
+            tracker = self._checkpoint(file, "entitlements", checkpoint, content_hash, sheet)
+            if tracker.completed:
+                return self._already_imported_result(tracker.rows_imported)
+
+            for chunk in _report_progress(chunks, on_chunk):
+                total_rows += len(chunk)
+                seen_emails.update(tracker.committed_rows(chunk)['email'])
+                chunk = tracker.pending_rows(chunk)
+                if chunk.empty:
+                    continue
+                with metrics.stage("validate", len(chunk)):
+                    user_ids = self.user_repository.get_ids_by_emails(chunk['email'].unique().tolist())
+                    rows = []
+
+                    for row in chunk.itertuples():
+                        row_no = row.Index + 3
+                        email = row.email
+                        user_id = user_ids.get(email)
+                        if user_id is None:
+                            report.add(row_no, ImportErrorReason.USER_NOT_FOUND, f"User not found - {email}", email)
+                            counts["failed"] += 1
+                            continue
+                        if email in seen_emails:
+                            report.add(row_no, ImportErrorReason.DUPLICATE_IN_FILE, f"Duplicate email in file - {email}", email)
+                            counts["failed"] += 1
+                            continue
+                        seen_emails.add(email)
+                        rows.append((row_no, email, user_id, int(row.total_days)))
+
+                    existing = self.vacation_entitlement_repository.get_user_ids_with_entitlement(
+                        (user_id for _, _, user_id, _ in rows), year
+                    )
+                tracker.begin_chunk()
                 try:
-                    self.session.flush()
+                    with metrics.stage("db", len(rows)):
+                        self.vacation_entitlement_repository.upsert_many(
+                            [
+                                {"user_id": user_id, "year": year, "total_days": total_days}
+                                for _, _, user_id, total_days in rows
+                            ],
+                            policy=policy
+                        )
+                        self.session.flush()
+                        tracker.commit_chunk(chunk, len(rows))
                 except Exception as e:
-                    errors.append(f"Chunk error (rows {start+3}-{min(start+chunk_size+2, total_rows+2)}): {e}")
+                    tracker.rollback_chunk()
+                    counts["failed"] += len(rows)
+                    report.add(
+                        chunk.index[0] + 3, ImportErrorReason.CHUNK_FAILED,
+                        f"Chunk error (rows {chunk.index[0]+3}-{chunk.index[-1]+3}): {e}"
+                    )
+                    if tracker.halted:
+                        break
                     continue
 
-            result.imported = imported
-            result.errors = errors[:50]
-            result.details = {"year": year, "total_processed": total_rows}
-            result.message = f"Imported {imported} entitlements for year {year}."
+                for row_no, email, user_id, _ in rows:
+                    if user_id not in existing:
+                        counts["inserted"] += 1
+                    elif policy == EntitlementConflictPolicy.SKIP:
+                        counts["skipped"] += 1
+                        report.add(
+                            row_no, ImportErrorReason.ENTITLEMENT_EXISTS,
+                            f"Vacation days for user {email} already exists for selected year", email
+                        )
+                    elif policy == EntitlementConflictPolicy.OVERWRITE:
+                        counts["overwritten"] += 1
+                    else:
+                        counts["added"] += 1
+
+            tracker.complete()
+            result.imported = imported()
+            result.details = details()
+            result.message = f"Imported {result.imported} entitlements for year {year}."
+            if tracker.failed:
+                result.success = False
+                result.message = f"{result.message} {tracker.failure_note()}"
 
         except Exception as e:
             result.success = False
             result.message = f"Import failed: {str(e)}"
+            if tracker is not None:
+                result.imported = imported()
+                result.details = details()
+                result.message += tracker.committed_note(result.imported)
             logger.error(f"Entitlement import error: {e}", exc_info=True)
+        finally:
+            report.close()
+            report.apply(result)
+            self._record_metrics(result, metrics, "entitlements")
 
-        return result
\ No newline at end of file
+        return result
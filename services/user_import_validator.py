@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional, Set, Tuple
+import pandas as pd
+from annotated_types import MinLen
+from email_validator import EmailNotValidError, validate_email
+from pydantic import TypeAdapter, ValidationError
+from constants import ImportErrorReason
+from dto import CreateUserRequest
+
+# A loose shape check: anything it rejects, email-validator rejects too (no spaces, exactly one @,
+# no leading, trailing or doubled dots in the local part, a dot in the domain). EmailStr stays
+# the final word on the rows that pass.
+EMAIL_SHAPE = r"(?!\.)(?!.*\.\.)[^@\s]{1,64}(?<!\.)@[^@\s.]+(?:\.[^@\s.]+)+"
+EMAIL_MAX_LENGTH = 254
+# For plain ASCII dot-atom addresses that passed EMAIL_SHAPE, email-validator's verdict and
+# normalization only depend on the domain, so it is checked once per distinct domain.
+ASCII_DOT_ATOM = r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*@[A-Za-z0-9.-]+"
+
+_USERS_ADAPTER = TypeAdapter(List[CreateUserRequest])
+
+
+def _min_length(model, field: str) -> int:
+    for constraint in model.model_fields[field].metadata:
+        if isinstance(constraint, MinLen):
+            return constraint.min_length
+    return 0
+
+
+PASSWORD_MIN_LENGTH = _min_length(CreateUserRequest, "password")
+
+Rejection = Tuple[int, str, str, str]
+
+
+class UserImportValidator:
+    """
+    Validates cleaned user chunks column-wise: email shape, password length and duplicates
+    within the file become a reject mask with reason codes in one pass. The rows that survive
+    are turned into CreateUserRequest objects: plain ASCII addresses on a known-good domain
+    directly, the rest with one TypeAdapter call per chunk.
+    """
+
+    def __init__(self):
+        self.seen_emails: Set[str] = set()
+        self._domains: Dict[str, Optional[str]] = {}
+
+    def validate(
+        self, chunk: pd.DataFrame, row_offset: int = 1
+    ) -> Tuple[List[Tuple[int, CreateUserRequest]], List[Rejection]]:
+        """
+        chunk: cleaned rows with 'email' and 'password', indexed by data row.
+        Returns ([(row_no, request)], [(row_no, reason, message, email)]) sorted by row.
+        """
+        emails = chunk['email']
+        reason = self._reasons(chunk)
+        failed = reason.notna()
+        rejected = [
+            (int(row) + row_offset, row_reason, self._message(row_reason, email), email)
+            for row, row_reason, email in zip(chunk.index[failed], reason[failed], emails[failed])
+        ]
+
+        survivors = chunk[~failed]
+        self.seen_emails.update(survivors['email'])
+        accepted, invalid = self._build_requests(survivors)
+        for position, message in invalid:
+            row_no = int(survivors.index[position]) + row_offset
+            email = survivors['email'].iloc[position]
+            rejected.append((row_no, ImportErrorReason.INVALID_DATA, f"Invalid data - {message}", email))
+        rejected.sort(key=lambda rejection: rejection[0])
+        return [(int(survivors.index[position]) + row_offset, request) for position, request in accepted], rejected
+
+    def remember(self, chunk: pd.DataFrame) -> None:
+        """
+        Takes in rows an earlier run imported before its checkpoint, so that when an import
+        resumes, their duplicates further down are still reported as duplicates in the file.
+        """
+        self.seen_emails.update(chunk['email'][self._reasons(chunk).isna()])
+
+    def _reasons(self, chunk: pd.DataFrame) -> pd.Series:
+        emails = chunk['email']
+        reason = pd.Series(None, index=chunk.index, dtype=object)
+
+        bad_email = ~emails.str.fullmatch(EMAIL_SHAPE, na=False) | (emails.str.len() > EMAIL_MAX_LENGTH)
+        reason[bad_email] = ImportErrorReason.INVALID_EMAIL
+        short_password = reason.isna() & (chunk['password'].str.len() < PASSWORD_MIN_LENGTH)
+        reason[short_password] = ImportErrorReason.PASSWORD_TOO_SHORT
+        duplicate = reason.isna() & (emails.duplicated() | emails.isin(self.seen_emails))
+        reason[duplicate] = ImportErrorReason.DUPLICATE_IN_FILE
+        return reason
+
+    @staticmethod
+    def _message(reason: str, email: str) -> str:
+        if reason == ImportErrorReason.INVALID_EMAIL:
+            return f"{email} - Invalid email address"
+        if reason == ImportErrorReason.PASSWORD_TOO_SHORT:
+            return f"{email} - Password must have at least {PASSWORD_MIN_LENGTH} characters"
+        return f"{email} - Duplicate email in file"
+
+    def _normalized_domain(self, domain: str) -> Optional[str]:
+        if domain not in self._domains:
+            try:
+                self._domains[domain] = validate_email(f"postmaster@{domain}", check_deliverability=False).domain
+            except EmailNotValidError:
+                self._domains[domain] = None
+        return self._domains[domain]
+
+    def _build_requests(self, rows: pd.DataFrame) -> Tuple[List[Tuple[int, CreateUserRequest]], List[Tuple[int, str]]]:
+        """
+        Returns ([(position, request)], [(position, message)]) for the rows' positions.
+        Rows off the fast path are validated with one TypeAdapter call; if some fail, the
+        failures are reported per position and the rest is validated again.
+        """
+        accepted = []
+        slow = []
+        fast = rows['email'].str.fullmatch(ASCII_DOT_ATOM, na=False)
+        for position, (email, password, is_fast) in enumerate(zip(rows['email'], rows['password'], fast)):
+            if is_fast:
+                local, domain = email.rsplit("@", 1)
+                normalized = self._normalized_domain(domain)
+                if normalized is not None:
+                    request = CreateUserRequest.model_construct(email=f"{local}@{normalized}", password=password)
+                    accepted.append((position, request))
+                    continue
+            slow.append(position)
+        if not slow:
+            return accepted, []
+
+        def records(positions: List[int]) -> List[dict]:
+            emails, passwords = rows['email'], rows['password']
+            return [{"email": emails.iloc[position], "password": passwords.iloc[position]} for position in positions]
+
+        failed = {}
+        try:
+            requests = _USERS_ADAPTER.validate_python(records(slow))
+        except ValidationError as e:
+            for error in e.errors(include_url=False):
+                failed.setdefault(slow[error["loc"][0]], f"{error['loc'][-1]}: {error['msg']}")
+            slow = [position for position in slow if position not in failed]
+            requests = _USERS_ADAPTER.validate_python(records(slow))
+        accepted.extend(zip(slow, requests))
+        accepted.sort(key=lambda item: item[0])
+        return accepted, sorted(failed.items())
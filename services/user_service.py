@@ -1,11 +1,14 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from sqlalchemy.orm import Session
 from models.user import User
 from models.role import Role
 from repositories.user_repository import UserRepository
 from repositories.role_repository import RoleRepository
 from dto import CreateUserRequest, UpdateUserRequest, UserResponse
-from utils.password import hash_password
+from utils.password import hash_password, hash_passwords
+from utils.credential_cache import credential_cache
+from utils.auth_token import token_versions
+from utils.import_metrics import ImportMetrics, measure
 from datetime import datetime, timezone
 from constants import RoleNames
 import logging
@@ -27,6 +30,18 @@ class UserService:
             logger.info(f"Created default '{RoleNames.EMPLOYEE}' role")
         return role
 
+    def authenticate(self, email: str, password: str) -> Optional[User]:
+        user = self.user_repo.get_by_email(email)
+        if not user or user.deleted_at:
+            return None
+        if not user.check_password(password):
+            return None
+        return user
+
+    def _revoke_tokens(self, user: User) -> None:
+        user.token_version = (user.token_version or 0) + 1
+        credential_cache.invalidate_user(user.id)
+
     def create_user(self, data: CreateUserRequest) -> UserResponse:
         if self.user_repo.get_by_email(data.email):
             raise ValueError("Email already in use")
@@ -46,6 +61,44 @@ class UserService:
         logger.info(f"Created user: {user.email} (ID: {user.id})")
         return UserResponse.from_orm(user)
 
+    def get_employee_role_id(self) -> int:
+        return self._ensure_employee_role().id
+
+    def create_users_bulk(
+        self,
+        users: List[CreateUserRequest],
+        role_id: Optional[int] = None,
+        hash_workers: int = 0,
+        metrics: Optional[ImportMetrics] = None
+    ) -> Dict[str, int]:
+        """
+        Inserts many users with one statement. Emails that already exist are skipped.
+        Returns {email: id} for the users that were created.
+        """
+        if not users:
+            return {}
+
+        if role_id is None:
+            role_id = self.get_employee_role_id()
+        now = datetime.now(timezone.utc)
+        with measure(metrics, "hash", len(users)):
+            password_hashes = hash_passwords([data.password for data in users], workers=hash_workers)
+        rows = [
+            {
+                "email": data.email,
+                "password": password_hash,
+                "full_name": data.full_name,
+                "role_id": role_id,
+                "token_version": 0,
+                "created_at": now,
+            }
+            for data, password_hash in zip(users, password_hashes)
+        ]
+        with measure(metrics, "db", len(rows)):
+            created = self.user_repo.bulk_insert_ignore_existing(rows)
+        logger.info(f"Bulk created {len(created)} of {len(users)} users")
+        return created
+
     def get_user(self, user_id: int) -> Optional[UserResponse]:
         user = self.user_repo.get_by_id(user_id)
         if not user or user.deleted_at:
@@ -74,15 +127,18 @@ class UserService:
             if self.user_repo.get_by_email(data.email):
                 raise ValueError("Email already in use")
             user.email = data.email
+            self._revoke_tokens(user)
 
         if data.full_name:
             user.full_name = data.full_name
 
         if data.password:
             user.password_hash = hash_password(data.password)
+            self._revoke_tokens(user)
 
         user.updated_at = datetime.now(timezone.utc)
         self.session.flush()
+        token_versions.invalidate(user.id)
 
         logger.info(f"Updated user: {user.id}")
         return UserResponse.from_orm(user)
@@ -93,5 +149,7 @@ class UserService:
             raise ValueError("User not found")
 
         self.user_repo.soft_delete(user)
+        self._revoke_tokens(user)
         self.session.flush()
+        token_versions.invalidate(user.id)
         logger.info(f"Soft deleted user: {user.id}")
\ No newline at end of file
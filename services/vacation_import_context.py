@@ -0,0 +1,81 @@
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+import pandas as pd
+
+
+class VacationImportContext:
+    """
+    Everything needed to validate a vacation import in memory: email -> user_id,
+    entitlement and used days per (user, year), and existing intervals per user.
+    Filled chunk by chunk with a few bulk queries for what the chunk references and
+    was not loaded yet. Accepted rows are added back, so overlaps and balances within
+    the same file are caught too.
+    """
+
+    def __init__(self, user_repository, vacation_record_repository, vacation_entitlement_repository):
+        self.user_repository = user_repository
+        self.vacation_record_repository = vacation_record_repository
+        self.vacation_entitlement_repository = vacation_entitlement_repository
+
+        self.user_ids: Dict[str, int] = {}
+        self.total_days: Dict[Tuple[int, int], int] = {}
+        self.used_days: Dict[Tuple[int, int], int] = {}
+        self.intervals: Dict[int, List[Tuple[date, date]]] = {}
+        self._resolved_emails: Set[str] = set()
+        self._loaded_users: Set[int] = set()
+        self._loaded_balances: Set[Tuple[int, int]] = set()
+
+    def load(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+
+        emails = set(df['email'].unique()) - self._resolved_emails
+        if emails:
+            self.user_ids.update(self.user_repository.get_ids_by_emails(emails))
+            self._resolved_emails |= emails
+
+        user_ids = df['email'].map(self.user_ids)
+        known = df.assign(user_id=user_ids).dropna(subset=['user_id'])
+        if known.empty:
+            return
+
+        new_users = {int(u) for u in known['user_id'].unique()} - self._loaded_users
+        if new_users:
+            for user_id, intervals in self.vacation_record_repository.get_intervals_by_user(new_users).items():
+                self.intervals.setdefault(user_id, []).extend(intervals)
+            self._loaded_users |= new_users
+
+        pairs = {
+            (int(u), int(y))
+            for u, y in known[['user_id', 'year']].drop_duplicates().itertuples(index=False)
+        } - self._loaded_balances
+        if pairs:
+            users = {u for u, _ in pairs}
+            years = {y for _, y in pairs}
+            totals = self.vacation_entitlement_repository.get_total_days_by_user_year(users, years)
+            used = self.vacation_record_repository.get_used_days_by_user_year(users, years)
+            for pair in pairs:
+                self.total_days[pair] = totals.get(pair, 0)
+                self.used_days[pair] = used.get(pair, 0)
+            self._loaded_balances |= pairs
+
+    def get_user_id(self, email: str) -> Optional[int]:
+        return self.user_ids.get(email)
+
+    def has_overlap(self, user_id: int, start_date: date, end_date: date) -> bool:
+        return any(
+            existing_start <= end_date and existing_end >= start_date
+            for existing_start, existing_end in self.intervals.get(user_id, ())
+        )
+
+    def get_available_days(self, user_id: int, year: int) -> int:
+        total = self.total_days.get((user_id, year), 0)
+        return max(0, total - self.used_days.get((user_id, year), 0))
+
+    def accept(self, user_id: int, start_date: date, end_date: date, year: int, days: int) -> None:
+        self.intervals.setdefault(user_id, []).append((start_date, end_date))
+        self.used_days[(user_id, year)] = self.used_days.get((user_id, year), 0) + days
+
+    def release(self, user_id: int, start_date: date, end_date: date, year: int, days: int) -> None:
+        self.intervals[user_id].remove((start_date, end_date))
+        self.used_days[(user_id, year)] -= days
@@ -9,9 +9,17 @@ from dto import (
 )
 import logging
 from sqlalchemy.exc import IntegrityError
+from constants import VacationBookingReason
+from models.vacation_record import OVERLAP_CONSTRAINT
+from utils.pagination import decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
+class VacationBookingError(ValueError):
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
 class VacationService:
     def __init__(self, record_repo, entitlement_repo):
         self.record_repo = record_repo
@@ -39,25 +47,26 @@ class VacationService:
         user_id: int,
         from_date: date,
         to_date: date,
-        page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        cursor: str | None = None,
+        include_total: bool = False
     ) -> VacationListResponse:
-        records = self.record_repo.get_by_date_range(
+        records, has_next, total = self.record_repo.get_page_by_date_range(
             user_id=user_id,
             from_date=from_date,
             to_date=to_date,
-            page=page,
-            per_page=per_page
+            limit=per_page,
+            after=decode_cursor(cursor) if cursor else None,
+            with_total=include_total
         )
-        total = self.record_repo.count_by_date_range(user_id, from_date, to_date)
         data = [VacationRecordDTO.model_validate(r) for r in records]
         return VacationListResponse(
             data=data,
             total=total,
-            page=page,
             per_page=per_page,
-            has_next=(page * per_page) < total,
-            has_prev=page > 1
+            has_next=has_next,
+            has_prev=cursor is not None,
+            next_cursor=encode_cursor(records[-1].start_date, records[-1].id) if has_next else None
         )
 
     def has_overlap_in_period(
@@ -76,33 +85,35 @@ class VacationService:
         data: CreateVacationRequest
     ) -> VacationRecordDTO:
 
-        if self.record_repo.has_overlap(user_id, data.start_date, data.end_date):
-            raise ValueError("There is already vacation in this time period")
-
         year = data.start_date.year
-        summary = self.get_vacation_summary(user_id, year)
         days_needed = (data.end_date - data.start_date).days + 1
-
-        if summary.available_days < days_needed:
-            raise ValueError(
-                f"You dont have enought days left: {days_needed}, "
-                f"available: {summary.available_days}"
-            )
+        total_days = self.entitlement_repo.lock_total_days(user_id, year)
 
         try:
-            record = self.record_repo.create_record(
+            booking = self.record_repo.book(
                 user_id=user_id,
                 start_date=data.start_date,
                 end_date=data.end_date,
-                note=data.note or ""
+                note=data.note or "",
+                total_days=total_days
             )
-            self.record_repo.session.flush()
-            logger.info(f"vacation is created for user {user_id}: {data.start_date} - {data.end_date}")
-            return VacationRecordDTO.model_validate(record)
         except IntegrityError as e:
             self.record_repo.session.rollback()
+            if OVERLAP_CONSTRAINT in str(e.orig):
+                raise VacationBookingError(VacationBookingReason.OVERLAP, "There is already vacation in this time period")
             logger.error(f"error while creating vacation : {e}")
             raise ValueError("error while creating vacation")
+
+        if booking.reason == VacationBookingReason.OVERLAP:
+            raise VacationBookingError(booking.reason, "There is already vacation in this time period")
+        if booking.reason == VacationBookingReason.NOT_ENOUGH_DAYS:
+            raise VacationBookingError(
+                booking.reason,
+                f"You dont have enought days left: {days_needed}, "
+                f"available: {max(0, total_days - booking.used_days)}"
+            )
+        logger.info(f"vacation is created for user {user_id}: {data.start_date} - {data.end_date}")
+        return VacationRecordDTO.model_validate(booking.record)
         
     def get_available_days(self, user_id: int, year: int) -> int:
             try:
@@ -1,6 +1,7 @@
 import pytest
 import os
 import shutil
+import uuid
 from models import db
 from app import create_app
 from config.test import TestConfig
@@ -8,8 +9,10 @@ from models.user import User
 from models.role import Role
 from models.vacation_entitlement import VacationEntitlement
 from models.vacation_record import VacationRecord
+from models.import_checkpoint import ImportCheckpoint
 from utils.password import hash_password
 import base64
+import hashlib
 
 
 @pytest.fixture(scope='function')
@@ -146,6 +149,40 @@ def vacation_record(db_session, employee_user):
     return record
 
 
+@pytest.fixture
+def user_with_entitlement(db_session, employee_role):
+    """
+    Returns a factory that creates an employee with a unique email and, when days is given,
+    an entitlement of that many days for year.
+    """
+    def create(days=None, year=2025, prefix="user"):
+        user = User(
+            email=f"{prefix}_{uuid.uuid4().hex[:8]}@rbt.rs",
+            password="not-used",
+            role_id=employee_role.id
+        )
+        db_session.add(user)
+        db_session.flush()
+        if days is not None:
+            db_session.add(VacationEntitlement(user_id=user.id, year=year, total_days=days))
+        db_session.commit()
+        return user
+    return create
+
+
+@pytest.fixture
+def forget_import(db_session):
+    """
+    Forgets earlier imports of the given file contents, for tests that upload
+    the same contents on every run. Checkpoints of other files are kept.
+    """
+    def forget(content: str):
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        db_session.query(ImportCheckpoint).filter_by(content_hash=content_hash).delete()
+        db_session.commit()
+    return forget
+
+
 def create_auth_header(email, password):
     credentials = f"{email}:{password}"
     encoded = base64.b64encode(credentials.encode()).decode()
@@ -0,0 +1,105 @@
+import json
+from tests.conftest import create_auth_header
+
+
+class TestAuthRoutes:
+
+    def bearer_header(self, token: str):
+        return {"Authorization": f"Bearer {token}"}
+
+    def login(self, client, headers):
+        return client.post('/auth/login', headers=headers)
+
+    # POST /auth/login - success
+    def test_login_success(self, client, admin_auth_headers):
+        response = self.login(client, admin_auth_headers)
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['data']['token_type'] == 'Bearer'
+        assert data['data']['access_token']
+
+    # POST /auth/login - fail
+    def test_login_wrong_password(self, client, admin_user):
+        response = self.login(client, create_auth_header("admin@test.com", "wrong-password"))
+
+        assert response.status_code == 401
+        data = json.loads(response.data)
+        assert data['success'] is False
+
+    # Bearer token - success
+    def test_bearer_token_grants_access(self, client, admin_auth_headers):
+        token = json.loads(self.login(client, admin_auth_headers).data)['data']['access_token']
+
+        response = client.get('/users', headers=self.bearer_header(token))
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['success'] is True
+
+    # Bearer token - fail
+    def test_bearer_token_invalid(self, client):
+        response = client.get('/users', headers=self.bearer_header("not-a-valid-token"))
+
+        assert response.status_code == 401
+        data = json.loads(response.data)
+        assert data['success'] is False
+
+    # Bearer token - revoked after password change
+    def test_bearer_token_revoked_after_password_change(self, client, db_session, employee_role):
+        from models.user import User
+        from utils.password import hash_password
+
+        user = db_session.query(User).filter_by(email="token@test.com").first()
+        if not user:
+            user = User(
+                email="token@test.com",
+                password=hash_password("token123"),
+                full_name="Token User",
+                role_id=employee_role.id
+            )
+            db_session.add(user)
+        user.password = hash_password("token123")
+        db_session.commit()
+
+        token = json.loads(
+            self.login(client, create_auth_header("token@test.com", "token123")).data
+        )['data']['access_token']
+        assert client.get(f'/users/{user.id}', headers=self.bearer_header(token)).status_code == 200
+
+        response = client.patch(
+            f'/users/{user.id}',
+            data=json.dumps({"password": "token456"}),
+            content_type='application/json',
+            headers=self.bearer_header(token)
+        )
+        assert response.status_code == 200
+
+        response = client.get(f'/users/{user.id}', headers=self.bearer_header(token))
+        assert response.status_code == 401
+
+    # Basic auth - an admin endpoint looks the caller up once, role included
+    def test_admin_endpoint_resolves_the_caller_once(self, app, client, db_session, admin_auth_headers):
+        from sqlalchemy import event
+        from models import db
+        from utils.credential_cache import credential_cache
+
+        statements = []
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        # nothing cached, so the caller has to be loaded from the database
+        credential_cache.clear()
+        db_session.expunge_all()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.get('/import/jobs/missing', headers=admin_auth_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert response.status_code == 404
+        auth_queries = [s for s in statements if "users" in s or "roles" in s]
+        assert len(auth_queries) == 1
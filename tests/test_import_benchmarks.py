@@ -0,0 +1,40 @@
+import pytest
+from benchmarks.generators import (
+    benchmark_emails,
+    generate_users_file,
+    generate_entitlements_file,
+    generate_vacations_file,
+)
+from benchmarks.runner import BenchmarkResult, compare_with_baseline
+from utils.import_helper import clean_user_import_file, clean_entitlement_file, clean_vacation_records_file
+
+
+class TestImportBenchmarks:
+
+    @pytest.mark.parametrize('file_format', ['csv', 'xlsx'])
+    def test_generated_files_clean_without_errors(self, tmp_path, file_format):
+        emails = benchmark_emails(40, 'bench.example.com')
+
+        users = clean_user_import_file(generate_users_file(str(tmp_path / f'users.{file_format}'), emails))
+        entitlements, year = clean_entitlement_file(
+            generate_entitlements_file(str(tmp_path / f'entitlements.{file_format}'), emails, 2019)
+        )
+        vacations = clean_vacation_records_file(
+            generate_vacations_file(str(tmp_path / f'vacations.{file_format}'), emails, 120, 2019)
+        )
+
+        assert len(users) == 40
+        assert year == 2019 and len(entitlements) == 40
+        assert len(vacations) == 120
+        assert (vacations['year'] == 2019).all()
+        assert (vacations['days'] >= 1).all()
+
+    def test_compare_with_baseline_flags_slowdown(self):
+        result = BenchmarkResult(
+            kind='users', file_format='csv', rows=1000, dialect='postgresql', seconds=2.0,
+            rows_per_second=500.0, imported=1000, errors=0, sql_statements=3, max_rss_mb=None
+        )
+        baseline = {'users.csv.1000': {'dialect': 'postgresql', 'rows_per_second': 1000.0, 'sql_statements': 3}}
+
+        assert len(compare_with_baseline([result], baseline, tolerance=0.2)) == 1
+        assert compare_with_baseline([result], baseline, tolerance=0.6) == []
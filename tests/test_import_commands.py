@@ -0,0 +1,375 @@
+import uuid
+import pytest
+from models.user import User
+from models.vacation_entitlement import VacationEntitlement
+from models.vacation_record import VacationRecord
+
+
+class TestImportCommands:
+
+    def write_file(self, tmp_path, name: str, content: str) -> str:
+        path = tmp_path / name
+        path.write_text(content, encoding='utf-8')
+        return str(path)
+
+    def test_import_users_dry_run_writes_nothing(self, app, db_session, tmp_path, employee_role):
+        email = f"cli_{uuid.uuid4().hex[:8]}@rbt.rs"
+        path = self.write_file(
+            tmp_path, 'users.csv',
+            f"Vacation year,2019\nEmployee Email,Employee Password\n{email},Abc!@#$\n{email},Abc!@#$\n"
+        )
+
+        result = app.test_cli_runner().invoke(args=['import-users', path, '--dry-run', '--quiet'])
+
+        assert result.exit_code == 0, result.output
+        assert '[dry run] Imported 1 out of 2 users' in result.output
+        assert 'duplicate_in_file=1' in result.output
+        assert db_session.query(User).filter_by(email=email).first() is None
+
+        result = app.test_cli_runner().invoke(args=['import-users', path, '--chunk-size', '1', '--workers', '0'])
+
+        assert result.exit_code == 0, result.output
+        assert 'users: 2 rows read, 2 chunks' in result.output
+        assert db_session.query(User).filter_by(email=email).first() is not None
+
+    def test_import_users_hashes_passwords_on_worker_processes(self, app, db_session, tmp_path, employee_role, caplog):
+        from utils.password import shutdown_hash_pool, verify_password
+        prefix = uuid.uuid4().hex[:8]
+        users = {f"pool_{prefix}_{i}@rbt.rs": f"Secret{i}!" for i in range(3)}
+        path = self.write_file(
+            tmp_path, 'users.csv',
+            "Vacation year,2019\nEmployee Email,Employee Password\n"
+            + "".join(f"{email},{password}\n" for email, password in users.items())
+        )
+
+        try:
+            result = app.test_cli_runner().invoke(args=['import-users', path, '--workers', '2', '--quiet'])
+        finally:
+            shutdown_hash_pool()
+
+        assert result.exit_code == 0, result.output
+        assert "hashing in-process" not in caplog.text
+        stored = {u.email: u.password for u in db_session.query(User).filter(User.email.in_(users))}
+        assert set(stored) == set(users)
+        for email, password in users.items():
+            assert verify_password(password, stored[email])
+            assert not verify_password(password + "x", stored[email])
+
+    def test_failed_chunk_keeps_checkpoint_for_retry(self, app, db_session, tmp_path, employee_role, monkeypatch):
+        from services.user_service import UserService
+        prefix = uuid.uuid4().hex[:8]
+        emails = [f"retry_{prefix}_{i}@rbt.rs" for i in range(4)]
+        path = self.write_file(
+            tmp_path, 'users.csv',
+            "Vacation year,2019\nEmployee Email,Employee Password\n" + "".join(f"{e},Abc!@#$\n" for e in emails)
+        )
+        create_users_bulk = UserService.create_users_bulk
+        calls = []
+
+        def fail_first_chunk(self, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("connection lost")
+            return create_users_bulk(self, *args, **kwargs)
+
+        monkeypatch.setattr(UserService, 'create_users_bulk', fail_first_chunk)
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(args=['import-users', path, '--chunk-size', '2', '--workers', '0', '--quiet'])
+        assert result.exit_code == 1
+        assert 'chunk_failed=1' in result.output
+        assert db_session.query(User).filter(User.email.in_(emails)).count() == 0
+
+        result = runner.invoke(args=['import-users', path, '--chunk-size', '2', '--workers', '0', '--quiet'])
+        assert result.exit_code == 0, result.output
+        assert 'Imported 4 out of 4 users' in result.output
+        assert db_session.query(User).filter(User.email.in_(emails)).count() == 4
+
+    def test_resumed_import_still_reports_duplicates_in_file(self, app, tmp_path, employee_role, monkeypatch):
+        from services.user_service import UserService
+        prefix = uuid.uuid4().hex[:8]
+        path = self.write_file(
+            tmp_path, 'users.csv',
+            "Vacation year,2019\nEmployee Email,Employee Password\n"
+            f"a_{prefix}@rbt.rs,Abc!@#$\nb_{prefix}@rbt.rs,Abc!@#$\na_{prefix}@rbt.rs,Abc!@#$\n"
+        )
+        create_users_bulk = UserService.create_users_bulk
+        calls = []
+
+        def fail_second_chunk(self, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return create_users_bulk(self, *args, **kwargs)
+
+        monkeypatch.setattr(UserService, 'create_users_bulk', fail_second_chunk)
+        args = ['import-users', path, '--chunk-size', '1', '--workers', '0', '--quiet']
+        assert app.test_cli_runner().invoke(args=args).exit_code == 1
+
+        result = app.test_cli_runner().invoke(args=args)
+
+        assert result.exit_code == 0, result.output
+        assert 'Imported 1 out of 3 users' in result.output
+        assert '1 rows rejected (duplicate_in_file=1)' in result.output
+
+    def test_failure_on_a_later_chunk_reports_committed_rows(self, app, db_session, tmp_path, user_with_entitlement):
+        from models.import_checkpoint import ImportCheckpoint
+        from services.import_service import ImportService
+        from utils.file_helper import file_sha256
+        users = [user_with_entitlement(prefix="late") for _ in range(3)]
+        path = self.write_file(
+            tmp_path, 'entitlements.csv',
+            "Vacation year,2041\nEmployee,Total vacation days\n"
+            f"{users[0].email},20\n{users[1].email},21\n{users[2].email},many\n"
+        )
+
+        result = app.extensions["injector"].get(ImportService).import_vacation_entitlements_from_file(
+            path, chunk_size=2
+        )
+
+        assert result.success is False
+        assert result.message == (
+            "Import failed: Invalid file format: Some total_days values are not numeric; "
+            "2 rows were imported and committed before the failure"
+        )
+        assert result.imported == 2
+        assert result.details['inserted'] == 2
+        assert result.details['total_processed'] == 2
+        db_session.rollback()
+        user_ids = [user.id for user in users]
+        assert db_session.query(VacationEntitlement).filter(
+            VacationEntitlement.user_id.in_(user_ids), VacationEntitlement.year == 2041
+        ).count() == 2
+        checkpoint = db_session.query(ImportCheckpoint).filter_by(
+            content_hash=file_sha256(path), kind='entitlements'
+        ).one()
+        assert (checkpoint.last_row, checkpoint.rows_imported, checkpoint.completed) == (1, 2, False)
+
+    def test_resume_needs_the_same_csv_engine(self, app, db_session, tmp_path, user_with_entitlement, monkeypatch):
+        from services.import_service import ImportService
+        users = [user_with_entitlement(prefix="engine") for _ in range(2)]
+        path = self.write_file(
+            tmp_path, 'entitlements.csv',
+            f"Vacation year,2042\nEmployee,Total vacation days\n{users[0].email},20\n{users[1].email},many\n"
+        )
+        import_service = app.extensions["injector"].get(ImportService)
+        assert import_service.import_vacation_entitlements_from_file(path, chunk_size=1).imported == 1
+
+        monkeypatch.setattr(import_service, 'csv_engine', 'pyarrow')
+        result = import_service.import_vacation_entitlements_from_file(path, chunk_size=1)
+
+        assert result.success is False
+        assert 'partly imported with the c CSV engine; resume it with IMPORT_CSV_ENGINE=c' in result.message
+        db_session.rollback()
+
+    def test_dry_run_continues_after_db_error(self, app, db_session, tmp_path, employee_role, monkeypatch):
+        from sqlalchemy import text
+        from services.user_service import UserService
+        prefix = uuid.uuid4().hex[:8]
+        path = self.write_file(
+            tmp_path, 'users.csv',
+            "Vacation year,2019\nEmployee Email,Employee Password\n"
+            + "".join(f"dry_{prefix}_{i}@rbt.rs,Abc!@#$\n" for i in range(4))
+        )
+        create_users_bulk = UserService.create_users_bulk
+        calls = []
+
+        def break_first_chunk(self, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                self.session.execute(text("SELECT * FROM no_such_table"))
+            return create_users_bulk(self, *args, **kwargs)
+
+        monkeypatch.setattr(UserService, 'create_users_bulk', break_first_chunk)
+
+        result = app.test_cli_runner().invoke(
+            args=['import-users', path, '--dry-run', '--chunk-size', '2', '--workers', '0', '--quiet']
+        )
+
+        assert result.exit_code == 1
+        assert '[dry run] Imported 2 out of 4 users' in result.output
+        assert 'chunk_failed=1' in result.output
+        assert db_session.query(User).filter(User.email.like(f"dry_{prefix}_%")).count() == 0
+
+    def test_import_vacations_writes_error_report(self, app, db_session, tmp_path, user_with_entitlement):
+        user = user_with_entitlement(3, 2036, prefix="cli")
+        path = self.write_file(
+            tmp_path, 'vacations.csv',
+            "Employee,VacationStartDate,VacationEndDate\n"
+            f"{user.email},2036-01-05,2036-01-06\n"
+            f"{user.email},2036-01-06,2036-01-06\n"
+        )
+        report = tmp_path / 'errors.csv'
+
+        result = app.test_cli_runner().invoke(args=['import-vacations', path, '--error-report', str(report)])
+
+        assert result.exit_code == 0, result.output
+        assert 'overlap=1' in result.output
+        assert 'overlap' in report.read_text(encoding='utf-8')
+        assert db_session.query(VacationRecord).filter_by(user_id=user.id).count() == 1
+
+    def test_import_vacations_counts_do_not_depend_on_chunk_size(
+        self, app, tmp_path, user_with_entitlement, monkeypatch
+    ):
+        import utils.import_helper
+        user = user_with_entitlement(10, 2040, prefix="chunks")
+        path = self.write_file(
+            tmp_path, 'vacations.csv',
+            "Employee,VacationStartDate,VacationEndDate\n"
+            f"{user.email},2040-01-05,2040-01-05\n"
+            f"{user.email},2040-01-12,2040-01-12\n"
+            f"{user.email},2040-02-01,2040-02-02,malformed\n"
+            f"{user.email},2040-03-02,2040-03-02\n"
+            f"{user.email},not a date,2040-03-05\n"
+            f"{user.email},2040-03-02,2040-03-02\n"
+        )
+        monkeypatch.setattr(utils.import_helper, 'CSV_BLOCK_BYTES', 64)
+        reports = []
+
+        for chunk_size in ('1', '2', '3', '1000'):
+            report = tmp_path / f'errors_{chunk_size}.csv'
+            result = app.test_cli_runner().invoke(args=[
+                'import-vacations', path, '--dry-run', '--chunk-size', chunk_size,
+                '--error-report', str(report), '--quiet'
+            ])
+            assert result.exit_code == 0, result.output
+            assert '[dry run] Imported 3 vacation records.' in result.output
+            reports.append(report.read_text(encoding='utf-8'))
+
+        assert len(set(reports)) == 1
+        assert [line.split(',')[0] for line in reports[0].splitlines()[1:]] == ['4', '5']
+
+    def test_csv_engines_report_the_same_rows(self, app, tmp_path, employee_role, monkeypatch):
+        pytest.importorskip('pyarrow')
+        from services.import_service import ImportService
+        prefix = uuid.uuid4().hex[:8]
+        path = self.write_file(
+            tmp_path, 'users.csv',
+            "Vacation year,2019\nEmployee Email,Employee Password\n"
+            f"a_{prefix}@rbt.rs,Abc!@#$\n"
+            f"b_{prefix}@rbt.rs,Abc!@#$,malformed\n"
+            f"c_{prefix}@@rbt.rs,Abc!@#$\n"
+            f"a_{prefix}@rbt.rs,Abc!@#$\n"
+            f"d_{prefix}@rbt.rs,Abc!@#$\n"
+        )
+        import_service = app.extensions["injector"].get(ImportService)
+        reports = {}
+
+        for engine in ('c', 'pyarrow'):
+            monkeypatch.setattr(import_service, 'csv_engine', engine)
+            report = tmp_path / f'errors_{engine}.csv'
+            result = app.test_cli_runner().invoke(args=[
+                'import-users', path, '--dry-run', '--chunk-size', '2', '--workers', '0',
+                '--error-report', str(report), '--quiet'
+            ])
+            assert result.exit_code == 0, result.output
+            assert '[dry run] Imported 2 out of 4 users' in result.output
+            assert '2 rows rejected (duplicate_in_file=1, invalid_email=1)' in result.output
+            reports[engine] = report.read_text(encoding='utf-8')
+
+        assert reports['c'] == reports['pyarrow']
+        assert [line.split(',')[0] for line in reports['c'].splitlines()[1:]] == ['2', '3']
+
+    def test_import_entitlements_sheet_named_like_an_index(self, app, db_session, tmp_path, employee_user):
+        from openpyxl import Workbook
+        workbook = Workbook()
+        workbook.active.append(['not', 'entitlements'])
+        sheet = workbook.create_sheet('2039')
+        for row in (['Vacation year', 2039], ['Employee', 'Total vacation days'], [employee_user.email, 12]):
+            sheet.append(row)
+        path = tmp_path / 'entitlements.xlsx'
+        workbook.save(path)
+
+        result = app.test_cli_runner().invoke(args=['import-entitlements', str(path), '--sheet', '2039', '--quiet'])
+
+        assert result.exit_code == 0, result.output
+        entitlement = db_session.query(VacationEntitlement).filter_by(user_id=employee_user.id, year=2039).one()
+        assert entitlement.total_days == 12
+
+    def test_xlsx_error_rows_follow_the_worksheet(self, app, tmp_path, user_with_entitlement):
+        from openpyxl import Workbook
+        user = user_with_entitlement(10, 2043, prefix="sheet")
+        workbook = Workbook()
+        for row in (
+            ['Employee', 'VacationStartDate', 'VacationEndDate'],
+            [user.email, '2043-01-05', '2043-01-06'],
+            [None, None, None],
+            [user.email, 'not a date', '2043-02-01'],
+        ):
+            workbook.active.append(row)
+        path = tmp_path / 'vacations.xlsx'
+        workbook.save(path)
+        report = tmp_path / 'errors.csv'
+
+        result = app.test_cli_runner().invoke(args=[
+            'import-vacations', str(path), '--dry-run', '--chunk-size', '1', '--error-report', str(report), '--quiet'
+        ])
+
+        assert result.exit_code == 0, result.output
+        assert 'Row 3: ' in result.output
+        assert report.read_text(encoding='utf-8').splitlines()[1].startswith('3,')
+
+    def test_import_entitlements_failure_exits_non_zero(self, app, tmp_path):
+        path = self.write_file(tmp_path, 'entitlements.csv', "not,an,entitlement file\n")
+
+        result = app.test_cli_runner().invoke(args=['import-entitlements', path, '--quiet'])
+
+        assert result.exit_code == 1
+        assert 'Import failed' in result.output
+
+    def test_watch_imports_once(self, app, db_session, tmp_path, employee_role):
+        email = f"watch_{uuid.uuid4().hex[:8]}@rbt.rs"
+        drop = tmp_path / 'drop'
+        drop.mkdir()
+        users = f"Vacation year,2037\nEmployee Email,Employee Password\n{email},Abc!@#$\n"
+        self.write_file(
+            drop, 'a_vacations.csv', f"Employee,VacationStartDate,VacationEndDate\n{email},2037-02-02,2037-02-03\n"
+        )
+        self.write_file(drop, 'b_entitlements.csv', f"Vacation year,2037\nEmployee,Total vacation days\n{email},10\n")
+        self.write_file(drop, 'c_users.csv', users)
+        self.write_file(drop, 'd_users_again.csv', users)
+        self.write_file(drop, 'notes.csv', "hello,world\n")
+        self.write_file(drop, 'readme.txt', "ignored")
+
+        result = app.test_cli_runner().invoke(
+            args=['watch-imports', str(drop), '--once', '--settle', '0', '--interval', '0.1']
+        )
+
+        assert result.exit_code == 1, result.output
+        assert '4 files imported, 1 failed' in result.output
+        assert sorted(p.name for p in (drop / 'processed').iterdir()) == [
+            'a_vacations.csv', 'b_entitlements.csv', 'c_users.csv', 'd_users_again.csv'
+        ]
+        assert [p.name for p in (drop / 'failed').iterdir()] == ['notes.csv']
+        assert (drop / 'readme.txt').exists()
+        user = db_session.query(User).filter_by(email=email).one()
+        assert db_session.query(VacationEntitlement).filter_by(user_id=user.id, year=2037).one().total_days == 10
+        assert db_session.query(VacationRecord).filter_by(user_id=user.id).count() == 1
+
+    def test_verify_and_rebuild_balances(self, app, db_session, tmp_path, user_with_entitlement):
+        from models.vacation_balance import VacationBalance
+        user = user_with_entitlement(20, 2038, prefix="cli")
+        path = self.write_file(
+            tmp_path, 'vacations.csv',
+            "Employee,VacationStartDate,VacationEndDate\n"
+            f"{user.email},2038-03-02,2038-03-04\n"
+            f"{user.email},2038-04-01,2038-04-02\n"
+        )
+        runner = app.test_cli_runner()
+        assert runner.invoke(args=['import-vacations', path, '--quiet']).exit_code == 0
+        assert db_session.get(VacationBalance, (user.id, 2038)).used_days == 5
+
+        result = runner.invoke(args=['verify-balances', '--user-id', str(user.id)])
+        assert result.exit_code == 0, result.output
+
+        db_session.get(VacationBalance, (user.id, 2038)).used_days = 1
+        db_session.commit()
+        result = runner.invoke(args=['verify-balances', '--user-id', str(user.id)])
+        assert result.exit_code == 1
+        assert f'user {user.id}, 2038: stored 1, actual 5' in result.output
+
+        result = runner.invoke(args=['rebuild-balances', '--user-id', str(user.id)])
+        assert result.exit_code == 0, result.output
+        assert 'Rebuilt 1 vacation balances' in result.output
+        db_session.expire_all()
+        assert db_session.get(VacationBalance, (user.id, 2038)).used_days == 5
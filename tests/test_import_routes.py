@@ -11,13 +11,25 @@ class TestImportRoutes:
         file_content.seek(0)
         return (file_content, filename)
 
+    def wait_for_job(self, client, headers, response, timeout: float = 30):
+        import time
+        status_url = json.loads(response.data)['data']['status_url']
+        deadline = time.monotonic() + timeout
+        while True:
+            job = json.loads(client.get(status_url, headers=headers).data)['data']
+            if job['status'] in ('succeeded', 'failed') or time.monotonic() > deadline:
+                return job
+            time.sleep(0.05)
+
     # /import/users - success
     def test_import_users_success(self, client, admin_auth_headers, employee_role):
-        csv_content = """Vacation year,2019
+        import uuid
+        prefix = uuid.uuid4().hex[:8]
+        csv_content = f"""Vacation year,2019
         Employee Email,Employee Password
-        user1@rbt.rs,Abc!@#$
-        user2@rbt.rs,Abc!@#$
-        user3@rbt.rs,Abc!@#$"""
+        user1_{prefix}@rbt.rs,Abc!@#$
+        user2_{prefix}@rbt.rs,Abc!@#$
+        user3_{prefix}@rbt.rs,Abc!@#$"""
         csv_file = self.create_csv_file(csv_content, 'users.csv')
         
         response = client.post(
@@ -27,9 +39,242 @@ class TestImportRoutes:
             headers=admin_auth_headers
         )
         
-        assert response.status_code == 200
+        assert response.status_code == 202
+        job = self.wait_for_job(client, admin_auth_headers, response)
+        assert job['status'] == 'succeeded'
+        assert job['result']['success'] is True
+        assert job['rows_processed'] == 3
+        stages = job['result']['details']['metrics']['stages']
+        assert {'read', 'clean', 'validate', 'hash', 'db'} <= set(stages)
+        assert stages['hash']['rows'] == 3
+        assert stages['db']['sql_statements'] >= 1
+
+    # /import/users - duplicates in file and existing emails are reported per row
+    def test_import_users_reports_duplicates(self, client, admin_auth_headers, employee_user):
+        import uuid
+        new_email = f"bulk_{uuid.uuid4().hex[:8]}@rbt.rs"
+        csv_content = f"""Vacation year,2019
+        Employee Email,Employee Password
+        {new_email},Abc!@#$
+        {new_email},Abc!@#$
+        {employee_user.email},Abc!@#$"""
+        csv_file = self.create_csv_file(csv_content, 'users.csv')
+
+        response = client.post(
+            '/import/users',
+            data={'file': csv_file},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 202
+        job = self.wait_for_job(client, admin_auth_headers, response)
+        result = job['result']
+        assert result['imported'] == 1
+        assert any("Duplicate email in file" in e for e in result['errors'])
+        assert any("Email already in use" in e for e in result['errors'])
+        assert result['error_counts'] == {'duplicate_in_file': 1, 'email_in_use': 1}
+
+        report = client.get(job['errors_url'], headers=admin_auth_headers)
+        assert report.status_code == 200
+        lines = report.data.decode('utf-8').splitlines()
+        assert lines[0] == 'row,email,reason,message'
+        assert len(lines) == 3
+
+    # /import/jobs/<id> - job state lives in the database, so another worker process can answer
+    def test_import_job_is_visible_to_another_worker(self, app, client, admin_auth_headers, employee_role):
+        import uuid
+        from services.import_job_manager import ImportJobManager
+        email = f"worker_{uuid.uuid4().hex[:8]}@rbt.rs"
+        csv_content = f"""Vacation year,2019
+        Employee Email,Employee Password
+        {email},Abc!@#$
+        {email},Abc!@#$"""
+
+        response = client.post(
+            '/import/users',
+            data={'file': self.create_csv_file(csv_content, 'users.csv')},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+        job = self.wait_for_job(client, admin_auth_headers, response)
+
+        other_worker = ImportJobManager(import_service=None)
+        with app.app_context():
+            seen = other_worker.get(job['id'])
+            report_path = other_worker.get_error_report_path(job['id'])
+        assert seen.status == 'succeeded'
+        assert (seen.rows_processed, seen.result.imported, seen.result.error_total) == (2, 1, 1)
+        assert report_path is not None
+
+    # /import/users - invalid emails and short passwords get their own reason codes
+    def test_import_users_rejects_invalid_rows(self, client, admin_auth_headers, employee_role):
+        import uuid
+        prefix = uuid.uuid4().hex[:8]
+        csv_content = f"""Vacation year,2019
+        Employee Email,Employee Password
+        ok_{prefix}@rbt.rs,Abc!@#$
+        {prefix}..dots@rbt.rs,Abc!@#$
+        short_{prefix}@rbt.rs,abc
+        tld_{prefix}@rbt.test,Abc!@#$"""
+        csv_file = self.create_csv_file(csv_content, 'users.csv')
+
+        response = client.post(
+            '/import/users',
+            data={'file': csv_file},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 202
+        result = self.wait_for_job(client, admin_auth_headers, response)['result']
+        assert result['imported'] == 1
+        assert result['error_counts'] == {'invalid_email': 1, 'password_too_short': 1, 'invalid_data': 1}
+        assert result['errors'][0].startswith('Row 2: ')
+
+    # /import/users - re-uploading a fully imported file is a no-op
+    def test_import_users_same_file_is_imported_once(self, client, admin_auth_headers, employee_role):
+        import uuid
+        csv_content = f"""Vacation year,2019
+        Employee Email,Employee Password
+        once_{uuid.uuid4().hex[:8]}@rbt.rs,Abc!@#$"""
+
+        results = []
+        for expected_status in (202, 200):
+            response = client.post(
+                '/import/users',
+                data={'file': self.create_csv_file(csv_content, 'users.csv')},
+                content_type='multipart/form-data',
+                headers=admin_auth_headers
+            )
+            assert response.status_code == expected_status
+            results.append(self.wait_for_job(client, admin_auth_headers, response)['result'])
+
+        assert results[0]['imported'] == 1
+        assert results[1]['imported'] == 0
+        assert results[1]['details']['already_imported'] is True
+        assert results[1]['details']['rows_imported'] == 1
+
+    # /import/users - xlsx worksheet selected by name
+    def test_import_users_xlsx_sheet(self, client, admin_auth_headers, employee_role):
+        import uuid
+        from openpyxl import Workbook
+        workbook = Workbook()
+        workbook.active.append(['not', 'users'])
+        sheet = workbook.create_sheet('Users')
+        email = f"xlsx_{uuid.uuid4().hex[:8]}@rbt.rs"
+        for row in (['Vacation year', 2019], ['Employee Email', 'Employee Password'], [email, 'Abc!@#$']):
+            sheet.append(row)
+        content = BytesIO()
+        workbook.save(content)
+        content.seek(0)
+
+        response = client.post(
+            '/import/users',
+            data={'file': (content, 'users.xlsx'), 'sheet': 'Users'},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 202
+        result = self.wait_for_job(client, admin_auth_headers, response)['result']
+        assert result['success'] is True
+        assert result['imported'] == 1
+
+    # /import/vacations - typed Parquet columns skip date parsing
+    def test_import_vacations_parquet(self, client, admin_auth_headers, user_with_entitlement):
+        from datetime import date
+        pa = pytest.importorskip('pyarrow')
+        pq = pytest.importorskip('pyarrow.parquet')
+        user = user_with_entitlement(10, 2034, prefix="pq")
+
+        table = pa.table({
+            'email': [user.email, user.email],
+            'start_date': [date(2034, 3, 1), date(2034, 3, 2)],
+            'end_date': [date(2034, 3, 3), date(2034, 3, 2)],
+        })
+        content = BytesIO()
+        pq.write_table(table, content)
+        content.seek(0)
+
+        response = client.post(
+            '/import/vacations',
+            data={'file': (content, 'vacations.parquet')},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 202
+        result = self.wait_for_job(client, admin_auth_headers, response)['result']
+        assert result['imported'] == 1
+        assert result['error_counts'] == {'overlap': 1}
+
+    # /import/entitlements - a Parquet file spanning several years is rejected
+    def test_import_entitlements_parquet_mixed_years(self, client, admin_auth_headers, employee_user):
+        pa = pytest.importorskip('pyarrow')
+        pq = pytest.importorskip('pyarrow.parquet')
+        table = pa.table({
+            'email': [employee_user.email, 'other@rbt.rs'],
+            'total_days': [20, 21],
+            'year': [2024, 2025],
+        })
+        content = BytesIO()
+        pq.write_table(table, content)
+        content.seek(0)
+
+        response = client.post(
+            '/import/entitlements',
+            data={'file': (content, 'entitlements.parquet')},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 202
+        result = self.wait_for_job(client, admin_auth_headers, response)['result']
+        assert result['success'] is False
+        assert 'must hold one year, found 2024, 2025' in result['message']
+
+    def test_import_vacations_bulk_chunk(self, client, db_session, admin_auth_headers, user_with_entitlement):
+        from models.vacation_record import VacationRecord
+        from repositories.base_repository import COPY_MIN_ROWS
+        users = [user_with_entitlement(5, 2035, prefix="copy") for _ in range(COPY_MIN_ROWS // 5)]
+
+        lines = ["Employee,VacationStartDate,VacationEndDate"]
+        for user in users:
+            lines += [f"{user.email},2035-04-0{day},2035-04-0{day}" for day in range(1, 6)]
+
+        response = client.post(
+            '/import/vacations',
+            data={'file': self.create_csv_file("\n".join(lines), 'vacations.csv')},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 202
+        result = self.wait_for_job(client, admin_auth_headers, response)['result']
+        assert result['imported'] == len(users) * 5
+        db_session.expire_all()
+        imported = db_session.query(VacationRecord).filter(VacationRecord.user_id.in_([u.id for u in users])).all()
+        assert len(imported) == len(users) * 5
+        assert {record.note for record in imported} == {"Imported from file"}
+
+    # /import/users - fail
+    def test_import_users_too_large(self, client, app, admin_auth_headers):
+        app.config['UPLOAD_MAX_BYTES'] = 16
+        csv_content = """Vacation year,2019
+        Employee Email,Employee Password
+        user1@rbt.rs,Abc!@#$"""
+
+        response = client.post(
+            '/import/users',
+            data={'file': self.create_csv_file(csv_content, 'users.csv')},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 413
         data = json.loads(response.data)
-        assert data['success'] is True
+        assert data['success'] is False
 
     # /import/users - fail
     def test_import_users_unauthorized(self, client, employee_auth_headers, employee_role):
@@ -50,13 +295,14 @@ class TestImportRoutes:
         assert data['success'] is False
 
     # /import/vacations - success
-    def test_import_vacations_success(self, client, admin_auth_headers, employee_user, vacation_entitlement):
+    def test_import_vacations_success(self, client, admin_auth_headers, employee_user, vacation_entitlement, forget_import):
         csv_content = """Employee,Vacation start date,Vacation end date
         employee@test.com,"Friday, August 30, 2019","Wednesday, September 11, 2019"
         employee@test.com,"Thursday, October 24, 2019","Thursday, October 24, 2019"
         employee@test.com,"Friday, November 22, 2019","Friday, November 22, 2019"
         employee@test.com,"Monday, March 9, 2020","Monday, March 9, 2020"
         employee@test.com,"Monday, May 25, 2020","Thursday, May 28, 2020\""""
+        forget_import(csv_content)
         csv_file = self.create_csv_file(csv_content, 'vacations.csv')
         
         response = client.post(
@@ -66,9 +312,57 @@ class TestImportRoutes:
             headers=admin_auth_headers
         )
         
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert data['success'] is True
+        assert response.status_code == 202
+        job = self.wait_for_job(client, admin_auth_headers, response)
+        assert job['status'] == 'succeeded'
+        assert job['result']['success'] is True
+
+    # /import/vacations - overlaps and balances are checked against rows in the same file
+    def test_import_vacations_validates_within_file(self, client, admin_auth_headers, user_with_entitlement):
+        user = user_with_entitlement(10, 2031, prefix="vac")
+
+        csv_content = f"""Employee,Vacation start date,Vacation end date
+        {user.email},2031-03-01,2031-03-03
+        {user.email},2031-03-02,2031-03-02
+        {user.email},2031-04-01,2031-04-10
+        {user.email},2031-05-04,2031-05-10"""
+        csv_file = self.create_csv_file(csv_content, 'vacations.csv')
+
+        response = client.post(
+            '/import/vacations',
+            data={'file': csv_file},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 202
+        result = self.wait_for_job(client, admin_auth_headers, response)['result']
+        assert result['imported'] == 2
+        assert any("Overlap" in e for e in result['errors'])
+        assert any("Not enough days" in e for e in result['errors'])
+
+    # /import/vacations - unparseable dates are reported per row instead of failing the file
+    def test_import_vacations_reports_invalid_dates(self, client, admin_auth_headers, user_with_entitlement):
+        user = user_with_entitlement(20, 2033, prefix="dates")
+
+        csv_content = f"""Employee,Vacation start date,Vacation end date
+        {user.email},"Monday, March 7, 2033",09.03.2033
+        {user.email},not a date,2033-04-01
+        {user.email},2033-05-10,2033-05-01"""
+        csv_file = self.create_csv_file(csv_content, 'vacations.csv')
+
+        response = client.post(
+            '/import/vacations',
+            data={'file': csv_file},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 202
+        result = self.wait_for_job(client, admin_auth_headers, response)['result']
+        assert result['imported'] == 1
+        assert any(e.startswith("Row 2:") and "Invalid start date" in e for e in result['errors'])
+        assert any(e.startswith("Row 3:") and "End date must be on or after start date" in e for e in result['errors'])
 
     # /import/vacations - fail
     def test_import_vacations_missing_file(self, client, admin_auth_headers):
@@ -83,10 +377,11 @@ class TestImportRoutes:
         assert data['success'] is False
 
     # /import/entitlements - success
-    def test_import_entitlements_success(self, client, admin_auth_headers, employee_user):
+    def test_import_entitlements_success(self, client, admin_auth_headers, employee_user, forget_import):
         csv_content = """Vacation year,2019
         Employee,Total vacation days
         employee@test.com,20"""
+        forget_import(csv_content)
         csv_file = self.create_csv_file(csv_content, 'entitlements.csv')
         
         response = client.post(
@@ -96,9 +391,35 @@ class TestImportRoutes:
             headers=admin_auth_headers
         )
         
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert data['success'] is True
+        assert response.status_code == 202
+        job = self.wait_for_job(client, admin_auth_headers, response)
+        assert job['status'] == 'succeeded'
+        assert job['result']['success'] is True
+
+    # /import/entitlements - conflict policy
+    def test_import_entitlements_add_policy(self, client, db_session, admin_auth_headers, user_with_entitlement):
+        from models.vacation_entitlement import VacationEntitlement
+        user = user_with_entitlement(10, 2032, prefix="ent")
+        user_id = user.id
+
+        csv_content = f"""Vacation year,2032
+        Employee,Total vacation days
+        {user.email},5"""
+        csv_file = self.create_csv_file(csv_content, 'entitlements.csv')
+
+        response = client.post(
+            '/import/entitlements',
+            data={'file': csv_file, 'on_conflict': 'add'},
+            content_type='multipart/form-data',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 202
+        result = self.wait_for_job(client, admin_auth_headers, response)['result']
+        assert result['details']['added'] == 1
+        db_session.expire_all()
+        entitlement = db_session.query(VacationEntitlement).filter_by(user_id=user_id, year=2032).one()
+        assert entitlement.total_days == 15
 
     # /import/entitlements - fail
     def test_import_entitlements_unauthorized(self, client, employee_auth_headers, employee_user):
@@ -117,3 +438,11 @@ class TestImportRoutes:
         assert response.status_code == 403
         data = json.loads(response.data)
         assert data['success'] is False
+
+    # /import/jobs/<id> - fail
+    def test_get_import_job_not_found(self, client, admin_auth_headers):
+        response = client.get('/import/jobs/does-not-exist', headers=admin_auth_headers)
+
+        assert response.status_code == 404
+        data = json.loads(response.data)
+        assert data['success'] is False
@@ -93,4 +93,47 @@ class TestUsersRoutes:
         
         assert response.status_code == 200
         data = json.loads(response.data)
-        assert data['success'] is True
\ No newline at end of file
+        assert data['success'] is True
+
+    # PATCH /users/<id> - changed password invalidates cached credentials
+    def test_update_password_invalidates_cached_credentials(self, client, db_session, employee_role):
+        from models.user import User
+        from utils.password import hash_password
+        from utils.credential_cache import credential_cache
+        from tests.conftest import create_auth_header
+
+        user = db_session.query(User).filter_by(email="cached@test.com").first()
+        if not user:
+            user = User(
+                email="cached@test.com",
+                password=hash_password("cached123"),
+                full_name="Cached User",
+                role_id=employee_role.id
+            )
+            db_session.add(user)
+            db_session.commit()
+        user.password = hash_password("cached123")
+        db_session.commit()
+
+        old_headers = create_auth_header("cached@test.com", "cached123")
+        assert client.get(f'/users/{user.id}', headers=old_headers).status_code == 200
+        hits_before = credential_cache.stats()['hits']
+        assert client.get(f'/users/{user.id}', headers=old_headers).status_code == 200
+        assert credential_cache.stats()['hits'] == hits_before + 1
+
+        response = client.patch(
+            f'/users/{user.id}',
+            data=json.dumps({"password": "changed123"}),
+            content_type='application/json',
+            headers=old_headers
+        )
+        assert response.status_code == 200
+
+        assert client.get(f'/users/{user.id}', headers=old_headers).status_code == 401
+        new_headers = create_auth_header("cached@test.com", "changed123")
+        assert client.get(f'/users/{user.id}', headers=new_headers).status_code == 200
+
+        # a password changed by another worker leaves this process' entry in place; it must not match
+        user.password = hash_password("elsewhere123")
+        db_session.commit()
+        assert client.get(f'/users/{user.id}', headers=new_headers).status_code == 401
@@ -94,6 +94,61 @@ class TestVacationRoutes:
         assert response.status_code == 400
         data = json.loads(response.data)
         assert data['success'] is False
+        assert data['data']['reason'] == 'overlap'
+
+    # POST /vacation/users/<id>/create - fail
+    def test_create_vacation_record_not_enough_days(self, client, admin_auth_headers, employee_user, vacation_entitlement):
+        response = client.post(
+            f'/vacation/users/{employee_user.id}/create',
+            data=json.dumps({"start_date": "2025-10-01", "end_date": "2025-12-31"}),
+            content_type='application/json',
+            headers=admin_auth_headers
+        )
+
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data['data']['reason'] == 'not_enough_days'
+        assert data['error'].startswith('You dont have enought days left: 92')
+
+    # overlapping records are rejected by the database itself on PostgreSQL
+    def test_overlap_exclusion_constraint(self, db_session, employee_user, vacation_record):
+        from sqlalchemy.exc import IntegrityError
+        from models.vacation_record import VacationRecord
+        if db_session.get_bind().dialect.name != 'postgresql':
+            pytest.skip('exclusion constraint is PostgreSQL only')
+
+        db_session.add(VacationRecord(
+            user_id=employee_user.id, start_date=vacation_record.end_date, end_date=vacation_record.end_date,
+            days_count=1, year=vacation_record.year
+        ))
+        with pytest.raises(IntegrityError, match='ex_vacation_records_no_overlap'):
+            db_session.flush()
+        db_session.rollback()
+
+    # the summary reads the balance kept in step with every record written or removed
+    def test_vacation_summary_tracks_balance(self, client, db_session, admin_auth_headers, user_with_entitlement):
+        from models.vacation_record import VacationRecord
+        user = user_with_entitlement(20, 2030, prefix="balance")
+        fixture_record = VacationRecord(
+            user_id=user.id, start_date=date(2030, 3, 1), end_date=date(2030, 3, 2), days_count=2, year=2030
+        )
+        db_session.add(fixture_record)
+        db_session.commit()
+
+        response = client.post(
+            f'/vacation/users/{user.id}/create',
+            data=json.dumps({"start_date": "2030-05-04", "end_date": "2030-05-08"}),
+            content_type='application/json',
+            headers=admin_auth_headers
+        )
+        assert response.status_code == 201
+        summary = client.get(f'/vacation/users/{user.id}/summary?year=2030', headers=admin_auth_headers)
+        assert json.loads(summary.data)['data']['used_days'] == 7
+
+        db_session.delete(fixture_record)
+        db_session.commit()
+        summary = client.get(f'/vacation/users/{user.id}/summary?year=2030', headers=admin_auth_headers)
+        assert json.loads(summary.data)['data']['used_days'] == 5
 
     # POST /vacation/users/<id>/entitlements - success
     def test_create_entitlement_success(self, client, admin_auth_headers, employee_user):
@@ -151,3 +206,35 @@ class TestVacationRoutes:
         assert response.status_code == 400
         data = json.loads(response.data)
         assert data['success'] is False
+
+    # GET /vacation/users/<id>/records - cursor pages
+    def test_get_vacation_records_cursor_pages(self, client, db_session, admin_auth_headers, user_with_entitlement):
+        from models.vacation_record import VacationRecord
+        user = user_with_entitlement(prefix="pages")
+        records = [
+            VacationRecord(
+                user_id=user.id, start_date=date(2031, 2, day), end_date=date(2031, 2, day + 1), days_count=2, year=2031
+            )
+            for day in (3, 10, 17)
+        ]
+        db_session.add_all(records)
+        db_session.commit()
+        url = f'/vacation/users/{user.id}/records?from_date=2031-01-01&to_date=2031-12-31&per_page=2'
+
+        first = json.loads(client.get(f'{url}&include_total=true', headers=admin_auth_headers).data)['data']
+        assert [r['id'] for r in first['data']] == [records[2].id, records[1].id]
+        assert first['total'] == 3
+        assert first['has_next'] is True
+
+        second = json.loads(client.get(
+            f"{url}&include_total=true&cursor={first['next_cursor']}", headers=admin_auth_headers
+        ).data)['data']
+        assert [r['id'] for r in second['data']] == [records[0].id]
+        assert second['total'] == 3
+        assert second['has_next'] is False
+        assert second['has_prev'] is True
+        assert second['next_cursor'] is None
+
+        response = client.get(f'{url}&cursor=not-a-cursor', headers=admin_auth_headers)
+        assert response.status_code == 400
+
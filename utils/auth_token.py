@@ -0,0 +1,77 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+
+TOKEN_SALT = "auth-token"
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    user_id: int
+    role_id: int
+    token_version: int
+
+
+def _serializer(secret_key: str) -> URLSafeTimedSerializer:
+    if not secret_key:
+        raise RuntimeError("SECRET_KEY must be set to issue or verify auth tokens")
+    return URLSafeTimedSerializer(secret_key, salt=TOKEN_SALT)
+
+
+def issue_token(secret_key: str, user_id: int, role_id: int, token_version: int) -> str:
+    return _serializer(secret_key).dumps({
+        "uid": user_id,
+        "rid": role_id,
+        "ver": token_version,
+    })
+
+
+def decode_token(secret_key: str, token: str, max_age: int) -> Optional[TokenClaims]:
+    try:
+        payload = _serializer(secret_key).loads(token, max_age=max_age)
+        return TokenClaims(
+            user_id=int(payload["uid"]),
+            role_id=int(payload["rid"]),
+            token_version=int(payload["ver"]),
+        )
+    except (SignatureExpired, BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenVersionCache:
+    """
+    Per-process cache of users.token_version so bearer requests skip the users table.
+    A revoked token keeps working in other workers for at most ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: int = 30):
+        self.ttl_seconds = ttl_seconds
+        self._versions: Dict[int, Tuple[Optional[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, ttl_seconds: int) -> None:
+        with self._lock:
+            self.ttl_seconds = ttl_seconds
+            self._versions.clear()
+
+    def get(self, user_id: int, loader: Callable[[int], Optional[int]]) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._versions.get(user_id)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+
+        version = loader(user_id)
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._versions[user_id] = (version, now + self.ttl_seconds)
+        return version
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._versions.pop(user_id, None)
+
+
+token_versions = TokenVersionCache()
@@ -0,0 +1,119 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set
+
+
+class CachedCredential(NamedTuple):
+    user_id: int
+    password_stamp: str
+
+
+class CredentialCache:
+    """
+    Bounded TTL cache of Authorization headers that already passed password verification.
+    Entries are keyed by HMAC-SHA256 of the header with a per-process random key,
+    so neither the plaintext nor a reversible value is kept in memory.
+    Each entry also keeps an HMAC of the user's password hash: invalidate_user only clears
+    this process, so a hit counts only while matches() confirms the stored hash is unchanged.
+    """
+
+    def __init__(self, ttl_seconds: int = 300, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._key = os.urandom(32)
+        self._entries: "OrderedDict[str, tuple[CachedCredential, float]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, ttl_seconds: int, max_size: int) -> None:
+        with self._lock:
+            self.ttl_seconds = ttl_seconds
+            self.max_size = max_size
+            self._clear()
+
+    def _digest(self, auth_header: str) -> str:
+        return hmac.new(self._key, auth_header.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def matches(self, cached: CachedCredential, password_hash: str) -> bool:
+        return hmac.compare_digest(cached.password_stamp, self._digest(password_hash or ""))
+
+    def get(self, auth_header: str) -> Optional[CachedCredential]:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return None
+        key = self._digest(auth_header)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            cached, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+    def put(self, auth_header: str, user_id: int, password_hash: str) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        key = self._digest(auth_header)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            cached = CachedCredential(user_id, self._digest(password_hash or ""))
+            self._entries[key] = (cached, time.monotonic() + self.ttl_seconds)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    def discard(self, auth_header: str) -> None:
+        key = self._digest(auth_header)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, key: str) -> None:
+        cached, _ = self._entries.pop(key)
+        user_id = cached.user_id
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_user.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+credential_cache = CredentialCache()
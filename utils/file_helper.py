@@ -1,27 +1,71 @@
 # utils/file_utils.py
+import hashlib
 import os
-from datetime import datetime
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
 from werkzeug.utils import secure_filename
 from flask import current_app
 import logging
 
 logger = logging.getLogger(__name__)
 
-def save_uploaded_file(file, prefix: str = "import") -> str:
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+class UploadTooLargeError(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+    duplicate: bool
+
+def store_uploaded_file(file, max_bytes: Optional[int] = None, block_size: int = UPLOAD_BLOCK_SIZE) -> StoredUpload:
+    """
+    Streams an upload to UPLOAD_FOLDER in blocks while hashing it and stores it as
+    <sha256><ext>. An upload with the same content and extension reuses the stored file.
+    Raises UploadTooLargeError as soon as more than max_bytes have been read.
+    """
     if not file or not file.filename:
         raise ValueError("Invalid file")
 
-    original_name = secure_filename(file.filename)
-    name, ext = os.path.splitext(original_name)
+    _, ext = os.path.splitext(secure_filename(file.filename))
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    os.makedirs(upload_folder, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=upload_folder, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for block in iter(lambda: file.stream.read(block_size), b""):
+                size += len(block)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLargeError(f"File exceeds the upload limit of {max_bytes} bytes")
+                digest.update(block)
+                out.write(block)
 
-    new_filename = f"{prefix}_{timestamp}_{name}{ext}"
-    upload_path = os.path.join(current_app.config["UPLOAD_FOLDER"], new_filename)
+        sha256 = digest.hexdigest()
+        upload_path = os.path.join(upload_folder, f"{sha256}{ext.lower()}")
+        if os.path.exists(upload_path):
+            os.remove(tmp_path)
+            logger.info(f"Upload matches stored file: {upload_path}")
+            return StoredUpload(upload_path, sha256, size, duplicate=True)
 
-    os.makedirs(current_app.config["UPLOAD_FOLDER"], exist_ok=True)
+        os.replace(tmp_path, upload_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-    file.save(upload_path)
-    logger.info(f"Saved uploaded file: {upload_path}")
+    logger.info(f"Saved uploaded file: {upload_path} ({size} bytes)")
+    return StoredUpload(upload_path, sha256, size, duplicate=False)
 
-    return upload_path
\ No newline at end of file
+def file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -1,47 +1,208 @@
+import io
 import pandas as pd
 import logging
-from datetime import datetime
-from typing import Tuple
+from contextlib import closing
+from datetime import date, datetime
+from typing import Iterator, Optional, Tuple, Union
+from constants import ImportErrorReason
+from utils.import_metrics import ImportMetrics, measure, timed
 
 logger = logging.getLogger(__name__)
 
-def clean_user_import_file(file_path: str) -> pd.DataFrame:
+DEFAULT_CHUNK_SIZE = 10000
+
+SheetRef = Union[str, int, None]
+
+CSV_ENGINES = ("c", "pyarrow")
+
+CSV_BLOCK_BYTES = 1 << 20
+
+def _as_string(series: pd.Series) -> pd.Series:
+    """
+    Keeps Arrow/pandas string columns (from the pyarrow and Parquet readers) as they are;
+    anything else is converted like before with astype(str).
+    """
+    if isinstance(series.dtype, (pd.ArrowDtype, pd.StringDtype)):
+        return series.fillna('')
+    return series.astype(str)
+
+def clean_user_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.iloc[:, :2].copy()
+    df.columns = ['email', 'password']
+
+    df['email'] = _as_string(df['email']).str.strip().str.lower()
+    df['password'] = _as_string(df['password']).str.strip()
+
+    df['full_name'] = df['email'].str.split('@').str[0].str.replace('.', ' ').str.replace('_', ' ').str.title()
+
+    df = df[df['email'].str.contains('@', na=False)]
+    df = df[df['email'] != '']
+    df = df[df['password'] != '']
+
+    return df[['email', 'full_name', 'password']]
+
+
+def iter_user_import_chunks(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    metrics: Optional[ImportMetrics] = None,
+    sheet: SheetRef = None,
+    csv_engine: str = "c"
+) -> Iterator[pd.DataFrame]:
     """
     Vacation year,2019
     Employee Email,Employee Password
     user1@rbt.rs,Abc!@#$
     ...
+    Yields cleaned chunks with ['email', 'full_name', 'password'], indexed by data row (0-based).
     """
     try:
-        df = load_dataframe(file_path)
+        total = 0
+        for raw in timed(metrics, "read", iter_dataframe_chunks(
+            file_path, chunk_size, skip_rows=2, sheet=sheet, csv_engine=csv_engine
+        )):
+            if raw.shape[1] < 2:
+                raise ValueError("File must have at least 2 columns: email, password")
+            with measure(metrics, "clean", len(raw)):
+                df = clean_user_chunk(raw)
+            if not df.empty:
+                total += len(df)
+                yield df
+
+        if total == 0:
+            raise ValueError("No valid users found after cleaning")
+        logger.info(f"Cleaned {total} users from {file_path}")
 
-        if df.empty:
-            raise ValueError("File is empty")
-        if df.shape[0] < 3:
-            raise ValueError("File must have at least 3 rows (header + data)")
-        df = df.iloc[2:].copy()
+    except Exception as e:
+        logger.error(f"Error cleaning file {file_path}: {e}")
+        raise ValueError(f"Invalid file format: {str(e)}")
 
-        df = df.iloc[:, :2].copy()
-        df.columns = ['email', 'password']
 
-        df['email'] = df['email'].astype(str).str.strip().str.lower()
-        df['password'] = df['password'].astype(str).str.strip()
+def clean_user_import_file(file_path: str) -> pd.DataFrame:
+    return pd.concat(list(iter_user_import_chunks(file_path))).reset_index(drop=True)
 
-        df['full_name'] = df['email'].str.split('@').str[0].str.replace('.', ' ').str.replace('_', ' ').str.title()
 
-        df = df[df['email'].str.contains('@', na=False)]
-        df = df[df['email'] != '']
-        df = df[df['password'] != '']
+DATE_FORMATS = (
+    "%A, %B %d, %Y",  # 'Friday, August 30, 2019'
+    "%A, %d %B %Y",
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d.%m.%Y",
+    "%m/%d/%Y"
+)
 
-        if df.empty:
-            raise ValueError("No valid users found after cleaning")
 
-        df = df[['email', 'full_name', 'password']].reset_index(drop=True)
-        logger.info(f"Cleaned {len(df)} users from {file_path}")
-        return df
+class MultiFormatDateParser:
+    """
+    Parses a column of date strings that mix DATE_FORMATS.
+    Each format is tried on the whole set of still-unparsed unique values, and results are
+    memoized across chunks, since exports repeat the same dates heavily. Unparseable values become NaT.
+    """
+
+    def __init__(self, formats=DATE_FORMATS, max_cache_size: int = 100000):
+        self.formats = formats
+        self.max_cache_size = max_cache_size
+        self.cache = {}
+
+    def parse(self, values: pd.Series) -> pd.Series:
+        strings = values.astype(str).str.strip()
+        missing = [value for value in strings.unique() if value not in self.cache]
+        if missing:
+            if len(self.cache) + len(missing) > self.max_cache_size:
+                self.cache.clear()
+            parsed = self._parse_unique(pd.Series(missing, dtype=object))
+            self.cache.update(zip(missing, parsed))
+        return pd.to_datetime(strings.map(self.cache))
+
+    def _parse_unique(self, strings: pd.Series) -> list:
+        result = pd.Series(pd.NaT, index=strings.index, dtype='datetime64[ns]')
+        for fmt in self.formats:
+            pending = result.isna()
+            if not pending.any():
+                break
+            result[pending] = pd.to_datetime(strings[pending], format=fmt, errors='coerce')
+        return list(result)
+
+
+def _parse_dates(values: pd.Series, date_parser: MultiFormatDateParser) -> pd.Series:
+    """
+    Typed date columns (Parquet) are used as they are; strings go through date_parser.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        if getattr(values.dt, 'tz', None) is not None:
+            values = values.dt.tz_localize(None)
+        return values.dt.normalize().astype('datetime64[ns]')
+    return date_parser.parse(values)
+
+
+def _display(values: pd.Series) -> pd.Series:
+    return values.map(lambda value: '' if pd.isna(value) else str(value)).astype(object)
+
+
+def clean_vacation_chunk(df: pd.DataFrame, date_parser: MultiFormatDateParser = None) -> pd.DataFrame:
+    """
+    Rows that cannot be imported are kept with a message in the 'error' column and an
+    ImportErrorReason code in 'reason' (both None for valid rows).
+    """
+    date_parser = date_parser or MultiFormatDateParser()
+    df = df.iloc[:, :3].copy()
+    df.columns = ['email', 'start_date_str', 'end_date_str']
+
+    df['email'] = _as_string(df['email']).str.strip().str.lower()
+    df = df[df['email'].str.contains('@', na=False)]
+
+    df['start_date'] = _parse_dates(df['start_date_str'], date_parser)
+    df['end_date'] = _parse_dates(df['end_date_str'], date_parser)
+
+    df['year'] = df['start_date'].dt.year.astype('Int64')
+    df['days'] = ((df['end_date'] - df['start_date']).dt.days + 1).astype('Int64')
+
+    df['error'] = None
+    df['reason'] = None
+    invalid_range = df['days'] < 1
+    df.loc[invalid_range, 'error'] = "End date must be on or after start date"
+    df.loc[invalid_range, 'reason'] = ImportErrorReason.INVALID_DATE_RANGE
+    invalid_end = df['end_date'].isna()
+    df.loc[invalid_end, 'error'] = "Invalid end date: " + _display(df.loc[invalid_end, 'end_date_str'])
+    invalid_start = df['start_date'].isna()
+    df.loc[invalid_start, 'error'] = "Invalid start date: " + _display(df.loc[invalid_start, 'start_date_str'])
+    df.loc[invalid_end | invalid_start, 'reason'] = ImportErrorReason.INVALID_DATE
+
+    return df[['email', 'start_date', 'end_date', 'year', 'days', 'error', 'reason']]
+
+
+def iter_vacation_records_chunks(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    metrics: Optional[ImportMetrics] = None,
+    sheet: SheetRef = None,
+    csv_engine: str = "c"
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields cleaned chunks with ['email', 'start_date', 'end_date', 'year', 'days', 'error', 'reason'],
+    indexed by data row (0-based). Rows with a non-null 'error' failed cleaning.
+    """
+    try:
+        total = 0
+        date_parser = MultiFormatDateParser()
+        raw_chunks = iter_dataframe_chunks(
+            file_path, chunk_size, skip_rows=1, skipinitialspace=True, sheet=sheet, csv_engine=csv_engine
+        )
+        for raw in timed(metrics, "read", raw_chunks):
+            if raw.shape[1] < 3:
+                raise ValueError("File must have at least 3 columns: email, start_date, end_date")
+            with measure(metrics, "clean", len(raw)):
+                df = clean_vacation_chunk(raw, date_parser)
+            if not df.empty:
+                total += len(df)
+                yield df
+
+        if total == 0:
+            raise ValueError("No data rows after skipping header")
+        logger.info(f"Cleaned {total} vacation records from {file_path}")
 
     except Exception as e:
-        logger.error(f"Error cleaning file {file_path}: {e}")
+        logger.error(f"Error cleaning vacation file {file_path}: {e}")
         raise ValueError(f"Invalid file format: {str(e)}")
 
 
@@ -49,137 +210,521 @@ def clean_vacation_records_file(file_path: str) -> pd.DataFrame:
     """
     return df with ['email', 'start_date', 'end_date', 'year', 'days']
     """
-    try:
-        if file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path, header=None)
-        else:
-            df = pd.read_csv(
-                file_path,
-                header=None,
-                sep=',',
-                engine='python',
-                on_bad_lines='skip',
-                encoding='utf-8',
-                skipinitialspace=True  
-            )
+    df = pd.concat(list(iter_vacation_records_chunks(file_path)))
+    invalid = df[df['error'].notna()]
+    if not invalid.empty:
+        raise ValueError(f"Invalid file format: row {invalid.index[0] + 1}: {invalid['error'].iloc[0]}")
+    return df.drop(columns=['error', 'reason']).reset_index(drop=True)
 
-        if df.empty:
-            raise ValueError("File is empty or no data could be parsed")
 
-        if df.shape[1] < 3:
-            raise ValueError("File must have at least 3 columns: email, start_date, end_date")
-
-        df = df.iloc[1:, :3].copy()
-        if df.empty:
-            raise ValueError("No data rows after skipping header")
+def read_entitlement_year(file_path: str, sheet: SheetRef = None, csv_engine: str = "c") -> int:
+    """
+    First row: Vacation year,2019
+    Parquet files have no preamble; the year is the third column of the data rows and must
+    be the same in every row, since the rows are upserted for a single year.
+    """
+    with closing(iter_dataframe_chunks(
+        file_path, chunk_size=1, max_rows=1, sheet=sheet, csv_engine=csv_engine
+    )) as chunks:
+        header = next(chunks, None)
+
+    if file_path.endswith('.parquet'):
+        if header is None or header.shape[1] < 3:
+            raise ValueError("Parquet entitlement files need columns: email, total_days, year")
+        years = parquet_column_distinct(file_path, 2)
+        if len(years) > 1:
+            raise ValueError(
+                f"Parquet entitlement files must hold one year, found {', '.join(sorted(map(str, years)))}"
+            )
+        try:
+            return int(header.iloc[0, 2])
+        except (ValueError, TypeError):
+            raise ValueError("Invalid year in third column")
+    if header is None or header.empty or header.shape[1] < 2:
+        raise ValueError("File must have at least 2 columns")
 
-        df.columns = ['email', 'start_date_str', 'end_date_str']
+    header_cell = str(header.iloc[0, 0]).strip().lower()
+    if not header_cell.startswith("vacation year"):
+        raise ValueError("First row must start with 'Vacation year'")
 
-        df['email'] = df['email'].astype(str).str.strip().str.lower()
+    try:
+        return int(header.iloc[0, 1])
+    except (ValueError, TypeError):
+        raise ValueError("Invalid year in first row, second column")
 
-        def parse_date(date_str):
-            date_str = str(date_str).strip()
-            formats = (
-                "%A, %B %d, %Y",  # 'Friday, August 30, 2019'
-                "%A, %d %B %Y",
-                "%Y-%m-%d",
-                "%d/%m/%Y",
-                "%d.%m.%Y",
-                "%m/%d/%Y"
-            )
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str, fmt) 
-                except ValueError:
-                    continue
-            raise ValueError(f"Invalid date: {date_str}")
 
-        df['start_date'] = pd.to_datetime(df['start_date_str'].apply(parse_date))
-        df['end_date'] = pd.to_datetime(df['end_date_str'].apply(parse_date))
+def clean_entitlement_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    data_df = df.iloc[:, :2].copy()
+    data_df.columns = ['email', 'total_days']
+    data_df = data_df.dropna(how='all')
 
-        df['year'] = df['start_date'].dt.year
-        df['days'] = (df['end_date'] - df['start_date']).dt.days + 1 
+    data_df['email'] = _as_string(data_df['email']).str.strip().str.lower()
+    data_df['total_days'] = pd.to_numeric(data_df['total_days'], errors='coerce')
 
-        if (df['days'] < 1).any():
-            raise ValueError("End date must be on or after start date")
+    if data_df['total_days'].isna().any():
+        raise ValueError("Some total_days values are not numeric")
+    if not data_df['email'].str.contains('@', na=False).all():
+        raise ValueError("Some emails are invalid (missing @)")
 
-        df = df[df['email'].str.contains('@', na=False)]
-        df = df[['email', 'start_date', 'end_date', 'year', 'days']]
-        df = df.reset_index(drop=True)
+    return data_df
 
-        logger.info(f"Cleaned {len(df)} vacation records from {file_path}")
-        return df
 
+def iter_entitlement_chunks(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    metrics: Optional[ImportMetrics] = None,
+    sheet: SheetRef = None,
+    csv_engine: str = "c"
+) -> Tuple[int, Iterator[pd.DataFrame]]:
+    """
+    returns : (year, iterator of DataFrames with ['email', 'total_days'])
+    The year row is validated eagerly; data rows are cleaned as they are read.
+    """
+    try:
+        year = read_entitlement_year(file_path, sheet, csv_engine)
     except Exception as e:
-        logger.error(f"Error cleaning vacation file {file_path}: {e}")
+        logger.error(f"Error cleaning entitlement file {file_path}: {e}")
         raise ValueError(f"Invalid file format: {str(e)}")
 
+    def chunks() -> Iterator[pd.DataFrame]:
+        try:
+            total = 0
+            for raw in timed(metrics, "read", iter_dataframe_chunks(
+                file_path, chunk_size, skip_rows=2, sheet=sheet, csv_engine=csv_engine
+            )):
+                with measure(metrics, "clean", len(raw)):
+                    df = clean_entitlement_chunk(raw)
+                if not df.empty:
+                    total += len(df)
+                    yield df
+
+            if total == 0:
+                raise ValueError("No data rows found")
+            logger.info(f"Cleaned {total} entitlements for year {year} from {file_path}")
+
+        except Exception as e:
+            logger.error(f"Error cleaning entitlement file {file_path}: {e}")
+            raise ValueError(f"Invalid file format: {str(e)}")
+
+    return year, chunks()
+
+
 def clean_entitlement_file(file_path: str) -> Tuple[pd.DataFrame, int]:
     """
     returns : (DataFrame with ['email', 'total_days'], year)
     """
+    year, chunks = iter_entitlement_chunks(file_path)
+    return pd.concat(list(chunks)).reset_index(drop=True), year
+
+
+def detect_import_kind(file_path: str, sheet: SheetRef = None, csv_engine: str = "c") -> Optional[str]:
+    """
+    Tells "users", "entitlements" or "vacations" apart by the header rows the cleaners expect:
+    Vacation year,<year> followed by a password column (users) or a days column (entitlements),
+    or a single header row with start and end date columns (vacations). Parquet files have no
+    header rows and are told apart by column count and type. Returns None if nothing matches.
+    """
+    with closing(iter_dataframe_chunks(
+        file_path, chunk_size=2, max_rows=2, sheet=sheet, csv_engine=csv_engine
+    )) as chunks:
+        head = next(chunks, None)
+    if head is None or head.empty or head.shape[1] < 2:
+        return None
+
+    if file_path.endswith('.parquet'):
+        if head.shape[1] == 2:
+            return "users"
+        return "entitlements" if pd.api.types.is_numeric_dtype(head.iloc[:, 1]) else "vacations"
+
+    def cell(row: int, column: int) -> str:
+        if row >= head.shape[0] or column >= head.shape[1] or pd.isna(head.iloc[row, column]):
+            return ''
+        return str(head.iloc[row, column]).strip().lower()
+
+    if cell(0, 0).startswith("vacation year"):
+        if "password" in cell(1, 1):
+            return "users"
+        if "day" in cell(1, 1):
+            return "entitlements"
+        return None
+    if "start" in cell(0, 1) and "end" in cell(0, 2):
+        return "vacations"
+    return None
+
+
+def _xlsx_cell(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def iter_xlsx_chunks(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_rows: int = 0,
+    max_rows: int = None,
+    sheet: SheetRef = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams rows of one worksheet with openpyxl in read-only mode, so memory is bounded by
+    chunk_size rather than the workbook size. sheet is a name or 0-based index (default: first);
+    a string is matched as a name first, so a sheet named "2024" is found by name.
+    Cells become strings like the CSV reader's dtype=str; dates become YYYY-MM-DD.
+    Empty rows are skipped but keep their place in the row numbers, so the index follows the
+    worksheet's rows.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
     try:
-        if file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path, header=None)
+        if sheet is None:
+            worksheet = workbook.worksheets[0]
+        elif isinstance(sheet, str) and sheet in workbook.sheetnames:
+            worksheet = workbook[sheet]
+        elif isinstance(sheet, int) or sheet.isdigit():
+            index = int(sheet)
+            if not 0 <= index < len(workbook.worksheets):
+                raise ValueError(
+                    f"Sheet '{sheet}' not found and index {index} out of range, "
+                    f"available: {', '.join(workbook.sheetnames)}"
+                )
+            worksheet = workbook.worksheets[index]
         else:
-            df = pd.read_csv(
-                file_path,
-                header=None,
-                sep=',',
-                engine='python',
-                on_bad_lines='skip',
-                encoding='utf-8'
-            )
+            raise ValueError(f"Sheet '{sheet}' not found, available: {', '.join(workbook.sheetnames)}")
+
+        rows = []
+        index = []
+        read = 0
+        for position, values in enumerate(worksheet.iter_rows(min_row=skip_rows + 1, values_only=True)):
+            if max_rows is not None and read + len(rows) >= max_rows:
+                break
+            if all(value is None for value in values):
+                continue
+            rows.append([_xlsx_cell(value) for value in values])
+            index.append(position)
+            if len(rows) == chunk_size:
+                yield pd.DataFrame(rows, index=index)
+                read += len(rows)
+                rows = []
+                index = []
+        if rows:
+            yield pd.DataFrame(rows, index=index)
+    finally:
+        workbook.close()
+
+
+def _rechunk_arrow(batches, chunk_size: int, max_rows: int = None) -> Iterator[pd.DataFrame]:
+    """
+    Regroups Arrow record batches into DataFrames of chunk_size rows indexed by row number.
+    String columns stay Arrow-backed.
+    """
+    import pyarrow as pa
 
-        if df.empty or df.shape[1] < 2:
-            raise ValueError("File must have at least 2 columns")
+    pending = []
+    pending_rows = 0
+    start = 0
 
-        header_cell = str(df.iloc[0, 0]).strip().lower()
-        if not header_cell.startswith("vacation year"):
-            raise ValueError("First row must start with 'Vacation year'")
+    def emit(table):
+        df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+        df.columns = range(df.shape[1])
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
 
-        try:
-            year = int(df.iloc[0, 1]) 
-        except (ValueError, TypeError):
-            raise ValueError("Invalid year in first row, second column")
+    for batch in batches:
+        if max_rows is not None:
+            batch = batch.slice(0, max(0, max_rows - start - pending_rows))
+        if batch.num_rows:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+        while pending_rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+            yield emit(table.slice(0, chunk_size))
+            start += chunk_size
+            rest = table.slice(chunk_size)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+        if max_rows is not None and start + pending_rows >= max_rows:
+            break
+    if pending_rows:
+        yield emit(pa.Table.from_batches(pending))
+
+
+class _NewlineTerminated(io.RawIOBase):
+    """
+    Appends the final newline a file is missing; pyarrow's skip_rows otherwise treats an
+    unterminated last line as an empty block.
+    """
 
-        data_df = df.iloc[2:, :2].copy()
-        if data_df.empty:
-            raise ValueError("No data rows found")
+    def __init__(self, raw):
+        self._raw = raw
+        self._terminated = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        read = self._raw.readinto(buffer)
+        if read == 0 and not self._terminated:
+            self._terminated = True
+            buffer[0:1] = b"\n"
+            return 1
+        return read
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
+
+def _open_terminated(file_path: str):
+    raw = open(file_path, "rb")
+    raw.seek(0, io.SEEK_END)
+    if raw.tell() > 0:
+        raw.seek(-1, io.SEEK_END)
+        if raw.read(1) != b"\n":
+            raw.seek(0)
+            return io.BufferedReader(_NewlineTerminated(raw))
+    raw.seek(0)
+    return raw
+
+
+def iter_arrow_csv_chunks(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_rows: int = 0,
+    max_rows: int = None,
+    skipinitialspace: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    CSV reader backed by pyarrow's multithreaded streaming parser. Every column is read as an
+    Arrow string and malformed rows are skipped, like the C engine with on_bad_lines='skip'.
+    Leading whitespace is trimmed after parsing when skipinitialspace is set.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        raise ValueError("The pyarrow CSV engine requires the pyarrow package")
+
+    read_options = pa_csv.ReadOptions(skip_rows=skip_rows, autogenerate_column_names=True)
+    parse_options = pa_csv.ParseOptions(invalid_row_handler=lambda row: 'skip')
+    convert_options = pa_csv.ConvertOptions(
+        # autogenerated column names are f0, f1, ...; read every column as text like dtype=str
+        column_types={f"f{i}": pa.string() for i in range(64)},
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False
+    )
+
+    def batches(reader):
+        for batch in reader:
+            if skipinitialspace:
+                batch = pa.RecordBatch.from_arrays(
+                    [pc.utf8_ltrim_whitespace(column) for column in batch.columns],
+                    names=batch.schema.names
+                )
+            yield batch
+
+    with _open_terminated(file_path) as source:
+        reader = pa_csv.open_csv(
+            source, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+        )
+        yield from _rechunk_arrow(batches(reader), chunk_size, max_rows)
 
-        data_df.columns = ['email', 'total_days']
-        data_df = data_df.dropna(how='all').reset_index(drop=True)
 
-        data_df['email'] = data_df['email'].astype(str).str.strip().str.lower()
-        data_df['total_days'] = pd.to_numeric(data_df['total_days'], errors='coerce')
+def _record_end(buffer: bytes) -> int:
+    """
+    Offset just past the last newline in buffer that ends a record, or 0 if there is none.
+    buffer starts on a record boundary, so a newline ends a record when an even number of
+    quote characters comes before it.
+    """
+    quotes = buffer.count(b'"')
+    end = len(buffer)
+    newline = buffer.rfind(b"\n")
+    while newline >= 0:
+        quotes -= buffer.count(b'"', newline, end)
+        if quotes % 2 == 0:
+            return newline + 1
+        end = newline
+        newline = buffer.rfind(b"\n", 0, newline)
+    return 0
+
+
+def _iter_record_blocks(source, block_bytes: int) -> Iterator[bytes]:
+    """
+    Reads source in blocks of about block_bytes that end on a record boundary.
+    """
+    pending = b""
+    while True:
+        data = source.read(block_bytes)
+        if not data:
+            if pending:
+                yield pending
+            return
+        pending += data
+        end = _record_end(pending)
+        if end:
+            yield pending[:end]
+            pending = pending[end:]
+
+
+def _rechunk_frames(frames: Iterator[pd.DataFrame], chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Regroups DataFrames into chunks of chunk_size rows indexed by row number.
+    """
+    start = 0
+    pending = None
+
+    def numbered(df: pd.DataFrame) -> pd.DataFrame:
+        return df.set_axis(pd.RangeIndex(start, start + len(df)), axis=0)
+
+    for frame in frames:
+        if pending is not None:
+            missing = chunk_size - len(pending)
+            pending = pd.concat([pending, frame.iloc[:missing]])
+            frame = frame.iloc[missing:]
+            if len(pending) < chunk_size:
+                continue
+            yield numbered(pending)
+            start += chunk_size
+            pending = None
+        full = len(frame) - len(frame) % chunk_size
+        for offset in range(0, full, chunk_size):
+            yield numbered(frame.iloc[offset:offset + chunk_size])
+            start += chunk_size
+        if full < len(frame):
+            pending = frame.iloc[full:]
+    if pending is not None:
+        yield numbered(pending)
+
+
+def iter_c_csv_chunks(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_rows: int = 0,
+    max_rows: int = None,
+    skipinitialspace: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    CSV reader backed by pandas' C parser. The file is parsed in blocks of whole records
+    (CSV_BLOCK_BYTES) rather than with chunksize: the C parser does not check the field count
+    of the first line of a chunk, so a malformed line there would be imported or skipped
+    depending on chunk_size. The first row fixes the column count like a single read does;
+    every later block starts with a placeholder row of that width, so lines with more fields
+    are always skipped and rows are numbered the same for any chunk_size.
+    """
+    options = dict(
+        header=None, sep=',', engine='c', dtype=str, on_bad_lines='skip', encoding='utf-8',
+        skipinitialspace=skipinitialspace
+    )
+
+    def frames(source) -> Iterator[pd.DataFrame]:
+        width = None
+        rows = 0
+        for block in _iter_record_blocks(source, CSV_BLOCK_BYTES):
+            nrows = None if max_rows is None else max_rows - rows
+            if width is None:
+                df = pd.read_csv(io.BytesIO(block), nrows=nrows, **options)
+                width = df.shape[1]
+            else:
+                placeholder = b",".join([b'""'] * width) + b"\n"
+                df = pd.read_csv(
+                    io.BytesIO(placeholder + block), names=range(width), index_col=False,
+                    nrows=None if nrows is None else nrows + 1, **options
+                ).iloc[1:]
+            rows += len(df)
+            yield df
+            if max_rows is not None and rows >= max_rows:
+                return
+
+    with open(file_path, "rb") as source:
+        for _ in range(skip_rows):
+            source.readline()
+        yield from _rechunk_frames(frames(source), chunk_size)
+
+
+def iter_parquet_chunks(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_rows: int = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams a Parquet file in row batches. Columns are used by position like CSV columns,
+    keeping their types (dates stay dates, numbers stay numbers).
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet imports require the pyarrow package")
 
-        if data_df['total_days'].isna().any():
-            raise ValueError("Some total_days values are not numeric")
-        if not data_df['email'].str.contains('@', na=False).all():
-            raise ValueError("Some emails are invalid (missing @)")
+    parquet_file = pq.ParquetFile(file_path)
+    try:
+        yield from _rechunk_arrow(parquet_file.iter_batches(batch_size=chunk_size), chunk_size, max_rows)
+    finally:
+        parquet_file.close()
 
-        logger.info(f"Cleaned {len(data_df)} entitlements for year {year} from {file_path}")
-        return data_df, year
 
-    except Exception as e:
-        logger.error(f"Error cleaning entitlement file {file_path}: {e}")
-        raise ValueError(f"Invalid file format: {str(e)}")
-    
-def load_dataframe(file_path: str) -> pd.DataFrame:
+def parquet_column_distinct(file_path: str, position: int) -> list:
     """
-    Učitava CSV ili XLSX fajl.
-    Podržava: .csv (zarez), .xlsx
-    Vraća: pd.DataFrame (bez header-a)
+    Distinct non-null values of the column at position, reading only that column.
+    """
+    try:
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet imports require the pyarrow package")
+
+    parquet_file = pq.ParquetFile(file_path)
+    try:
+        name = parquet_file.schema_arrow.names[position]
+        column = parquet_file.read(columns=[name]).column(0)
+    finally:
+        parquet_file.close()
+    return pc.unique(column.drop_null()).to_pylist()
+
+
+def iter_dataframe_chunks(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_rows: int = 0,
+    max_rows: int = None,
+    skipinitialspace: bool = False,
+    sheet: SheetRef = None,
+    csv_engine: str = "c"
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads a CSV, XLSX or Parquet file (no header) in chunks of chunk_size rows.
+    The index of every chunk is the 0-based row number counted after skip_rows, not counting
+    CSV lines skipped for having more fields than the first row; it does not depend on chunk_size.
+    XLSX rows are numbered by their worksheet row, so empty rows leave gaps.
+    sheet selects the XLSX worksheet; csv_engine is "c" or "pyarrow".
+    Parquet files carry data rows only, so skip_rows does not apply to them.
     """
     if file_path.endswith('.xlsx'):
-        return pd.read_excel(file_path, header=None)
+        yield from iter_xlsx_chunks(file_path, chunk_size, skip_rows, max_rows, sheet)
+    elif file_path.endswith('.parquet'):
+        yield from iter_parquet_chunks(file_path, chunk_size, max_rows)
     elif file_path.endswith('.csv'):
-        return pd.read_csv(
-            file_path,
-            header=None,
-            sep=',',
-            engine='python',
-            on_bad_lines='skip'
-        )
+        if csv_engine not in CSV_ENGINES:
+            raise ValueError(f"Unknown CSV engine '{csv_engine}', use one of: {', '.join(CSV_ENGINES)}")
+        if csv_engine == "pyarrow":
+            yield from iter_arrow_csv_chunks(file_path, chunk_size, skip_rows, max_rows, skipinitialspace)
+            return
+        yield from iter_c_csv_chunks(file_path, chunk_size, skip_rows, max_rows, skipinitialspace)
     else:
-        raise ValueError("Unsupported file format. Use .csv or .xlsx")
\ No newline at end of file
+        raise ValueError("Unsupported file format. Use .csv, .xlsx or .parquet")
+
+
+def load_dataframe(file_path: str) -> pd.DataFrame:
+    """
+    Učitava CSV, XLSX ili Parquet fajl.
+    Podržava: .csv (zarez), .xlsx, .parquet (zahteva pyarrow)
+    Vraća: pd.DataFrame (bez header-a)
+    """
+    chunks = list(iter_dataframe_chunks(file_path))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks)
@@ -0,0 +1,132 @@
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+_local = threading.local()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    _local.sql_statements = getattr(_local, "sql_statements", 0) + 1
+
+
+def _sql_statements() -> int:
+    return getattr(_local, "sql_statements", 0)
+
+
+def _max_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class _Stage:
+    __slots__ = ("seconds", "rows", "sql_statements", "peak_memory")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.rows = 0
+        self.sql_statements = 0
+        self.peak_memory = 0
+
+
+class ImportMetrics:
+    """
+    Sums wall time, rows and SQL statements (counted on the current thread) per import stage
+    across chunks. With trace_memory=True the peak traced allocation of each stage is recorded
+    too; tracemalloc is process-wide and slows allocations, so it is off by default.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self._stages: Dict[str, _Stage] = {}
+        self._started = time.perf_counter()
+        self._sql_at_start = _sql_statements()
+        self._owns_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+    def _get(self, name: str) -> _Stage:
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage()
+        return stage
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0):
+        stage = self._get(name)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        sql_before = _sql_statements()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stage.seconds += time.perf_counter() - started
+            stage.sql_statements += _sql_statements() - sql_before
+            stage.rows += rows
+            if self.trace_memory:
+                stage.peak_memory = max(stage.peak_memory, tracemalloc.get_traced_memory()[1])
+
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """
+        Times each step of iterable under stage name and counts len(item) as rows.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            self._get(name).rows += len(item)
+            yield item
+
+    def finish(self) -> dict:
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+        stages = {}
+        for name, stage in self._stages.items():
+            stages[name] = {
+                "seconds": round(stage.seconds, 4),
+                "rows": stage.rows,
+                "rows_per_second": round(stage.rows / stage.seconds, 1) if stage.seconds > 0 else None,
+                "sql_statements": stage.sql_statements,
+            }
+            if self.trace_memory:
+                stages[name]["peak_memory_mb"] = round(stage.peak_memory / (1024 * 1024), 2)
+
+        return {
+            "total_seconds": round(time.perf_counter() - self._started, 4),
+            "sql_statements": _sql_statements() - self._sql_at_start,
+            "max_rss_mb": _max_rss_mb(),
+            "stages": stages,
+        }
+
+    @staticmethod
+    def log(logger: logging.Logger, kind: str, metrics: dict) -> None:
+        payload = {"import_kind": kind, **metrics}
+        logger.info(f"Import metrics: {json.dumps(payload, sort_keys=True)}", extra={"import_metrics": payload})
+
+
+def measure(metrics: Optional[ImportMetrics], name: str, rows: int = 0):
+    return metrics.stage(name, rows) if metrics else nullcontext()
+
+
+def timed(metrics: Optional[ImportMetrics], name: str, iterable: Iterable) -> Iterable:
+    return metrics.timed(name, iterable) if metrics else iterable
@@ -0,0 +1,21 @@
+import base64
+from datetime import date
+from typing import Tuple
+
+
+def encode_cursor(start_date: date, record_id: int) -> str:
+    raw = f"{start_date.isoformat()}:{record_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """
+    Returns the (start_date, id) of the last record of the previous page.
+    Raises ValueError for a cursor that was not issued by encode_cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        start_date, record_id = raw.split(":")
+        return date.fromisoformat(start_date), int(record_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
@@ -1,7 +1,60 @@
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
 from werkzeug.security import generate_password_hash, check_password_hash
 
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
 def hash_password(password: str) -> str:
     return generate_password_hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
-    return check_password_hash(hashed, password)
\ No newline at end of file
+    return check_password_hash(hashed, password)
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn: never fork a threaded web worker holding DB connections
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _pool_workers = workers
+        return _pool
+
+def shutdown_hash_pool() -> None:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool = None
+        _pool_workers = 0
+
+atexit.register(shutdown_hash_pool)
+
+def hash_passwords(passwords: List[str], workers: int = 0) -> List[str]:
+    """
+    Hashes passwords on a process pool and returns hashes in input order.
+    workers <= 1 hashes in-process.
+    """
+    if workers <= 1 or len(passwords) < 2:
+        return [hash_password(p) for p in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    try:
+        return list(_get_pool(workers).map(hash_password, passwords, chunksize=chunksize))
+    except BrokenProcessPool as e:
+        logger.warning(f"Password hash pool failed, hashing in-process: {e}")
+        shutdown_hash_pool()
+        return [hash_password(p) for p in passwords]
@@ -12,10 +12,10 @@ class ApiResponse:
         }), status_code
 
     @staticmethod
-    def error(message: str, status_code: int = 500):
+    def error(message: str, status_code: int = 500, data: Optional[Any] = None):
         return jsonify({
             "success": False,
-            "data": None,
+            "data": data,
             "error": message,
             "status_code": status_code
         }), status_code
\ No newline at end of file